@@ -5,31 +5,83 @@
 # @Description : 数论工具函数
 import secrets
 
+try:
+    import gmpy2
+except ImportError:     # gmpy2 为可选依赖，缺失时使用纯 Python 实现
+    gmpy2 = None
 
-def qpow(x: int, p: int, mod: int) -> int:
+# 当前使用的大整数后端（'python' 或 'gmpy2'）
+_backend = 'gmpy2' if gmpy2 else 'python'
+
+
+def resolve_backend(name: str = 'auto') -> str:
+    """
+    解析并校验大整数后端名称，不修改模块当前后端
+    :param name: 'auto'（gmpy2 可用时使用 gmpy2）、'gmpy2' 或 'python'
+    :return: 实际可用的后端名称
+    """
+    name = name.lower()
+    if name == 'auto':
+        name = 'gmpy2' if gmpy2 else 'python'
+    if name not in ('gmpy2', 'python'):
+        raise ValueError(f"不支持的整数后端: {name}")
+    if name == 'gmpy2' and gmpy2 is None:
+        raise ImportError("未安装 gmpy2，无法启用 gmpy2 整数后端")
+    return name
+
+
+def set_backend(name: str = 'auto') -> str:
+    """
+    选择进程级的大整数运算后端（模块设置，应在启动时调用一次）
+    :param name: 'auto'（gmpy2 可用时使用 gmpy2）、'gmpy2' 或 'python'
+    :return: 实际启用的后端名称
+    """
+    global _backend
+    _backend = resolve_backend(name)
+    return _backend
+
+
+def get_backend() -> str:
+    """返回当前使用的大整数后端名称"""
+    return _backend
+
+
+def to_backend(x: int, backend: str = None):
+    """
+    将整数转换为后端的整数类型（gmpy2 后端下为 mpz，用于曲线内部运算）
+    :param x: 整数
+    :param backend: 目标后端，缺省为模块当前后端
+    :return: 后端整数
+    """
+    return gmpy2.mpz(x) if (backend or _backend) == 'gmpy2' else x
+
+
+def qpow(x: int, p: int, mod: int, backend: str = None) -> int:
     """
     计算 x^p % mod 的值，使用快速幂算法。
     :param x: 底数
     :param p: 指数
     :param mod: 模 mod
+    :param backend: 大整数后端，缺省为模块当前后端（见 set_backend）
     :return: x^p % mod 的值
     """
-    ans = 1
-    while p:
-        if p & 1:
-            ans = (ans * x) % mod
-        x = pow(x, 2, mod)
-        p >>= 1
-    return ans
+    if (backend or _backend) == 'gmpy2':
+        return int(gmpy2.powmod(x, p, mod))
+    return pow(x, p, mod)
 
 
-def exgcd(a: int, b: int) -> tuple[int, int, int]:
+def exgcd(a: int, b: int, backend: str = None) -> tuple[int, int, int]:
     """
     矩阵迭代实现扩展欧几里得算法，求解 a*x + b*y = gcd(a, b) 的解。
     :param a: 整数 a
     :param b: 整数 b
+    :param backend: 大整数后端，缺省为模块当前后端（见 set_backend）
     :return: (g, x, y)，其中 g 是 a 和 b 的最大公约数，x 和 y 满足 Bezout 等式：a*x + b*y = g
     """
+    if (backend or _backend) == 'gmpy2':
+        g, x, y = gmpy2.gcdext(a, b)
+        return int(g), int(x), int(y)
+
     x, last_x = 0, 1
     y, last_y = 1, 0
     while b:
@@ -41,19 +93,53 @@ def exgcd(a: int, b: int) -> tuple[int, int, int]:
     return g, last_x, last_y
 
 
-def mod_inverse(a: int, m: int) -> int:
+def mod_inverse(a: int, m: int, backend: str = None) -> int:
     """
     计算 a 关于模 m 的逆元，即 ax ≡ 1 (mod m) 的解。
     :param a: 整数 a
     :param m: 模 m
+    :param backend: 大整数后端，缺省为模块当前后端（见 set_backend）
     :return: a 的逆元 x
     """
-    _, x, y = exgcd(a, m)
+    if (backend or _backend) == 'gmpy2':
+        try:
+            return int(gmpy2.invert(a, m))
+        except ZeroDivisionError:   # 不可逆时沿用扩展欧几里得算法的结果
+            pass
+
+    _, x, y = exgcd(a, m, backend)
     if x < 0:
         x += m  # 确保逆元为正数
     return x
 
 
+def batch_inverse(values: list[int], m: int, backend: str = None) -> list[int]:
+    """
+    Montgomery 批量求逆：仅用一次模逆和约 3(n-1) 次模乘求出所有元素关于模 m 的逆元。
+    :param values: 整数列表，值为 0 (mod m) 的元素对应结果为 0
+    :param m: 模 m
+    :param backend: 大整数后端，缺省为模块当前后端（见 set_backend）
+    :return: 逆元列表
+    """
+    # 前缀积
+    prefix = []
+    acc = 1
+    for v in values:
+        prefix.append(acc)
+        if v % m:
+            acc = acc * v % m
+
+    # 对总乘积求逆后逆序回代
+    inv = mod_inverse(acc, m, backend)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        v = values[i] % m
+        if v:
+            result[i] = inv * prefix[i] % m
+            inv = inv * v % m
+    return result
+
+
 def mod_divide(num: int, den: int, p: int) -> int:
     """
     计算模 p 下的除法 num / den % p
@@ -66,10 +152,37 @@ def mod_divide(num: int, den: int, p: int) -> int:
     return num * inv % p  # 返回模 p 下的结果
 
 
-def isprime(p: int) -> bool:
+def jacobi(a: int, n: int, backend: str = None) -> int:
+    """
+    计算 Jacobi 符号 (a/n)，n 为正奇数；n 为素数时即勒让德符号，但无需模幂运算
+    :param a: 整数 a
+    :param n: 正奇数 n
+    :param backend: 大整数后端，缺省为模块当前后端（见 set_backend）
+    :return: 1、-1 或 0
+    """
+    if (backend or _backend) == 'gmpy2':
+        return int(gmpy2.jacobi(a, n))
+
+    a %= n
+    t = 1
+    while a:
+        # 提取因子 2，根据 n mod 8 决定符号翻转
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                t = -t
+        # 二次互反律
+        if a % 4 == 3 and n % 4 == 3:
+            t = -t
+        a, n = n % a, a
+    return t if n == 1 else 0
+
+
+def isprime(p: int, backend: str = None) -> bool:
     """
     使用 Miller-Rabin 素性测试判断 p 是否为素数。
     :param p: 待检测的数
+    :param backend: 大整数后端，缺省为模块当前后端（见 set_backend）
     :return: True 如果 p 是素数，False 如果 p 不是素数
     """
     # 处理小于 2 的数和 2,3 这两个特殊的素数
@@ -77,6 +190,8 @@ def isprime(p: int) -> bool:
         return False
     if p == 2 or p == 3:
         return True
+    if (backend or _backend) == 'gmpy2':
+        return bool(gmpy2.is_prime(p, 25))
 
     # 将 p-1 分解为 d * 2^r 的形式，其中 d 为奇数
     d = p - 1
@@ -91,7 +206,7 @@ def isprime(p: int) -> bool:
         a = secrets.randbelow(p - 4) + 2
         
         # 计算 a^d mod p
-        x = qpow(a, d, p)
+        x = qpow(a, d, p, backend)
         
         # 如果 x 等于 1 或 p-1，则通过这轮测试
         if x == 1 or x == p - 1:
@@ -71,12 +71,17 @@ class CloudServer:
 
     def stop_server(self):
         """停止云服务器"""
-        func = request.environ.get('werkzeug.server.shutdown')
-        if func is None:
-            logger.warning("无法关闭服务器（非Werkzeug环境）")
-            return
-        func()
-        logger.info(f"[Server (id: {self.__config.id})] 云服务器已停止")
+        try:
+            func = request.environ.get('werkzeug.server.shutdown')
+            if func is None:
+                logger.warning("无法关闭服务器（非Werkzeug环境）")
+                return
+            func()
+            logger.info(f"[Server (id: {self.__config.id})] 云服务器已停止")
+        finally:
+            # 无论服务器能否关闭，都停止加密服务的临时密钥对预计算线程
+            if self.cryptoservice:
+                self.cryptoservice.close()
 
     def __get_from_SC(self, endpoint: str) -> dict:
         """从系统中心获取数据"""
@@ -103,8 +108,12 @@ class CloudServer:
         self.cryptoservice = CryptoService(
             curve_params=self.__system_params.__dict__,
             sign_algorithms={'SM2': {'user_id': self.__system_params._id}},
-            crypto_algorithms={'ECC': {}}
+            crypto_algorithms={'ECC': {}},
+            ephemeral_pool_size=64
         )
+        # 每次签密验证都要用到 SM2 系统公钥，预先建立其窗口预计算表
+        if self.__system_params.SM2_PublicKey:
+            self.cryptoservice.precompute_public_key(self.__system_params.SM2_PublicKey)
 
         # 处理服务器ID和密钥对
         if self.__config.id:
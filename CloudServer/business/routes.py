@@ -94,19 +94,12 @@ class CloudServerRoutes:
                 ['enc_share']
             )['enc_share']
 
-            # 嵌套加密份额
-            ct = self.context.cryptoservice.encrypt_data(
+            # 转加密份额：添加下载用户的加密层，同时移除本服务器的加密层
+            enc_share = self.context.cryptoservice.reencrypt_data(
                 message=ciphertext,
-                key=resp.download_user["public_key"],
-                algorithm='ECC',
-                additional={'multi': True}
-            )
-
-            # 解密嵌套份额
-            enc_share = self.context.cryptoservice.decrypt_data(
-                message=ct,
-                key=self.context.private_key,
-                additional={'multi': True, 'blinding': 'c1'}
+                public_key=resp.download_user["public_key"],
+                private_key=self.context.private_key,
+                blinding='c1'
             )
 
             resp = ServerDownloadResponse(server_id=self.context.server_id, enc_share=enc_share)
@@ -4,35 +4,115 @@
 # @File    : arithmetic.py
 # @Description : 加密工具类
 import json
+import binascii
+import functools
 import math
+import struct
 import hashlib
 import secrets
 from typing import Union, Optional
 from gmssl import sm3
 from loguru import logger
+
+try:
+    import numpy as np
+except ImportError:     # NumPy 为可选依赖，缺失时 AES 仅使用逐块的 T 表实现
+    np = None
+
 from builtin_tools import arithmetic
 from builtin_tools.ellipticCurve import Util, Point, Curve
 
 
+class _SM3:
+    """基于 gmssl.sm3 压缩函数的增量 SM3（hashlib 不提供 SM3 时使用，结果与 sm3.sm3_hash 一致）"""
+
+    def __init__(self):
+        self.__v = list(sm3.IV)
+        self.__buffer = b''
+        self.__length = 0
+
+    def update(self, data: bytes) -> None:
+        self.__length += len(data)
+        data = self.__buffer + bytes(data)
+        cut = len(data) - len(data) % 64
+        for i in range(0, cut, 64):
+            self.__v = sm3.sm3_cf(self.__v, data[i:i + 64])
+        self.__buffer = data[cut:]
+
+    def digest(self) -> bytes:
+        # 填充：0x80、补零至 56 (mod 64) 字节、64 位消息比特长度
+        tail = self.__buffer + b'\x80' + bytes((55 - len(self.__buffer)) % 64) + (self.__length * 8).to_bytes(8, 'big')
+        v = self.__v
+        for i in range(0, len(tail), 64):
+            v = sm3.sm3_cf(v, tail[i:i + 64])
+        return b''.join(x.to_bytes(4, 'big') for x in v)
+
+
+def _sm3_new():
+    """创建 SM3 哈希上下文：优先使用 hashlib（OpenSSL）实现"""
+    if 'sm3' in hashlib.algorithms_available:
+        return hashlib.new('sm3')
+    return _SM3()
+
+
 class Hash:
-    """哈希算法类"""
+    """
+    哈希算法类
+    - Hash.digest(data) 一次性计算摘要
+    - Hash(algorithm) 创建增量哈希对象，分段 update 后 finalize，结果与对整段数据调用 digest 相同
+    """
     
-    # 哈希算法映射字典
+    # 哈希算法映射字典（值为创建哈希上下文的函数）
     _ALGORITHMS = {
         'SHA256': hashlib.sha256,  # SHA256 算法
         'MD5': hashlib.md5,        # MD5 算法
-        "SM3": sm3.sm3_hash        # 国密 SM3 算法
+        "SM3": _sm3_new            # 国密 SM3 算法
     }
 
+    def __init__(self, algorithm: str = 'SHA256', length: int = 32):
+        """
+        创建增量哈希对象
+        :param algorithm: 哈希算法（SHA256/MD5/SM3）
+        :param length: 消息摘要长度
+        """
+        algo = self._ALGORITHMS.get(algorithm.upper())
+        if not algo:
+            raise ValueError(f"不支持的哈希算法: {algorithm}")
+        self.algorithm = algorithm.upper()
+        self.length = length
+        self.__ctx = algo()
+
+    def update(self, data: Union[str, bytes, int]) -> 'Hash':
+        """
+        输入一段数据
+        :param data: 数据片段（支持字符串/字节/整数）
+        :return: 自身，便于链式调用
+        """
+        self.__ctx.update(self.__convert_to_bytes(data))
+        return self
+
+    def finalize(self, output_format: str = 'hex') -> Union[str, bytes, int]:
+        """
+        输出已输入全部数据的摘要
+        :param output_format: 输出格式（hex/bytes/int）
+        :return: 指定格式的哈希值
+        """
+        hash_bytes = self.__ctx.digest()
+
+        # 处理哈希值长度（用于 MD5-64）
+        if self.length == 16:
+            hash_bytes = hash_bytes[4:12]
+        return self._format_output(hash_bytes, output_format)
+
     @classmethod
     def __convert_to_bytes(cls, data: Union[str, bytes, int]) -> bytes:
-        """将输入数据转换为字节数组"""
+        """将输入数据转换为字节（字节类数据直接使用，不再复制）"""
         if isinstance(data, int):
-            return bytearray(data.to_bytes((data.bit_length() + 7) // 8, 'big'))
+            return data.to_bytes((data.bit_length() + 7) // 8, 'big')
         if isinstance(data, str):
-            return bytearray(data.encode())
-        elif isinstance(data, (bytes, bytearray)):
-            return bytearray(data)
+            return data.encode()
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            return data
         raise ValueError("Unsupported data type")
 
     @classmethod
@@ -49,26 +129,7 @@ class Hash:
         :param output_format: 输出格式（hex/bytes/int）
         :return: 指定格式的哈希值
         """
-        # 统一转换为字节数组
-        data_bytes = cls.__convert_to_bytes(data)
-        
-        # 根据算法类型计算哈希值
-        algo = cls._ALGORITHMS.get(algorithm.upper())
-        if not algo:
-            raise ValueError(f"不支持的哈希算法: {algorithm}")
-
-        # 计算哈希
-        if algorithm.upper() == 'SM3':
-            hash_bytes = bytes.fromhex(algo(data_bytes))
-        else:
-            hash_bytes = algo(data_bytes).digest()
-
-        # 处理哈希值长度（用于 MD5-64）
-        if length == 16:
-            hash_bytes = hash_bytes[4:12]
-
-        # 格式转换
-        return cls._format_output(hash_bytes, output_format)
+        return cls(algorithm, length).update(data).finalize(output_format)
 
     @staticmethod
     def _format_output(hash_bytes: bytes, type_format: str) -> Union[str, bytes, int]:
@@ -79,47 +140,167 @@ class Hash:
             return int.from_bytes(hash_bytes, 'big')
         return hash_bytes
 
+
+class HashingReader:
+    """读取时同步哈希的文件包装器：每块数据只读取一次，同时送入哈希与后续处理（如加密）"""
+
+    def __init__(self, reader, hasher: Hash):
+        """
+        :param reader: 二进制可读文件对象
+        :param hasher: 增量哈希对象
+        """
+        self.__reader = reader
+        self.hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.__reader.read(size)
+        self.hasher.update(data)
+        return data
+
+
+class HashingWriter:
+    """写入时同步哈希的文件包装器：处理结果（如解密出的明文）在写出的同时计算摘要"""
+
+    def __init__(self, writer, hasher: Hash):
+        """
+        :param writer: 具有 write 方法的输出对象
+        :param hasher: 增量哈希对象
+        """
+        self.__writer = writer
+        self.hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        return self.__writer.write(data)
+
+
 class ECC:
     """椭圆曲线加密类，实现基于 Koblitz 编码的 ECC 加密"""
-    def __init__(self, curve: 'Curve', G: 'Point', K: int = 100000):
+    # 二进制密文容器：魔数 + 版本号 + 编码方式 + 坐标字节长度 + 层数 + 密文点数，之后依次为层表与密文点
+    CIPHER_MAGIC = b'EC'
+    CIPHER_VERSION = 1
+    CIPHER_HEADER = struct.Struct('>2sBBBBH')
+    CIPHER_ENCODINGS = ('text', 'int')
+
+    def __init__(self, curve: 'Curve', G: 'Point', K: int = 100000, cipher_format: str = 'binary'):
         """
         初始化 ECC 加密类
         :param curve: 椭圆曲线对象
         :param G: 基点
         :param K: Koblitz 编码参数，用于调整编码成功率，默认值 100000
+        :param cipher_format: 密文格式，'binary'（压缩点二进制容器）或 'json'（旧格式）；两种格式均可读取
         """
+        if cipher_format not in ('binary', 'json'):
+            raise ValueError(f"不支持的密文格式: {cipher_format}")
         self.curve = curve  # 椭圆曲线
         self.G = G         # 基点
         self.K = K         # Koblitz 编码参数
+        self.cipher_format = cipher_format  # 密文序列化格式
+        self.ephemeral_source = None        # 可选的临时密钥对 (r, r*G) 来源（如预计算池），为空时现场生成
         self.p = curve.p() # 曲线模数
         # 计算编码相关参数
         self.coord_len = math.ceil(self.p.bit_length() / 8)  # 坐标字节长度
         self.max_block = (self.p // K) - 1                   # 最大块大小
         self.block_size = (self.max_block.bit_length() + 7) // 8  # 字节块大小
+        # 整数编码参数：将小于基点阶的整数按 int_limb_bits 位分段，每段 x = limb * 2^int_k + j 映射为一个点
+        # int_k 至少为 7（每段最多 128 次尝试，失败概率约 2^-128），阶明显小于 p 时整数只需一个点
+        p_bits, n_bits = self.p.bit_length() - 1, G.order().bit_length()
+        self.int_limbs = math.ceil(n_bits / (p_bits - 7))
+        self.int_limb_bits = math.ceil(n_bits / self.int_limbs)
+        self.int_k = p_bits - self.int_limb_bits
 
     def __serialize_cipher(self, cipher_data: dict) -> str:
         """将密文数据序列化为 Base64 字符串"""
-        return Base64.b64encode(json.dumps(cipher_data))
+        if self.cipher_format == 'json':
+            return Base64.b64encode(json.dumps(cipher_data))
+
+        layers = sorted((int(k[1:]), v) for k, v in cipher_data.items() if k[0] == 'c' and k[1:].isdigit())
+        cts = cipher_data['cts']
+        buf = bytearray(self.CIPHER_HEADER.pack(
+            self.CIPHER_MAGIC, self.CIPHER_VERSION, self.CIPHER_ENCODINGS.index(cipher_data.get('enc', 'text')),
+            self.coord_len, len(layers), len(cts)))
+        for num, point in layers:
+            buf += num.to_bytes(2, 'big')
+            buf += self.__compress_point(point)
+        for point in cts:
+            buf += self.__compress_point(point)
+        return Base64.b64encode(bytes(buf))
 
     def __deserialize_cipher(self, cipher_str: str) -> dict:
-        """将 Base64 字符串反序列化为密文数据"""
-        return json.loads(Base64.b64decode(cipher_str))
-
-    def __encode_block(self, m: int) -> 'Point':
+        """将 Base64 字符串反序列化为密文数据，兼容旧的 JSON 格式"""
+        raw = Base64.b64decode(cipher_str)
+        if not raw.startswith(self.CIPHER_MAGIC):
+            return json.loads(raw)
+
+        # 二进制容器：在 memoryview 上按偏移解析，不复制中间切片
+        view = memoryview(raw)
+        _, version, encoding, coord_len, n_layers, n_cts = self.CIPHER_HEADER.unpack_from(view)
+        if version != self.CIPHER_VERSION:
+            raise ValueError(f"不支持的密文版本: {version}")
+        if coord_len != self.coord_len:
+            raise ValueError("密文与当前曲线的坐标长度不一致")
+        point_len = coord_len + 1
+        if len(view) != self.CIPHER_HEADER.size + n_layers * (point_len + 2) + n_cts * point_len:
+            raise ValueError("密文长度错误")
+
+        cipher_data, offset = {}, self.CIPHER_HEADER.size
+        for _ in range(n_layers):
+            num = int.from_bytes(view[offset:offset + 2], 'big')
+            cipher_data[f'c{num}'] = self.__decompress_point(view[offset + 2:offset + 2 + point_len])
+            offset += 2 + point_len
+        cipher_data['cts'] = [self.__decompress_point(view[offset + i * point_len:offset + (i + 1) * point_len])
+                              for i in range(n_cts)]
+        if encoding:
+            cipher_data['enc'] = self.CIPHER_ENCODINGS[encoding]
+        return cipher_data
+
+    def __compress_point(self, point: tuple) -> bytes:
+        """将点坐标 (x, y) 按 SEC1 压缩格式编码为定长字节串（无穷远点为全零）"""
+        x, y = point
+        if x is None:
+            return bytes(self.coord_len + 1)
+        return bytes((2 | (y & 1),)) + x.to_bytes(self.coord_len, 'big')
+
+    def __decompress_point(self, data: memoryview) -> tuple:
+        """将 SEC1 压缩格式的定长字节串解码为点坐标 (x, y)"""
+        prefix = data[0]
+        if prefix == 0:
+            return None, None
+        if prefix not in (2, 3):
+            raise ValueError("无效的压缩点前缀")
+
+        x = int.from_bytes(data[1:], 'big')
+        y = self.curve.sqrt_context().sqrt((x * x + self.curve.a()) * x + self.curve.b())
+        if y is None or x >= self.p:
+            raise ValueError("压缩点不在曲线上")
+        if y & 1 != prefix & 1:
+            y = self.p - y
+        return x, y
+
+    def __encode_block(self, m: int, K: Optional[int] = None) -> 'Point':
         """
         将单个数据块编码为椭圆曲线上的点
         :param m: 待编码的整数
+        :param K: Koblitz 编码参数，默认使用 self.K
         :return: 编码后的椭圆曲线点
         """
-        x_base = m * self.K
-        for j in range(self.K):
+        K = K or self.K
+        x_base = m * K
+        for j in range(K):
             x = x_base + j
             if x >= self.p:
                 break
-            # 尝试找到合适的 y 坐标
+            # 尝试找到合适的 y 坐标（由曲线方程求得，无需再次校验）
             if y_coords := Util.calc_y_coord(self.curve, x):
-                return Point(self.curve, x, y_coords[0])
-        raise ValueError(f"编码失败：无法在 {self.K} 次尝试内找到有效点")
+                return Point._trusted(self.curve, x, y_coords[0])
+        raise ValueError(f"编码失败：无法在 {K} 次尝试内找到有效点")
+
+    def __ephemeral_pair(self) -> tuple:
+        """取一对临时密钥 (r, r*G)：优先从 ephemeral_source 获取，否则现场生成"""
+        if self.ephemeral_source:
+            return self.ephemeral_source()
+        r = secrets.randbelow(self.G.order() - 1) + 1
+        return r, r * self.G
 
     def koblitz_encode(self, message: str) -> list:
         """
@@ -142,10 +323,10 @@ class ECC:
         :param points: 椭圆曲线点列表
         :return: 解码后的消息字符串
         """
-        # 将所有点的 x 坐标转换回字节流
+        # 将所有点的 x 坐标转换回字节流（批量转换为仿射坐标）
         bytes_stream = b''.join(
-            (point.x() // self.K).to_bytes(self.block_size, 'big')
-            for point in points
+            (x // self.K).to_bytes(self.block_size, 'big')
+            for x, _ in Util.points_to_tuples(points)
         )
         
         # 处理 PKCS7 填充
@@ -155,37 +336,96 @@ class ECC:
             raise ValueError("填充无效")
         return bytes_stream[:-pad_len].decode('utf-8')
 
-    def ecc_encrypt(self, plaintext: str, public_key: tuple) -> str:
+    def integer_encode(self, value: Union[int, str]) -> list:
+        """
+        将小于基点阶的整数（如秘密份额）直接编码为椭圆曲线点列表，无需 UTF-8 编码与填充
+        :param value: 整数，或其十六进制字符串（允许空格分隔）
+        :return: 编码后的点列表（共 int_limbs 个点）
+        """
+        if isinstance(value, str):
+            value = int(value.replace(' ', ''), 16)
+        if not 0 <= value < self.G.order():
+            raise ValueError("整数编码失败：数值超出基点阶范围")
+
+        mask = (1 << self.int_limb_bits) - 1
+        return [self.__encode_block((value >> (i * self.int_limb_bits)) & mask, 1 << self.int_k)
+                for i in reversed(range(self.int_limbs))]
+
+    def integer_decode(self, points: list) -> int:
+        """
+        将 integer_encode 生成的点列表解码为整数
+        :param points: 椭圆曲线点列表
+        :return: 解码后的整数
+        """
+        value = 0
+        for x, _ in Util.points_to_tuples(points):
+            value = (value << self.int_limb_bits) | (x >> self.int_k)
+        return value
+
+    def ecc_encrypt(self, plaintext: Union[str, int], public_key: tuple, encoding: str = 'text') -> str:
         """
         加密消息
-        :param plaintext: 明文字符串
+        :param plaintext: 明文字符串；encoding 为 'int' 时为整数或其十六进制字符串
         :param public_key: 公钥元组 (x, y)
+        :param encoding: 明文编码方式，'text'（Koblitz 文本编码）或 'int'（整数编码，适用于秘密份额）
         :return: Base64 编码的密文
         """
-        pubkey_point = Util.tuple_to_point(self.curve, public_key)
-        points = self.koblitz_encode(plaintext)
-        r = secrets.randbelow(self.G.order() - 1) + 1  # 随机数
+        return self.ecc_encrypt_batch([plaintext], [public_key], encoding)[0]
 
-        return self.__serialize_cipher({
-            'c1': Util.point_to_tuple(r * self.G),
-            'cts': [Util.point_to_tuple(p + r * pubkey_point) for p in points]
-        })
+    def ecc_encrypt_batch(self, plaintexts: list, public_keys: list, encoding: str = 'text') -> list:
+        """
+        多接收者加密：用同一个随机数 r 将各条消息分别加密给对应的公钥，r*G 只计算一次。
+        每条密文与 ecc_encrypt 的输出格式完全相同，可独立进行多层加解密
+        :param plaintexts: 明文列表
+        :param public_keys: 公钥列表，与明文一一对应且互不相同（相同公钥复用 r 会泄露明文之差）
+        :param encoding: 明文编码方式，'text' 或 'int'
+        :return: Base64 编码的密文列表
+        """
+        if len(plaintexts) != len(public_keys):
+            raise ValueError("明文与公钥数量不一致")
+        pubkey_points = [Util.tuple_to_point(self.curve, key, cached=True) for key in public_keys]
+        if len(set(Util.points_to_tuples(pubkey_points))) != len(pubkey_points):
+            raise ValueError("多接收者加密的公钥不能重复")
+        match encoding:
+            case 'text':
+                encode = self.koblitz_encode
+            case 'int':
+                encode = self.integer_encode
+            case _:
+                raise ValueError(f"不支持的明文编码方式: {encoding}")
+
+        r, rG = self.__ephemeral_pair()  # 随机数及 r*G
+        c1 = Util.point_to_tuple(rG)
+        ciphertexts = []
+        for plaintext, pubkey_point in zip(plaintexts, pubkey_points):
+            shared = r * pubkey_point   # 共享点 rP 对所有分块相同，每条消息只计算一次
+            cipher_data = {
+                'c1': c1,
+                'cts': Util.points_to_tuples([p + shared for p in encode(plaintext)])
+            }
+            if encoding != 'text':
+                cipher_data['enc'] = encoding   # 标记编码方式，多层加解密时原样保留
+            ciphertexts.append(self.__serialize_cipher(cipher_data))
+        return ciphertexts
 
     def ecc_decrypt(self, base64_cipher: str, private_key: int) -> str:
         """
         解密消息
         :param base64_cipher: Base64 编码的密文
         :param private_key: 私钥整数
-        :return: 解密后的明文
+        :return: 解密后的明文；整数编码的密文返回整数的十六进制字符串
         """
         cipher_data = self.__deserialize_cipher(base64_cipher)
+        encoding = cipher_data.pop('enc', 'text')
         if len(cipher_data.keys()) > 2:
             raise ValueError("密文层数错误")
 
         # 获取辅助点并解密
         key = next(k for k in cipher_data.keys() if k != 'cts')
-        cipher1 = Util.tuple_to_point(self.curve, cipher_data[key])
-        points = [Util.tuple_to_point(self.curve, ct) - (private_key * cipher1) for ct in cipher_data['cts']]
+        shared = private_key * Util.tuple_to_point(self.curve, cipher_data[key])
+        points = [Util.tuple_to_point(self.curve, ct) - shared for ct in cipher_data['cts']]
+        if encoding == 'int':
+            return format(self.integer_decode(points), 'X')
         return self.koblitz_decode(points)
 
     def ecc_multi_encrypt(self, base64_cipher: str, public_key: tuple) -> str:
@@ -196,19 +436,20 @@ class ECC:
         :return: 多层加密后的密文
         """
         cipher_data = self.__deserialize_cipher(base64_cipher)
-        r = secrets.randbelow(self.G.order() - 1) + 1
-        pubkey_point = Util.tuple_to_point(self.curve, public_key)
+        r, rG = self.__ephemeral_pair()
+        pubkey_point = Util.tuple_to_point(self.curve, public_key, cached=True)
 
         # 确定新的层数
         c_keys = [k for k in cipher_data if k.startswith('c') and k[1:].isdigit()]
         layer_num = max(int(k[1:]) for k in c_keys) + 1 if c_keys else 1
 
         # 添加新层加密
-        cipher_data[f'c{layer_num}'] = Util.point_to_tuple(r * self.G)
-        cipher_data['cts'] = [
-            Util.point_to_tuple(Util.tuple_to_point(self.curve, ct) + r * pubkey_point)
+        cipher_data[f'c{layer_num}'] = Util.point_to_tuple(rG)
+        shared = r * pubkey_point
+        cipher_data['cts'] = Util.points_to_tuples([
+            Util.tuple_to_point(self.curve, ct) + shared
             for ct in cipher_data['cts']
-        ]
+        ])
         return self.__serialize_cipher(cipher_data)
 
     def ecc_multi_decrypt(self, base64_cipher: str, private_key: int, blinding: str) -> str:
@@ -224,14 +465,45 @@ class ECC:
             raise KeyError(f"找不到辅助密文 {blinding}")
 
         # 解密当前层
-        cipher_point = Util.tuple_to_point(self.curve, cipher_data[blinding])
-        cipher_data['cts'] = [
-            Util.point_to_tuple(Util.tuple_to_point(self.curve, ct) - (private_key * cipher_point))
+        shared = private_key * Util.tuple_to_point(self.curve, cipher_data[blinding])
+        cipher_data['cts'] = Util.points_to_tuples([
+            Util.tuple_to_point(self.curve, ct) - shared
             for ct in cipher_data['cts']
-        ]
+        ])
         del cipher_data[blinding]
         return self.__serialize_cipher(cipher_data)
 
+    def reencrypt(self, base64_cipher: str, public_key: tuple, private_key: int, blinding: str) -> str:
+        """
+        一次完成转加密：为密文添加一层新公钥加密，同时移除当前私钥对应的一层，
+        等价于先 ecc_multi_encrypt 再 ecc_multi_decrypt，但只解析/序列化一次，每个密文点只做一次点加
+        :param base64_cipher: Base64 编码的多层密文
+        :param public_key: 新增层的公钥
+        :param private_key: 被移除层的私钥
+        :param blinding: 被移除层的辅助密文标识
+        :return: 转加密后的密文
+        """
+        cipher_data = self.__deserialize_cipher(base64_cipher)
+        if blinding not in cipher_data:
+            raise KeyError(f"找不到辅助密文 {blinding}")
+        r, rG = self.__ephemeral_pair()
+        pubkey_point = Util.tuple_to_point(self.curve, public_key, cached=True)
+
+        # 新层编号与先加密后解密时一致（在移除旧层之前确定）
+        c_keys = [k for k in cipher_data if k.startswith('c') and k[1:].isdigit()]
+        layer_num = max(int(k[1:]) for k in c_keys) + 1
+
+        # 合并两层的变换：delta = r * P_new - k * C_old，用一次双标量乘法求得
+        delta = Util.double_scalar_mul(r, pubkey_point, -private_key,
+                                       Util.tuple_to_point(self.curve, cipher_data[blinding]))
+        cipher_data['cts'] = Util.points_to_tuples([
+            Util.tuple_to_point(self.curve, ct) + delta
+            for ct in cipher_data['cts']
+        ])
+        del cipher_data[blinding]
+        cipher_data[f'c{layer_num}'] = Util.point_to_tuple(rG)
+        return self.__serialize_cipher(cipher_data)
+
 
 class SM2:
     """SM2 签名算法实现类"""
@@ -245,6 +517,7 @@ class SM2:
         self.G = G          # 基点
         self.p = curve.p()  # 曲线模数
         self.user_id = user_id
+        self.ephemeral_source = None    # 可选的临时密钥对 (k, k*G) 来源（如预计算池），为空时现场生成
 
     def compute_sm2_za(self, public_key: tuple[int, int], user_id: Optional[str] = None) -> str:
         """计算 SM2 ZA 值"""
@@ -281,8 +554,12 @@ class SM2:
 
             # 生成签名
             while True:
-                k = secrets.randbelow(n-1) + 1  # 生成随机数 k
-                x = (k * self.G).x()            # 计算 k*G 的 x 坐标
+                if self.ephemeral_source:       # 从预计算池获取 (k, k*G)
+                    k, kG = self.ephemeral_source()
+                else:
+                    k = secrets.randbelow(n-1) + 1  # 生成随机数 k
+                    kG = k * self.G
+                x = kG.x()                      # 计算 k*G 的 x 坐标
                 r = (x + e) % n                 # 计算 r 值
                 
                 # 检查 r 值是否有效
@@ -290,7 +567,7 @@ class SM2:
                     continue
                 
                 # 计算 s 值
-                s = (arithmetic.mod_inverse((1+private_key), n) * (k-r*private_key)) % n
+                s = (arithmetic.mod_inverse((1+private_key), n, self.curve.backend()) * (k-r*private_key)) % n
                 if s != 0:  # s 值有效，结束循环
                     break
                     
@@ -313,7 +590,7 @@ class SM2:
             # 准备验证参数
             r, s = tuple(signature)
 
-            pubkey_point = Util.tuple_to_point(self.curve, tuple(public_key))
+            pubkey_point = Util.tuple_to_point(self.curve, public_key, cached=True)
             message = b''.join([ZA, message])
             n = self.G.order()
             e = Hash.digest(message, "md5", "int")
@@ -324,7 +601,7 @@ class SM2:
 
             # 计算验证值
             t = (r + s) % n
-            result_point = s * self.G + t * pubkey_point
+            result_point = Util.double_scalar_mul(s, self.G, t, pubkey_point)
             if result_point.x() is None:
                 return False
                 
@@ -338,6 +615,11 @@ class SM2:
 
 
 class Base64:
+    """Base64 编解码（基于 binascii）：保持原纯 Python 实现的容错语义"""
+    ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    # 删除合法字符（含 '='）后剩下的即为非法字符
+    _STRIP_VALID = str.maketrans('', '', ALPHABET + '=')
+
     @staticmethod
     def b64encode(data) -> str:
         """
@@ -345,90 +627,117 @@ class Base64:
         :param data: 输入数据（字节或字符串）
         :return: Base64编码字符串（字符串）
         """
-        base64EncodeChars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
         if isinstance(data, str):
             data = data.encode('utf-8')
-        encoded = []
-        for i in range(0, len(data), 3):
-            # 每次处理3个字节
-            chunk = data[i:i + 3]
-            char1 = chunk[0]
-            char2 = chunk[1] if len(chunk) > 1 else 0
-            char3 = chunk[2] if len(chunk) > 2 else 0
-
-            # 将3个字节转换为4个6位索引
-            out1 = (char1 & 0xFC) >> 2
-            out2 = ((char1 & 0x03) << 4) | ((char2 & 0xF0) >> 4)
-            out3 = ((char2 & 0x0F) << 2) | ((char3 & 0xC0) >> 6)
-            out4 = char3 & 0x3F
-
-            # 根据数据长度处理填充
-            if len(chunk) == 3:
-                encoded.extend([
-                    base64EncodeChars[out1],
-                    base64EncodeChars[out2],
-                    base64EncodeChars[out3],
-                    base64EncodeChars[out4]
-                ])
-            elif len(chunk) == 2:
-                encoded.extend([
-                    base64EncodeChars[out1],
-                    base64EncodeChars[out2],
-                    base64EncodeChars[out3],
-                    '='
-                ])
-            else:  # 1个字节
-                encoded.extend([
-                    base64EncodeChars[out1],
-                    base64EncodeChars[out2],
-                    '=',
-                    '='
-                ])
-        return ''.join(encoded)
+        return binascii.b2a_base64(data, newline=False).decode('ascii')
 
     @staticmethod
     def b64decode(ct: str) -> bytes:
         """
         将Base64字符串解码为原始字节
+        语义与原实现一致：忽略末尾填充，中间的 '=' 视为 'A'，长度余 1 时舍弃最后一个字符，非法字符抛出 ValueError
         :param ct: Base64编码字符串
         :return: 解码后的字节数据
         """
-        base64EncodeChars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
-        base64DecodeChars = {char: idx for idx, char in enumerate(base64EncodeChars)}
-        # 移除末尾填充并计算填充量
         s = ct.rstrip('=')
-        num_padding = 4 - (len(s) % 4) if len(s) % 4 != 0 else 0
-        s += 'A' * num_padding  # 填充无效字符以便统一处理
-
-        decoded = bytearray()
-        for i in range(0, len(s), 4):
-            chunk = s[i:i + 4]
-            if len(chunk) != 4:
-                raise ValueError("Invalid Base64 string length")
-
-            # 将字符转换为索引值（无效字符会抛出异常）
-            indices = []
-            for c in chunk:
-                if c == '=':
-                    indices.append(0)
-                else:
-                    try:
-                        indices.append(base64DecodeChars[c])
-                    except KeyError:
-                        raise ValueError(f"Invalid character '{c}' in Base64 string")
+        Base64._check(s)
+        return Base64._decode(s.replace('=', 'A'), final=True)
 
-            # 合并4个6位值为24位整型
-            combined = (indices[0] << 18) | (indices[1] << 12) | (indices[2] << 6) | indices[3]
+    @staticmethod
+    def _check(s: str) -> None:
+        """校验字符合法性，报告第一个非法字符"""
+        if invalid := s.translate(Base64._STRIP_VALID):
+            raise ValueError(f"Invalid character '{invalid[0]}' in Base64 string")
+
+    @staticmethod
+    def _decode(s: str, final: bool) -> bytes:
+        """解码已校验且不含 '=' 的字符串；final 为 True 时按原语义补齐末尾不完整的分组"""
+        if final:
+            match len(s) % 4:
+                case 1:
+                    s = s[:-1]  # 单个剩余字符不足一个字节，直接舍弃
+                case 2:
+                    s += '=='
+                case 3:
+                    s += '='
+        return binascii.a2b_base64(s)
+
+
+class Base64Encoder:
+    """增量 Base64 编码器：分块输入，输出与一次性 Base64.b64encode 拼接结果一致"""
+    def __init__(self):
+        self.__pending = b''
+
+    def update(self, data: Union[str, bytes]) -> str:
+        """
+        输入一块数据，返回目前可以确定的编码结果（3 字节的整数倍）
+        :param data: 数据块（字节或字符串）
+        :return: Base64 字符串片段
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        data = self.__pending + bytes(data)
+        cut = len(data) - len(data) % 3
+        self.__pending = data[cut:]
+        return Base64.b64encode(data[:cut])
+
+    def finalize(self) -> str:
+        """输出剩余数据（含填充）并重置编码器"""
+        out, self.__pending = Base64.b64encode(self.__pending), b''
+        return out
 
-            # 提取3个字节（根据实际填充量调整）
-            decoded.append((combined >> 16) & 0xFF)
-            decoded.append((combined >> 8) & 0xFF)
-            decoded.append(combined & 0xFF)
 
-        # 移除填充字节
-        if num_padding:
-            del decoded[-num_padding:]
-        return bytes(decoded)
+class Base64Decoder:
+    """增量 Base64 解码器：分块输入，输出与一次性 Base64.b64decode 整串解码结果一致"""
+    def __init__(self):
+        self.__pending = ''
+
+    def update(self, text: str) -> bytes:
+        """
+        输入一段 Base64 文本，返回目前可以确定的字节（末尾的 '=' 在后续输入到来前暂不处理）
+        :param text: Base64 文本片段
+        :return: 解码出的字节
+        """
+        Base64._check(text)
+        text = self.__pending + text
+        body = text.rstrip('=')
+        tail = text[len(body):]
+        body = body.replace('=', 'A')   # 后面还有数据的 '=' 属于中间位置
+        cut = len(body) - len(body) % 4
+        self.__pending = body[cut:] + tail
+        return Base64._decode(body[:cut], final=False)
+
+    def finalize(self) -> bytes:
+        """解码剩余文本并重置解码器"""
+        s, self.__pending = self.__pending.rstrip('='), ''
+        return Base64._decode(s, final=True)
+
+
+def _gf_mul(a: int, b: int) -> int:
+    """GF(2^8) 上的乘法（模 x^8 + x^4 + x^3 + x + 1）"""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = (a << 1) ^ (0x11B if a & 0x80 else 0)
+        b >>= 1
+    return result
+
+
+def _aes_t_tables(box: tuple, matrix: tuple) -> tuple:
+    """
+    生成 AES 的 4 张 32 位 T 表：T0[x] 为 S 盒输出与列混合矩阵第 0 列相乘得到的一列，T1~T3 依次循环右移 8 位
+    :param box: S 盒（加密）或逆 S 盒（解密）
+    :param matrix: 列混合矩阵或逆列混合矩阵
+    :return: (T0, T1, T2, T3)
+    """
+    flat = [v for row in box for v in row]
+    t0 = tuple((_gf_mul(flat[x], matrix[0][0]) << 24) | (_gf_mul(flat[x], matrix[1][0]) << 16) |
+               (_gf_mul(flat[x], matrix[2][0]) << 8) | _gf_mul(flat[x], matrix[3][0]) for x in range(256))
+    t1 = tuple(((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in t0)
+    t2 = tuple(((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in t1)
+    t3 = tuple(((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in t2)
+    return t0, t1, t2, t3
 
 
 class AES:
@@ -507,6 +816,15 @@ class AES:
         [0x17, 0x2B, 0x04, 0x7E, 0xBA, 0x77, 0xD6, 0x26, 0xE1, 0x69, 0x14, 0x63, 0x55, 0x21, 0x0C, 0x7D]
     ])
 
+    # 一维 S 盒 / 逆 S 盒，以及合并了字节替换、行移位、列混合的 T 表（每轮每列 4 次查表 + 异或）
+    SBOX_FLAT = tuple(v for row in S_BOX for v in row)
+    I_SBOX_FLAT = tuple(v for row in I_SBOX for v in row)
+    TE = _aes_t_tables(S_BOX, MIX_C)
+    TD = _aes_t_tables(I_SBOX, I_MIXC)
+
+    # 输入达到该字节数且各块可独立处理（ECB、CTR、CBC 解密）时使用 NumPy 向量化实现，设为 None 则始终逐块处理
+    NUMPY_MIN_BYTES = 1024
+
     def __init__(self, mode='ECB', iv=None, padding_type='PKCS7Padding'):
         """
         初始化 AES 加密器
@@ -519,16 +837,18 @@ class AES:
         self.padding_type = padding_type    # 填充方式
 
     # ------------------------- 辅助方法 -------------------------
-    def __16bytes_xor(self, a, b):
-        """对两个16字节数据进行按位异或操作"""
-        return [a[i] ^ b[i] for i in range(16)]
-
     def __iv_hex_to_bytes(self, hex_str):
         """将IV（初始化向量）的十六进制字符串转换为字节列表"""
         if len(hex_str) != 32:
             raise ValueError("IV必须为16字节（32个十六进制字符）。")
         return [int(hex_str[i:i + 2], AES.BLOCK_SIZE) for i in range(0, len(hex_str), 2)]
 
+    @staticmethod
+    def __xor_block(block: bytes, output: int) -> bytes:
+        """CFB、OFB、CTR模式需要将AES的输出与明文进行异或（末块不足16字节时只取输出的前若干字节）"""
+        n = len(block)
+        return (int.from_bytes(block, 'big') ^ (output >> (AES.BLOCK_SIZE - n) * 8)).to_bytes(n, 'big')
+
     # ------------------------- 填充方法 -------------------------
     def __pad(self, byte_list):
         """对数据进行填充，支持多种填充方式"""
@@ -552,138 +872,207 @@ class AES:
             return byte_list[:-padding_size]
         return byte_list
 
-    # ------------------------- 分组方法 -------------------------
-    def __xor_block(self, block, output):
-        """CFB、OFB、CTR模式需要将AES的输出与明文进行异或"""
-        return [b ^ o for b, o in zip(block, output)]
-
-    def __increment_counter(self, counter):
-        """增加计数器（用于CTR模式）"""
-        counter_int = int.from_bytes(counter, 'big') + 1
-        return counter_int.to_bytes(AES.BLOCK_SIZE, 'big')
-
-    # ------------------------- AES核心操作 -------------------------
-    def __mul(self, poly1, poly2):
-        """多项式相乘"""
-        result = 0
-        for index in range(poly2.bit_length()):
-            if poly2 & 1 << index:
-                result ^= poly1 << index
-        return result
-
-    def __mod(self, poly, mod=0b100011011):
-        """poly模多项式mod"""
-        while poly.bit_length() > 8:
-            poly ^= mod << poly.bit_length() - 9
-        return poly
-
-    def __sub_bytes(self, State):
-        """字节替换操作（__sub_bytes）"""
-        return [self.S_BOX[i >> 4][i & 0xF] for i in State]
-
-    def __sub_bytes_inv(self, State):
-        """逆字节替换操作（__sub_bytes）"""
-        return [self.I_SBOX[i >> 4][i & 0xF] for i in State]
-
-    def __shift_rows(self, S):
-        """行位移操作（__shift_rows）"""
-        return [S[0], S[5], S[10], S[15], S[4], S[9], S[14], S[3],
-                S[8], S[13], S[2], S[7], S[12], S[1], S[6], S[11]]
-
-    def __shift_rows_inv(self, S):
-        """逆行位移操作（__shift_rows）"""
-        return [S[0], S[13], S[10], S[7], S[4], S[1], S[14], S[11],
-                S[8], S[5], S[2], S[15], S[12], S[9], S[6], S[3]]
-
-    def __mix_columns(self, State):
-        """列混合操作（__mix_columns）"""
-        return self.__matrix_mul(self.MIX_C, State)
-
-    def __mix_columns_inv(self, State):
-        """逆列混合操作（__mix_columns）"""
-        return self.__matrix_mul(self.I_MIXC, State)
-
-    def __matrix_mul(self, M1, M2):
-        """矩阵乘法（用于列混合）"""
-        M = [0] * AES.BLOCK_SIZE
-        for row in range(4):
-            for col in range(4):
-                for Round in range(4):
-                    M[row + col * 4] ^= self.__mul(M1[row][Round], M2[Round + col * 4])
-                M[row + col * 4] = self.__mod(M[row + col * 4])
-        return M
-
-    def __add_round_key(self, State, RoundKeys, index):
-        """轮密钥加法操作"""
-        return self.__16bytes_xor(State, RoundKeys[index])
-
-    def __sub_word(self, _4byte_block):
-        """4字节块的字节替换，用于密钥扩展"""
-        result = 0
-        for position in range(4):
-            i = _4byte_block >> position * 8 + 4 & 0xf
-            j = _4byte_block >> position * 8 & 0xf
-            result ^= self.S_BOX[i][j] << position * 8
-        return result
-
-    def __rot_word(self, _4byte_block):
-        """轮密钥扩展中的字移位操作"""
-        return ((_4byte_block & 0xffffff) << 8) + (_4byte_block >> 24)
-
-    def __round_key_generator(self, key):
-        """生成AES的轮密钥"""
-        w = [key >> 96, key >> 64 & 0xFFFFFFFF, key >> 32 & 0xFFFFFFFF, key & 0xFFFFFFFF] + [0] * 40
+    # ------------------------- 密钥扩展 -------------------------
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _key_schedule(key: int) -> tuple:
+        """
+        生成 AES-128 的加密/解密轮密钥（各 44 个 32 位字），按密钥缓存，重复使用同一密钥时不再重新扩展。
+        解密轮密钥按轮逆序排列，且第 1~9 轮已做逆列混合，供等价逆密码的 T 表解密使用
+        :param key: 128 位密钥整数
+        :return: (加密轮密钥字, 解密轮密钥字)
+        """
+        if key >> 128:
+            raise OverflowError("int too big to convert")
+        sbox, (td0, td1, td2, td3) = AES.SBOX_FLAT, AES.TD
+
+        # 密钥扩展
+        w = [key >> 96, key >> 64 & 0xFFFFFFFF, key >> 32 & 0xFFFFFFFF, key & 0xFFFFFFFF]
         for i in range(4, 44):
             temp = w[i - 1]
             if i % 4 == 0:
-                temp = self.__sub_word(self.__rot_word(temp)) ^ self.RCON[i // 4 - 1]
-            w[i] = w[i - 4] ^ temp
-        return [sum([w[4 * i] << 96, w[4 * i + 1] << 64, w[4 * i + 2] << 32, w[4 * i + 3]]).to_bytes(AES.BLOCK_SIZE, byteorder='big') for i in range(11)]
+                temp = ((temp & 0xFFFFFF) << 8) | (temp >> 24)      # 字移位
+                temp = ((sbox[temp >> 24] << 24) | (sbox[temp >> 16 & 0xFF] << 16) |
+                        (sbox[temp >> 8 & 0xFF] << 8) | sbox[temp & 0xFF]) ^ AES.RCON[i // 4 - 1]
+            w.append(w[i - 4] ^ temp)
+
+        # 等价逆密码的轮密钥：InvMixColumns(w) = TD[S[w]]（逆 S 盒与 S 盒相互抵消）
+        dw = []
+        for rnd in range(10, -1, -1):
+            for word in w[4 * rnd:4 * rnd + 4]:
+                if 0 < rnd < 10:
+                    word = (td0[sbox[word >> 24]] ^ td1[sbox[word >> 16 & 0xFF]] ^
+                            td2[sbox[word >> 8 & 0xFF]] ^ td3[sbox[word & 0xFF]])
+                dw.append(word)
+        return tuple(w), tuple(dw)
 
     # ------------------------- 数据块加解密 -------------------------
-    def __aes_encrypt_block(self, block, RoundKeys):
+    @staticmethod
+    def __aes_encrypt_block(block: int, rk: tuple) -> int:
         """
-        AES 单个数据块加密
-        :param block: 16字节明文块
-        :param RoundKeys: 轮密钥列表
-        :return: 16字节密文块
+        AES 单个数据块加密（T 表实现）
+        :param block: 128 位明文块整数
+        :param rk: 加密轮密钥字
+        :return: 128 位密文块整数
         """
+        te0, te1, te2, te3 = AES.TE
+        sbox = AES.SBOX_FLAT
         # 初始轮密钥加
-        State = self.__add_round_key(block, RoundKeys, 0)
-        
-        # 9轮标准变换
-        for Round in range(1, 10):
-            State = self.__sub_bytes(State)      # 字节替换：通过S盒替换每个字节
-            State = self.__shift_rows(State)     # 行移位：循环移动状态矩阵的行
-            State = self.__mix_columns(State)    # 列混合：通过矩阵乘法混淆每列
-            State = self.__add_round_key(State, RoundKeys, Round)  # 轮密钥加
-        
+        s0 = (block >> 96) ^ rk[0]
+        s1 = (block >> 64 & 0xFFFFFFFF) ^ rk[1]
+        s2 = (block >> 32 & 0xFFFFFFFF) ^ rk[2]
+        s3 = (block & 0xFFFFFFFF) ^ rk[3]
+
+        # 9轮标准变换：字节替换、行移位、列混合合并为查表
+        for k in range(4, 40, 4):
+            s0, s1, s2, s3 = (
+                te0[s0 >> 24] ^ te1[s1 >> 16 & 0xFF] ^ te2[s2 >> 8 & 0xFF] ^ te3[s3 & 0xFF] ^ rk[k],
+                te0[s1 >> 24] ^ te1[s2 >> 16 & 0xFF] ^ te2[s3 >> 8 & 0xFF] ^ te3[s0 & 0xFF] ^ rk[k + 1],
+                te0[s2 >> 24] ^ te1[s3 >> 16 & 0xFF] ^ te2[s0 >> 8 & 0xFF] ^ te3[s1 & 0xFF] ^ rk[k + 2],
+                te0[s3 >> 24] ^ te1[s0 >> 16 & 0xFF] ^ te2[s1 >> 8 & 0xFF] ^ te3[s2 & 0xFF] ^ rk[k + 3],
+            )
+
         # 最后一轮变换（无列混合）
-        State = self.__sub_bytes(State)          # 字节替换
-        State = self.__shift_rows(State)         # 行移位
-        return self.__add_round_key(State, RoundKeys, 10)  # 最后轮密钥加
+        return ((((sbox[s0 >> 24] << 24) | (sbox[s1 >> 16 & 0xFF] << 16) | (sbox[s2 >> 8 & 0xFF] << 8) | sbox[s3 & 0xFF]) ^ rk[40]) << 96 |
+                (((sbox[s1 >> 24] << 24) | (sbox[s2 >> 16 & 0xFF] << 16) | (sbox[s3 >> 8 & 0xFF] << 8) | sbox[s0 & 0xFF]) ^ rk[41]) << 64 |
+                (((sbox[s2 >> 24] << 24) | (sbox[s3 >> 16 & 0xFF] << 16) | (sbox[s0 >> 8 & 0xFF] << 8) | sbox[s1 & 0xFF]) ^ rk[42]) << 32 |
+                (((sbox[s3 >> 24] << 24) | (sbox[s0 >> 16 & 0xFF] << 16) | (sbox[s1 >> 8 & 0xFF] << 8) | sbox[s2 & 0xFF]) ^ rk[43]))
 
-    def __aes_decrypt_block(self, block, RoundKeys):
+    @staticmethod
+    def __aes_decrypt_block(block: int, rk: tuple) -> int:
         """
-        AES 单个数据块解密
-        :param block: 16字节密文块
-        :param RoundKeys: 轮密钥列表
-        :return: 16字节明文块
+        AES 单个数据块解密（等价逆密码的 T 表实现）
+        :param block: 128 位密文块整数
+        :param rk: 解密轮密钥字
+        :return: 128 位明文块整数
         """
+        td0, td1, td2, td3 = AES.TD
+        ibox = AES.I_SBOX_FLAT
         # 初始轮密钥加（使用最后一轮密钥）
-        State = self.__add_round_key(block, RoundKeys, 10)
-        
-        # 9轮逆向变换
-        for Round in range(1, 10):
-            State = self.__shift_rows_inv(State)     # 逆行移位
-            State = self.__sub_bytes_inv(State)      # 逆字节替换
-            State = self.__add_round_key(State, RoundKeys, 10 - Round)  # 轮密钥加
-            State = self.__mix_columns_inv(State)    # 逆列混合
-        
+        s0 = (block >> 96) ^ rk[0]
+        s1 = (block >> 64 & 0xFFFFFFFF) ^ rk[1]
+        s2 = (block >> 32 & 0xFFFFFFFF) ^ rk[2]
+        s3 = (block & 0xFFFFFFFF) ^ rk[3]
+
+        # 9轮逆向变换：逆行移位、逆字节替换、逆列混合合并为查表
+        for k in range(4, 40, 4):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[s3 >> 16 & 0xFF] ^ td2[s2 >> 8 & 0xFF] ^ td3[s1 & 0xFF] ^ rk[k],
+                td0[s1 >> 24] ^ td1[s0 >> 16 & 0xFF] ^ td2[s3 >> 8 & 0xFF] ^ td3[s2 & 0xFF] ^ rk[k + 1],
+                td0[s2 >> 24] ^ td1[s1 >> 16 & 0xFF] ^ td2[s0 >> 8 & 0xFF] ^ td3[s3 & 0xFF] ^ rk[k + 2],
+                td0[s3 >> 24] ^ td1[s2 >> 16 & 0xFF] ^ td2[s1 >> 8 & 0xFF] ^ td3[s0 & 0xFF] ^ rk[k + 3],
+            )
+
         # 最后一轮逆向变换（无列混合）
-        State = self.__shift_rows_inv(State)         # 逆行移位
-        State = self.__sub_bytes_inv(State)          # 逆字节替换
-        return self.__add_round_key(State, RoundKeys, 0)  # 最后轮密钥加
+        return ((((ibox[s0 >> 24] << 24) | (ibox[s3 >> 16 & 0xFF] << 16) | (ibox[s2 >> 8 & 0xFF] << 8) | ibox[s1 & 0xFF]) ^ rk[40]) << 96 |
+                (((ibox[s1 >> 24] << 24) | (ibox[s0 >> 16 & 0xFF] << 16) | (ibox[s3 >> 8 & 0xFF] << 8) | ibox[s2 & 0xFF]) ^ rk[41]) << 64 |
+                (((ibox[s2 >> 24] << 24) | (ibox[s1 >> 16 & 0xFF] << 16) | (ibox[s0 >> 8 & 0xFF] << 8) | ibox[s3 & 0xFF]) ^ rk[42]) << 32 |
+                (((ibox[s3 >> 24] << 24) | (ibox[s2 >> 16 & 0xFF] << 16) | (ibox[s1 >> 8 & 0xFF] << 8) | ibox[s0 & 0xFF]) ^ rk[43]))
+
+    # ------------------------- NumPy 向量化实现 -------------------------
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _np_tables() -> dict:
+        """构建向量化实现所需的 uint8 查找表与行移位下标（状态第 i 字节位于第 i % 4 行、第 i // 4 列）"""
+        def table(factor):
+            return np.array([_gf_mul(x, factor) for x in range(256)], dtype=np.uint8)
+        return {
+            'sbox': np.array(AES.SBOX_FLAT, dtype=np.uint8),
+            'ibox': np.array(AES.I_SBOX_FLAT, dtype=np.uint8),
+            'mul2': table(2),
+            'mul4': table(4),
+            'shift': np.array([r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)]),
+            'ishift': np.array([r + 4 * ((c - r) % 4) for c in range(4) for r in range(4)]),
+        }
+
+    @staticmethod
+    def _np_mix_columns(state, mul2):
+        """
+        对所有块同时进行列混合：b[r] = a[r] ^ t ^ 2·(a[r] ^ a[r+1])，t 为整列的异或
+        :param state: (n, 16) 的 uint8 状态矩阵
+        :param mul2: GF(2^8) 乘 2 查找表
+        :return: 列混合后的状态矩阵
+        """
+        col = state.reshape(-1, 4, 4)
+        t = np.bitwise_xor.reduce(col, axis=2, keepdims=True)
+        return (col ^ t ^ mul2[col ^ np.roll(col, -1, axis=2)]).reshape(-1, 16)
+
+    @staticmethod
+    def _np_encrypt_blocks(state, RoundKeys: tuple):
+        """
+        向量化加密多个数据块
+        :param state: (n, 16) 的 uint8 明文块矩阵
+        :param RoundKeys: 加密轮密钥字
+        :return: (n, 16) 的 uint8 密文块矩阵
+        """
+        t = AES._np_tables()
+        sbox, shift, mul2 = t['sbox'], t['shift'], t['mul2']
+        keys = np.frombuffer(b''.join(w.to_bytes(4, 'big') for w in RoundKeys), dtype=np.uint8).reshape(11, 16)
+
+        state = state ^ keys[0]
+        for rnd in range(1, 10):
+            state = sbox[state[:, shift]]                   # 行移位 + 字节替换
+            state = AES._np_mix_columns(state, mul2)        # 列混合
+            state ^= keys[rnd]                              # 轮密钥加
+        return sbox[state[:, shift]] ^ keys[10]
+
+    @staticmethod
+    def _np_decrypt_blocks(state, RoundKeys: tuple):
+        """
+        向量化解密多个数据块（标准逆密码，直接使用加密轮密钥）
+        :param state: (n, 16) 的 uint8 密文块矩阵
+        :param RoundKeys: 加密轮密钥字
+        :return: (n, 16) 的 uint8 明文块矩阵
+        """
+        t = AES._np_tables()
+        ibox, ishift, mul2, mul4 = t['ibox'], t['ishift'], t['mul2'], t['mul4']
+        keys = np.frombuffer(b''.join(w.to_bytes(4, 'big') for w in RoundKeys), dtype=np.uint8).reshape(11, 16)
+
+        state = state ^ keys[10]
+        for rnd in range(9, 0, -1):
+            state = ibox[state[:, ishift]] ^ keys[rnd]      # 逆行移位 + 逆字节替换 + 轮密钥加
+            # 逆列混合 = 先令 a[r] ^= 4·(a[r] ^ a[r+2])，再做一次列混合
+            col = state.reshape(-1, 4, 4)
+            col = col ^ mul4[col ^ np.roll(col, -2, axis=2)]
+            state = AES._np_mix_columns(col.reshape(-1, 16), mul2)
+        return ibox[state[:, ishift]] ^ keys[0]
+
+    def __use_numpy(self, size: int, decrypt: bool) -> bool:
+        """判断本次加解密是否走向量化实现：NumPy 可用、输入足够大，且各数据块可以相互独立地处理"""
+        if np is None or AES.NUMPY_MIN_BYTES is None or not size or size < AES.NUMPY_MIN_BYTES:
+            return False
+        if self.mode == 'CTR':
+            return True
+        return size % AES.BLOCK_SIZE == 0 and (self.mode == 'ECB' or (decrypt and self.mode == 'CBC'))
+
+    def __np_crypt(self, data: bytes, RoundKeys: tuple, decrypt: bool) -> bytes:
+        """
+        向量化处理 ECB、CTR 以及 CBC 解密
+        :param data: 已填充的明文或密文
+        :param RoundKeys: 加密轮密钥字
+        :param decrypt: 是否为解密
+        :return: 处理结果
+        """
+        if self.mode == 'CTR':
+            # 一次生成全部计数器块（128 位计数器拆为高低两个 64 位整数进位相加），加密得到密钥流后与数据异或
+            n = -(-len(data) // AES.BLOCK_SIZE)
+            iv = int.from_bytes(bytes(self.__iv_hex_to_bytes(self.iv)), 'big')
+            low = np.uint64(iv & 0xFFFFFFFFFFFFFFFF) + np.arange(n, dtype=np.uint64)
+            high = np.uint64(iv >> 64) + (low < np.uint64(iv & 0xFFFFFFFFFFFFFFFF)).astype(np.uint64)
+            counters = np.stack([high, low], axis=1).astype('>u8').view(np.uint8)
+            stream = self._np_encrypt_blocks(counters, RoundKeys).reshape(-1)[:len(data)]
+            return (np.frombuffer(data, dtype=np.uint8) ^ stream).tobytes()
+
+        blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, AES.BLOCK_SIZE)
+        if not decrypt:
+            return self._np_encrypt_blocks(blocks, RoundKeys).tobytes()
+
+        result = self._np_decrypt_blocks(blocks, RoundKeys)
+        if self.mode == 'CBC':
+            # CBC 解密：每块明文 = 解密结果 ^ 前一密文块（首块为 IV）
+            result[0] ^= np.array(self.__iv_hex_to_bytes(self.iv), dtype=np.uint8)
+            result[1:] ^= blocks[:-1]
+        return result.tobytes()
 
     # ------------------------- 加解密主函数 -------------------------
     def aes_encrypt(self, plaintext, hex_key: str) -> str:
@@ -694,8 +1083,9 @@ class AES:
         :return: Base64编码的密文
         """
         # 初始化
-        ciphertext = []
-        RoundKeys = self.__round_key_generator(int(hex_key, 16))
+        ciphertext = bytearray()
+        RoundKeys, _ = AES._key_schedule(int(hex_key, 16))
+        encrypt_block = self.__aes_encrypt_block
 
         # 处理输入数据
         try:
@@ -704,51 +1094,46 @@ class AES:
             raise TypeError('明文必须是str或bytes类型')
 
         # 填充处理
-        plaintext = self.__pad(pt_bytes)
+        plaintext = bytes(self.__pad(pt_bytes))
 
         # 检查IV
         if self.mode in ['CFB', 'OFB', 'CTR'] and not self.iv:
             raise ValueError(f"{self.mode}模式需要IV")
 
-        # 获取初始向量
-        prev_block = (self.__iv_hex_to_bytes(self.iv) if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
+        # 大输入整体向量化加密
+        if self.__use_numpy(len(plaintext), decrypt=False):
+            return Base64.b64encode(self.__np_crypt(plaintext, RoundKeys, decrypt=False))
+
+        # 获取初始向量（以 128 位整数表示）
+        prev_block = (int.from_bytes(bytes(self.__iv_hex_to_bytes(self.iv)), 'big')
+                      if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
 
         # 分块加密
-        cipher_block = ''
         for i in range(0, len(plaintext), AES.BLOCK_SIZE):
             block = plaintext[i:i + AES.BLOCK_SIZE]
 
             if self.mode == 'ECB':
                 # ECB模式：直接加密
-                ciphertext.extend(self.__aes_encrypt_block(block, RoundKeys))
+                ciphertext += encrypt_block(int.from_bytes(block, 'big'), RoundKeys).to_bytes(16, 'big')
 
             elif self.mode == 'CBC':
                 # CBC模式：先异或后加密
-                block_xored = self.__16bytes_xor(block, prev_block)
-                block_encrypted = self.__aes_encrypt_block(block_xored, RoundKeys)
-                ciphertext.extend(block_encrypted)
-                prev_block = block_encrypted
+                prev_block = encrypt_block(int.from_bytes(block, 'big') ^ prev_block, RoundKeys)
+                ciphertext += prev_block.to_bytes(16, 'big')
 
             else:  # CFB/OFB/CTR 模式
+                output = encrypt_block(prev_block, RoundKeys)
+                cipher_block = self.__xor_block(block, output)
                 if self.mode == 'CFB':
                     # CFB模式：加密前一密文块后与明文异或
-                    output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                    cipher_block = self.__xor_block(block, output)
-                    prev_block = cipher_block
-
+                    prev_block = int.from_bytes(cipher_block, 'big')
                 elif self.mode == 'OFB':
                     # OFB模式：加密前一输出后与明文异或
-                    output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                    cipher_block = self.__xor_block(block, output)
                     prev_block = output
-
                 elif self.mode == 'CTR':
                     # CTR模式：加密计数器后与明文异或
-                    output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                    cipher_block = self.__xor_block(block, output)
-                    prev_block = self.__increment_counter(prev_block)
-
-                ciphertext.extend(cipher_block)
+                    prev_block = (prev_block + 1) & ((1 << 128) - 1)
+                ciphertext += cipher_block
 
         return Base64.b64encode(bytes(ciphertext))
 
@@ -760,16 +1145,24 @@ class AES:
         :return: Base64编码的明文
         """
         # 初始化
-        plaintext = []
-        ciphertext = list(Base64.b64decode(ciphertext))
-        RoundKeys = self.__round_key_generator(int(hex_key, 16))
+        plaintext = bytearray()
+        ciphertext = Base64.b64decode(ciphertext)
+        RoundKeys, InvRoundKeys = AES._key_schedule(int(hex_key, 16))
+        encrypt_block, decrypt_block = self.__aes_encrypt_block, self.__aes_decrypt_block
 
         # 检查IV
         if self.mode in ['CFB', 'OFB', 'CTR'] and not self.iv:
             raise ValueError(f"{self.mode}模式需要IV")
+        if self.mode in ['ECB', 'CBC'] and len(ciphertext) % AES.BLOCK_SIZE:
+            raise ValueError(f"{self.mode}模式的密文长度必须是{AES.BLOCK_SIZE}字节的整数倍")
+
+        # 大输入整体向量化解密
+        if self.__use_numpy(len(ciphertext), decrypt=True):
+            return bytes(self.__unpad(self.__np_crypt(ciphertext, RoundKeys, decrypt=True)))
 
-        # 获取初始向量
-        prev_block = (self.__iv_hex_to_bytes(self.iv) if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
+        # 获取初始向量（以 128 位整数表示）
+        prev_block = (int.from_bytes(bytes(self.__iv_hex_to_bytes(self.iv)), 'big')
+                      if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
 
         # 分块解密
         for i in range(0, len(ciphertext), AES.BLOCK_SIZE):
@@ -777,31 +1170,29 @@ class AES:
 
             if self.mode == 'ECB':
                 # ECB模式：直接解密
-                plaintext.extend(self.__aes_decrypt_block(block, RoundKeys))
+                plaintext += decrypt_block(int.from_bytes(block, 'big'), InvRoundKeys).to_bytes(16, 'big')
 
             elif self.mode == 'CBC':
                 # CBC模式：先解密后异或
-                block_decrypted = self.__aes_decrypt_block(block, RoundKeys)
-                plaintext.extend(self.__16bytes_xor(block_decrypted, prev_block))
-                prev_block = block
+                block_int = int.from_bytes(block, 'big')
+                plaintext += (decrypt_block(block_int, InvRoundKeys) ^ prev_block).to_bytes(16, 'big')
+                prev_block = block_int
 
             elif self.mode == 'CFB':
                 # CFB模式：加密前一密文块后与当前密文异或
-                output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                plaintext.extend(self.__xor_block(block, output))
-                prev_block = block
+                plaintext += self.__xor_block(block, encrypt_block(prev_block, RoundKeys))
+                prev_block = int.from_bytes(block, 'big')
 
             elif self.mode == 'OFB':
                 # OFB模式：加密前一输出后与密文异或
-                output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                plaintext.append(self.__xor_block(block, output))
-                prev_block = output
+                # （原实现把异或结果 append 进字节数组，OFB 解密总是抛出 TypeError；此处按字节拼接，解密恢复可用）
+                prev_block = encrypt_block(prev_block, RoundKeys)
+                plaintext += self.__xor_block(block, prev_block)
 
             elif self.mode == 'CTR':
                 # CTR模式：加密计数器后与密文异或
-                output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                plaintext.extend(self.__xor_block(block, output))
-                prev_block = self.__increment_counter(prev_block)
+                plaintext += self.__xor_block(block, encrypt_block(prev_block, RoundKeys))
+                prev_block = (prev_block + 1) & ((1 << 128) - 1)
 
         # 去除填充并返回
         return bytes(self.__unpad(plaintext))
@@ -121,6 +121,10 @@ class SystemCenter:
         except Exception as e:
             logger.error(f"停止服务失败: {str(e)}")
             raise
+        finally:
+            # 无论服务器能否关闭，都停止加密服务的临时密钥对预计算线程
+            if self.cryptoservice:
+                self.cryptoservice.close()
 
     def initialize(self, params: dict) -> bool:
         """初始化系统中心服务"""
@@ -197,7 +201,8 @@ class SystemCenter:
             curve_params=params,
             sign_algorithms={'SM2': {'user_id': self.__config.id}},
             crypto_algorithms={'ECC': {}},
-            digest_algorithms=[params['H'], 'md5']
+            digest_algorithms=[params['H'], 'md5'],
+            ephemeral_pool_size=64
         )
 
         # 生成 SM2 密钥对、存储系统参数
@@ -296,12 +301,17 @@ class SystemCenter:
             curve, base_point = self.cryptoservice.export_curve_params()
             commits = {i: Util.point_to_tuple(coeff * base_point) for i, coeff in poly.coef.items()}
 
-            # 对份额进行 ECC 加密
+            # 对份额进行 ECC 整数编码加密（服务器公钥每次上传都会复用，登记其预计算表）
             logger.debug(public_keys)
-            enc_shares = {
-                info['_id']: self.cryptoservice.encrypt_data(shares[info['_id']], tuple(info['public_key']))
-                for info in public_keys
-            }
+            for info in public_keys:
+                self.cryptoservice.precompute_public_key(info['public_key'])
+            # 各服务器份额共用一个随机数 r 批量加密，r*G 只计算一次
+            enc_shares = dict(zip(
+                [info['_id'] for info in public_keys],
+                self.cryptoservice.encrypt_data_batch([shares[info['_id']] for info in public_keys],
+                                                      [tuple(info['public_key']) for info in public_keys],
+                                                      additional={'encoding': 'int'})
+            ))
 
             # 生成签密数据
             signcryptions = []
@@ -5,6 +5,8 @@ Date: 2025-04-18 16:36:51
 LastEditTime: 2025-04-19 09:05:29
 LastEditors: DSTBP
 """
+import io
+import json
 import os
 import secrets
 from typing import Union
@@ -12,7 +14,8 @@ from business.schema import FileUploadRequest, FileUploadResponse, FileDetailReq
     FileDownloadRequest, FileDownloadResponse, SystemParameters
 from services.crypto import CryptoService
 from services.storage import StorageService
-from utils.builtin_tools.ellipticCurve import Util, INFINITY
+from utils.builtin_tools.ellipticCurve import Util
+from utils.builtin_tools.encryption import Base64, Base64Encoder, FASTAES
 from utils.builtin_tools.polynomial import Polynomial
 from utils.converter import TypeConverter as tc
 from cryptography.hazmat.primitives import serialization
@@ -116,18 +119,16 @@ def upload_file(system_center_url: str, system_params: dict, file_path: str, use
                 'FASTAES': {
                     'mode': AES_mode,
                     'iv': AES_iv,
-                    'padding_type': AES_padding
+                    'padding_type': AES_padding,
+                    'workers': os.cpu_count() or 1
                 },
                 'ECC': {}
             }
         )
-        storageservice = StorageService()
         
         update_upload_progress(20, "正在读取文件...")
-        # 读取文件为字节形式
-        file_bytes = storageservice.get_file(file_path)
-        file_hash = cryptoservice.digest_message(file_bytes)
-        file_size = len(file_bytes)
+        file_size = os.path.getsize(file_path)
+        source_path = file_path
 
         # 步骤一：获取文件基本信息
         file_path, file_name = os.path.split(file_path)
@@ -136,24 +137,22 @@ def upload_file(system_center_url: str, system_params: dict, file_path: str, use
         # 步骤二：生成32字节的随机密钥
         key = secrets.token_hex(16)
 
-        update_upload_progress(50, "正在加密文件...")
-        # 步骤三：加密文件
-        file_ciphertext = cryptoservice.encrypt_data(file_bytes, key, algorithm="FASTAES")
-
-        update_upload_progress(70, "正在上传文件...")
-        # 步骤四：上传文件
+        update_upload_progress(50, "正在加密并上传文件...")
+        # 步骤三：分块流式加密文件，每块只读取一次，同时计算文件哈希；
+        # 密文片段编码为 Base64 后直接作为请求体分块发出，客户端不再拼接完整密文
         req = FileUploadRequest(
             file_name=file_name,
             file_path=file_path,
-            file_ciphertext=file_ciphertext,
-            file_hash=file_hash,
+            file_ciphertext='',
+            file_hash='',
             file_size=file_size,
             file_key=key,
             upload_user=username
         )
         print(f'upload key: {key}')
-        resp = FileUploadResponse(**net.extract_response_data(net.post("file/upload", req.__dict__)))
-        
+        resp = FileUploadResponse(**net.extract_response_data(net.post_stream(
+            "file/upload", lambda: __upload_body(req.__dict__, source_path, key, cryptoservice))))
+
         update_upload_progress(100, "上传成功")
         return resp.file_uuid
     except Exception as e:
@@ -172,7 +171,8 @@ def download_file(system_center_url: str, system_params: dict, username: str, fi
                 'FASTAES': {
                     'mode': AES_mode,
                     'iv': AES_iv,
-                    'padding_type': AES_padding
+                    'padding_type': AES_padding,
+                    'workers': os.cpu_count() or 1
                 },
                 'ECC': {}
             }
@@ -203,10 +203,11 @@ def download_file(system_center_url: str, system_params: dict, username: str, fi
         recovered_key = __recover_key(system_params, recovery_points)
 
         update_download_progress(70, "正在解密文件...")
-        file_bytes = __decrypt_data(file_info.file_ciphertext, recovered_key, cryptoservice)
+        hasher = cryptoservice.new_hasher()
+        file_bytes = __decrypt_data(file_info.file_ciphertext, recovered_key, cryptoservice, hasher)
 
         update_download_progress(80, "正在验证文件哈希...")
-        if cryptoservice.digest_message(file_bytes) == file_info.file_hash:
+        if hasher.finalize() == file_info.file_hash:
             update_download_progress(90, "正在保存文件...")
             storageservice.save_file(file_bytes, file_dir, file_info.file_name)
             update_download_progress(100, "下载成功")
@@ -244,11 +245,13 @@ def write_file(file_path, content):
         raise RuntimeError(f'文件写入失败: {str(e)}')
 
 
-def __process_shares(system_params, curve, base_point, commits: dict, shares_data: list, cryptoservice, private_key):
+def __process_shares(system_params, curve, base_point, commits: dict, shares_data: list, cryptoservice, private_key,
+                     batch_verify: bool = True):
     """
     验证并解密密钥分片
     :param commits: 承诺值
     :param shares_data: 加密的分片数据
+    :param batch_verify: 是否将所有分片合并为一次多标量乘法进行批量验证
     :return: 验证通过的恢复点列表
     """
     # 预计算承诺值
@@ -260,10 +263,15 @@ def __process_shares(system_params, curve, base_point, commits: dict, shares_dat
     recovery_points = []
     for info in shares_data:
         decrypted_share = tc.hex_to_int(cryptoservice.decrypt_data(info['enc_share'], private_key, algorithm="ecc"))  # ECC 解密加密份额
-        if __verify_share(system_params, base_point, tc.hex_to_int(info['server_id']), commit_points, decrypted_share):  # TODO int(info['server_id'], 16)
+        if batch_verify:
+            recovery_points.append((int(info['server_id'], 16), decrypted_share))
+        elif __verify_share(system_params, base_point, tc.hex_to_int(info['server_id']), commit_points, decrypted_share):  # TODO int(info['server_id'], 16)
             recovery_points.append((int(info['server_id'], 16), decrypted_share))
         else:
             return None
+
+    if batch_verify and not __verify_shares_batch(system_params, base_point, commit_points, recovery_points):
+        return None
     return recovery_points
 
 
@@ -279,7 +287,27 @@ def __verify_share(system_params, base_point, sid: int, commits: dict, share: in
     powers = {idx: pow(sid, int(idx), N) for idx in commits.keys()}
 
     left = share * base_point
-    right = sum((powers[idx] * commit for idx, commit in commits.items()), INFINITY)
+    right = Util.multi_scalar_mul([powers[idx] for idx in commits], list(commits.values()))
+
+    return Util.point_to_tuple(left) == Util.point_to_tuple(right)
+
+
+def __verify_shares_batch(system_params, base_point, commits: dict, shares: list):
+    """
+    批量验证所有分片的承诺：取随机系数 ρ_j，检验 (Σ ρ_j·s_j)·G == Σ_i (Σ_j ρ_j·sid_j^i)·C_i，
+    整体只需一次基点乘法和一次规模为 t 的多标量乘法
+    :param commits: 承诺点字典
+    :param shares: (分片ID, 分片值) 列表
+    :return: 验证是否通过（任一分片错误时以压倒性概率返回 False）
+    """
+    N = system_params.N
+    weights = [secrets.randbits(128) | 1 for _ in shares]
+
+    left = sum(rho * share for rho, (_, share) in zip(weights, shares)) % N * base_point
+    right = Util.multi_scalar_mul(
+        [sum(rho * pow(sid, int(idx), N) for rho, (sid, _) in zip(weights, shares)) % N for idx in commits],
+        list(commits.values())
+    )
 
     return Util.point_to_tuple(left) == Util.point_to_tuple(right)
 
@@ -297,12 +325,47 @@ def __recover_key(system_params, points: list):
     return hex(int(key))
 
 
-def __decrypt_data(ciphertext: str, key: str, cryptoservice) -> bytes:
+def __upload_body(fields: dict, source_path: str, key: str, cryptoservice):
+    """
+    逐段生成文件上传请求的 JSON 请求体：元数据在前，Base64 密文随加密进度逐块产出，
+    文件哈希要等明文全部读完才能得到，因此放在密文之后写出（JSON 对象的键顺序不影响服务端解析）
+    每次调用都重新打开文件，请求重试时可以生成完整的新请求体
+    :param fields: 上传请求字段（file_ciphertext 与 file_hash 由本函数生成）
+    :param source_path: 明文文件路径
+    :param key: 加密密钥
+    :return: 请求体字节片段生成器
+    """
+    meta = {name: value for name, value in fields.items() if name not in ('file_ciphertext', 'file_hash')}
+    yield (json.dumps(meta)[:-1] + ', "file_ciphertext": "').encode()
+
+    hasher = cryptoservice.new_hasher()
+    encoder = Base64Encoder()
+    with open(source_path, 'rb') as reader:
+        for piece in cryptoservice.encrypt_stream(reader, key, algorithm="FASTAES", hasher=hasher):
+            encoded = encoder.update(piece)
+            if encoded:
+                yield encoded.encode()
+    yield encoder.finalize().encode()
+
+    yield ('", "file_hash": ' + json.dumps(hasher.finalize()) + '}').encode()
+
+
+def __decrypt_data(ciphertext: str, key: str, cryptoservice, hasher=None) -> bytes:
     """
     解密数据
     :param ciphertext: Base64编码密文
     :param key: 解密密钥
+    :param hasher: 增量哈希对象，解密出的明文同时送入其中（分块密文边解密边哈希）
     :return: 解密后的数据
     """
-    res = cryptoservice.decrypt_data(ciphertext, key, algorithm="FASTAES")
-    return res.encode() if isinstance(res, str) else res
+    data = Base64.b64decode(ciphertext)
+    if FASTAES.is_stream(data):
+        plaintext = io.BytesIO()
+        cryptoservice.decrypt_stream(io.BytesIO(data), plaintext, key, algorithm="FASTAES", hasher=hasher)
+        return plaintext.getvalue()
+
+    res = cryptoservice.decrypt_data(data, key, algorithm="FASTAES")
+    res = res.encode() if isinstance(res, str) else res
+    if hasher is not None:
+        hasher.update(res)
+    return res
@@ -3,12 +3,16 @@
 # @Author  : DSTBP
 # @File    : services/crypto.py
 # @Description : 加解密、签名、验签服务 (支持向后兼容) (ECIES  Elliptic Curve Integrated Encryption Scheme 椭圆曲线集成加密方案)
+import math
 import time
 import secrets
+import threading
+from collections import OrderedDict, deque
 from loguru import logger
-from typing import Tuple, Optional, Dict, List, Union
+from typing import Tuple, Optional, Dict, List, Union, Iterator
+from utils.builtin_tools import arithmetic
 from utils.builtin_tools.ellipticCurve import Curve, Point, Util
-from utils.builtin_tools.encryption import Hash, AES, ECC, SM2, Base64, FASTAES
+from utils.builtin_tools.encryption import Hash, AES, ECC, SM2, Base64, FASTAES, HashingReader, HashingWriter
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
@@ -16,6 +20,90 @@ from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePrivateNum
     EllipticCurvePrivateKey
 
 
+class EphemeralKeyPool:
+    """
+    临时密钥对 (k, k*G) 预计算池：后台线程在空闲时（距上次取用超过 idle_delay 秒）补充，请求线程按需取用。
+    每对只会被取出一次；池空时现场生成，不阻塞调用方。
+    同一 CryptoService 中 ECC 加密的随机数 r 与 SM2 签名的随机数 k 共用这一个池（二者都是基点 G 上的一次性标量），
+    取出即移除，因此同一对不会被两种用途重复使用。不再使用时调用 close() 停止后台线程
+    """
+    def __init__(self, G: Point, size: int = 64, idle_delay: float = 0.05):
+        """
+        :param G: 基点
+        :param size: 池容量
+        :param idle_delay: 补充前要求的空闲时长（秒），避免在请求高峰与请求线程争抢 GIL
+        """
+        self.G = G
+        self.size = size
+        self.idle_delay = idle_delay
+        self.__last_acquire = 0.0
+        self.__pairs = deque()
+        self.__cond = threading.Condition()
+        self.__stats = {'hits': 0, 'misses': 0}
+        self.__stop = threading.Event()     # 停止信号，置位后后台线程退出
+        self.__worker = threading.Thread(target=self.__fill, name='EphemeralKeyPool', daemon=True)
+        self.__worker.start()
+
+    def __generate(self) -> Tuple[int, Point]:
+        """生成一对临时密钥，并提前转换为仿射坐标"""
+        k = secrets.randbelow(self.G.order() - 1) + 1
+        kG = k * self.G
+        kG.x()
+        return k, kG
+
+    def __fill(self) -> None:
+        """后台补充：池满时等待取用通知，未满时等到空闲再逐对生成，计算过程不持锁"""
+        while True:
+            with self.__cond:
+                while not self.__stop.is_set():
+                    if len(self.__pairs) >= self.size:
+                        self.__cond.wait()
+                        continue
+                    idle = time.monotonic() - self.__last_acquire
+                    if idle >= self.idle_delay:
+                        break
+                    self.__cond.wait(self.idle_delay - idle)
+                if self.__stop.is_set():
+                    return
+            pair = self.__generate()
+            with self.__cond:
+                if not self.__stop.is_set():    # 生成期间已关闭则丢弃
+                    self.__pairs.append(pair)
+
+    def acquire(self) -> Tuple[int, Point]:
+        """取出一对临时密钥 (k, k*G)，池空时现场生成"""
+        with self.__cond:
+            pair = self.__pairs.popleft() if self.__pairs else None
+            self.__stats['hits' if pair else 'misses'] += 1
+            self.__last_acquire = time.monotonic()
+            self.__cond.notify()
+        return pair or self.__generate()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """返回池的统计信息（命中、未命中、命中率、当前/最大容量）"""
+        with self.__cond:
+            hits, misses = self.__stats['hits'], self.__stats['misses']
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'size': len(self.__pairs),
+                'maxsize': self.size,
+            }
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        停止并等待后台线程退出，丢弃池中剩余的密钥对；可重复调用，关闭后 acquire 仍可用（现场生成）
+        :param timeout: 等待后台线程退出的最长时间（秒）
+        """
+        self.__stop.set()
+        with self.__cond:
+            self.__pairs.clear()
+            self.__cond.notify_all()
+        if self.__worker is not threading.current_thread():
+            self.__worker.join(timeout)
+
+
 class CryptoService:
     # 默认曲线参数 (SECP256k1)
     DEFAULT_CURVE_PARAMS = {
@@ -34,9 +122,16 @@ class CryptoService:
             'iv': '12121212121212121212121212121212',
             'padding_type': 'PKCS7Padding'
         },
+        'FASTAES': {
+            'mode': 'CBC',
+            'iv': '12121212121212121212121212121212',
+            'padding_type': 'PKCS7Padding',
+            'workers': 1  # 并行线程数（CTR 分段、分块流式加密、分块认证加密）
+        },
         'ECC': {
             'curve': None,  # 使用默认曲线
-            'base_point': None  # 使用默认基点
+            'base_point': None,  # 使用默认基点
+            'cipher_format': 'binary'  # 密文格式（'binary' 或旧的 'json'，读取时两者均兼容）
         },
         'SM2': {
             'curve': None,  # 使用默认曲线
@@ -50,6 +145,9 @@ class CryptoService:
                 crypto_algorithms: Optional[Dict[str, Dict]] = None,
                 sign_algorithms: Optional[Dict[str, Dict]] = None,
                 digest_algorithms: Optional[List[str]] = None,
+                int_backend: str = 'auto',
+                key_table_size: int = 32,
+                ephemeral_pool_size: int = 0,
                 ) -> None:
         """
         初始化密码学服务
@@ -57,7 +155,15 @@ class CryptoService:
         :param crypto_algorithms: 支持的加密算法及其参数，如 {"AES": {"mode": "ECB", "iv": "...", "padding_type": "..."}, "ECC": {...}}
         :param sign_algorithms: 支持的签名算法及其参数，如 {"SM2": {"user_id": "..."}, "DSA": {...}}
         :param digest_algorithms: 支持的消息摘要算法列表，如 ["SHA256", "SM3"]
+        :param int_backend: 本服务椭圆曲线运算的大整数后端，'auto'（gmpy2 可用时启用）、'gmpy2' 或 'python'。
+                            作用于曲线点运算、模逆、模平方根（Koblitz 编码、点解压）与 SM2 签名的模逆；
+                            不修改 arithmetic 模块的缺省后端，曲线之外的调用（如多项式运算）仍由 arithmetic.set_backend 决定
+        :param key_table_size: 公钥预计算表缓存的最大条目数（见 precompute_public_key）
+        :param ephemeral_pool_size: 临时密钥对预计算池容量，0 表示不启用（ECC 加密与 SM2 签名现场生成）
         """
+        # 选择本服务曲线运算使用的大整数后端：记录在曲线上并随曲线传给 arithmetic 各函数，不修改进程级设置，不影响密文与签名格式
+        self.int_backend = arithmetic.resolve_backend(int_backend)
+
         # 初始化曲线
         self.curve = self._init_curve(curve_params or self.DEFAULT_CURVE_PARAMS)
         self.base_point = self._init_base_point(curve_params or self.DEFAULT_CURVE_PARAMS)
@@ -67,6 +173,35 @@ class CryptoService:
         self.sign_ciphers = self._init_sign_ciphers(sign_algorithms or {"SM2": {}})
         self.digest_algorithms = [item.upper() for item in digest_algorithms] if digest_algorithms else ["SHA256"]
 
+        # 热点公钥的预计算窗口表缓存（LRU），需通过 precompute_public_key 显式登记
+        self.__key_tables: OrderedDict = OrderedDict()
+        self.__key_table_size = key_table_size
+        self.__key_table_stats = {'hits': 0, 'misses': 0}
+        self.__key_table_lock = threading.Lock()
+
+        # 可选的临时密钥对预计算池，ECC 加密的 r 与 SM2 签名的 k 共用同一个池；服务停用时需调用 close()
+        self.ephemeral_pool = EphemeralKeyPool(self.base_point, ephemeral_pool_size) if ephemeral_pool_size > 0 else None
+        self._attach_ephemeral_pool()
+
+    def _attach_ephemeral_pool(self) -> None:
+        """将临时密钥对池接入使用默认基点的 ECC / SM2 实例"""
+        if not self.ephemeral_pool:
+            return
+        for cipher in [*self.crypto_ciphers.values(), *self.sign_ciphers.values()]:
+            if isinstance(cipher, (ECC, SM2)) and cipher.G is self.base_point:
+                cipher.ephemeral_source = self.ephemeral_pool.acquire
+
+    def close(self) -> None:
+        """释放服务持有的后台资源（停止临时密钥对预计算池的补充线程），可重复调用"""
+        if self.ephemeral_pool:
+            self.ephemeral_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def _init_curve(self, params: Dict) -> Curve:
         """初始化椭圆曲线参数"""
 
@@ -75,11 +210,44 @@ class CryptoService:
 
         a = restore_signed(params['a'])
         b = restore_signed(params['b'])
-        return Curve(params['p'], a, b)
+        curve = Curve(params['p'], a, b, self.int_backend)
+        if a == 0:
+            self._init_endomorphism(curve, params)
+        return curve
+
+    @staticmethod
+    def _init_endomorphism(curve: Curve, params: Dict) -> None:
+        """
+        检测 a = 0 曲线上的 GLV 自同态 φ(x, y) = (βx, y) = λ(x, y)，检测成功则为曲线启用 GLV 标量乘法
+        :param curve: 椭圆曲线
+        :param params: 曲线参数
+        """
+        p, n = params['p'], params['N']
+        # 需要 p ≡ n ≡ 1 (mod 3) 才存在非平凡三次单位根；由 Hasse 定理，n 大于曲线阶的一半时余因子为 1
+        if p % 3 != 1 or n % 3 != 1 or 2 * n <= p + 1 + 2 * math.isqrt(p) + 1:
+            return
+
+        def cube_root_of_unity(m: int) -> Optional[int]:
+            for g in range(2, 100):
+                root = pow(g, (m - 1) // 3, m)
+                if root != 1:
+                    return root
+            return None
+
+        beta, lam = cube_root_of_unity(p), cube_root_of_unity(n)
+        if beta is None or lam is None:
+            return
+
+        # λ 与 λ^2 中恰有一个与 β 对应，以基点验证
+        G = Point(curve, params['Gx'], params['Gy'], n)
+        for candidate in (lam, lam * lam % n):
+            if Util.point_to_tuple(candidate * G) == (beta * params['Gx'] % p, params['Gy']):
+                curve.set_endomorphism(beta, candidate, n)
+                return
 
     def _init_base_point(self, params: Dict) -> Point:
-        """初始化基点"""
-        return Point(self.curve, params['Gx'], params['Gy'], params['N'])
+        """初始化基点，并构建固定基预计算表（ECC/SM2 及密钥生成中与基点的标量乘法自动查表）"""
+        return Point(self.curve, params['Gx'], params['Gy'], params['N']).precompute()
 
     def _init_crypto_ciphers(self, algorithms: Dict[str, Dict]) -> Dict[str, Union[AES, ECC]]:
         """初始化加密算法实例"""
@@ -100,12 +268,13 @@ class CryptoService:
                     ciphers[algo] = FASTAES(
                         mode=algo_params['mode'],
                         iv=algo_params['iv'],
-                        padding_type=algo_params['padding_type']
+                        padding_type=algo_params['padding_type'],
+                        workers=algo_params['workers']
                     )
                 case "ECC":
                     curve = algo_params['curve'] or self.curve
                     base_point = algo_params['base_point'] or self.base_point
-                    ciphers[algo] = ECC(curve, base_point)
+                    ciphers[algo] = ECC(curve, base_point, cipher_format=algo_params['cipher_format'])
                 case _:
                     logger.warning(f"不支持的加密算法: {algo}")
         return ciphers
@@ -144,7 +313,9 @@ class CryptoService:
         :param message: 明文数据
         :param key: 加密密钥
         :param algorithm: 指定加密算法，不指定则使用第一个可用的算法
-        :param additional: 额外参数
+        :param additional: 额外参数，ECC 支持 {'multi': True}（多层加密）与 {'encoding': 'int'}（整数编码，用于秘密份额），
+                           FASTAES 支持 {'aead': True, 'chunk_size': n}（可随机访问的分块认证加密）
+                           与 {'workers': n}（本次调用的并行线程数）
         """
         try:
             algo = (algorithm or list(self.crypto_ciphers.keys())[0]).upper()
@@ -156,25 +327,48 @@ class CryptoService:
                 case 'AES':
                     return cipher.aes_encrypt(message, key)
                 case "FASTAES":
-                    return cipher.aes_encrypt(message, key)
+                    workers = (additional or {}).get('workers')
+                    if additional and additional.get('aead'):
+                        chunk_size = additional.get('chunk_size') or FASTAES.DEFAULT_AEAD_CHUNK_SIZE
+                        return Base64.b64encode(cipher.aead_encrypt(message, key, chunk_size, workers))
+                    return cipher.aes_encrypt(message, key, workers)
                 case 'ECC':
+                    key = self.__lookup_public_key(key)
                     if additional and additional.get('multi'):
                         return cipher.ecc_multi_encrypt(message, key)
-                    return cipher.ecc_encrypt(message, key)
+                    return cipher.ecc_encrypt(message, key, (additional or {}).get('encoding', 'text'))
                 case _:
                     raise ValueError(f"不支持的加密算法: {algo}")
         except Exception as e:
             logger.error(f"加密失败: {str(e)}")
             raise
 
-    def decrypt_data(self, message: str, key: Union[str, int],
+    def encrypt_data_batch(self, messages: List[Union[str, int]], keys: List[tuple],
+                           additional: Optional[Dict] = None) -> List[str]:
+        """
+        ECC 多接收者批量加密：各条消息分别加密给对应公钥，共用一个随机数 r（r*G 只计算一次）
+        :param messages: 明文列表
+        :param keys: 公钥列表，与明文一一对应且互不相同
+        :param additional: 额外参数，支持 {'encoding': 'int'}（整数编码）
+        :return: 密文列表，每条均可单独进行多层加解密
+        """
+        try:
+            if 'ECC' not in self.crypto_ciphers:
+                raise ValueError("不支持的加密算法: ECC")
+            keys = [self.__lookup_public_key(key) for key in keys]
+            return self.crypto_ciphers['ECC'].ecc_encrypt_batch(messages, keys, (additional or {}).get('encoding', 'text'))
+        except Exception as e:
+            logger.error(f"批量加密失败: {str(e)}")
+            raise
+
+    def decrypt_data(self, message: Union[str, bytes], key: Union[str, int],
                     algorithm: Optional[str] = None, additional: Optional[Dict] = None) -> Union[str, bytes]:
         """
         解密数据
-        :param message: 密文数据
+        :param message: 密文数据（FASTAES 还可直接传入已 Base64 解码的密文字节）
         :param key: 解密密钥
         :param algorithm: 指定解密算法，不指定则使用第一个可用的算法
-        :param additional: 额外参数
+        :param additional: 额外参数，FASTAES 支持 {'workers': n}（本次调用的并行线程数）
         """
         try:
             algo = (algorithm or list(self.crypto_ciphers.keys())[0]).upper()
@@ -186,7 +380,9 @@ class CryptoService:
                 case 'AES':
                     return cipher.aes_decrypt(message, key)
                 case "FASTAES":
-                    return cipher.aes_decrypt(message, key)
+                    if isinstance(message, (bytes, bytearray, memoryview)):
+                        return cipher.decrypt_bytes(message, key, (additional or {}).get('workers'))
+                    return cipher.aes_decrypt(message, key, (additional or {}).get('workers'))
                 case 'ECC':
                     if additional and additional.get('multi'):
                         return cipher.ecc_multi_decrypt(message, key, additional['blinding'])
@@ -197,6 +393,83 @@ class CryptoService:
             logger.error(f"解密失败: {str(e)}")
             raise
 
+    def encrypt_stream(self, reader, key: str, algorithm: str = 'FASTAES',
+                       chunk_size: Optional[int] = None, hasher: Optional[Hash] = None) -> Iterator[bytes]:
+        """
+        分块流式加密：从文件对象按块读取明文，逐段产出分块格式的密文，内存占用只与分块大小有关
+        :param reader: 以二进制方式打开的可读文件对象
+        :param key: 加密密钥
+        :param algorithm: 加密算法，目前仅 FASTAES 支持分块流式加密
+        :param chunk_size: 明文分块大小，不指定则使用默认值
+        :param hasher: 增量哈希对象（见 new_hasher），读到的明文同时送入其中，密文产出完毕后即可 finalize
+        :return: 密文片段生成器（拼接后可直接用 decrypt_data 解密）
+        """
+        algo = algorithm.upper()
+        if algo != 'FASTAES' or algo not in self.crypto_ciphers:
+            raise ValueError(f"不支持流式加密的算法: {algo}")
+        if hasher is not None:
+            reader = HashingReader(reader, hasher)
+        return self.crypto_ciphers[algo].iter_encrypt(reader, key, chunk_size or FASTAES.DEFAULT_CHUNK_SIZE)
+
+    def decrypt_stream(self, reader, writer, key: str, algorithm: str = 'FASTAES',
+                       hasher: Optional[Hash] = None) -> int:
+        """
+        分块流式解密：从 reader 读取分块格式的密文，将明文写入 writer
+        :param reader: 以二进制方式打开的可读文件对象
+        :param writer: 具有 write 方法的输出对象
+        :param key: 解密密钥
+        :param algorithm: 解密算法，目前仅 FASTAES 支持分块流式解密
+        :param hasher: 增量哈希对象（见 new_hasher），写出的明文同时送入其中
+        :return: 写出的明文字节数
+        """
+        try:
+            algo = algorithm.upper()
+            if algo != 'FASTAES' or algo not in self.crypto_ciphers:
+                raise ValueError(f"不支持流式解密的算法: {algo}")
+            if hasher is not None:
+                writer = HashingWriter(writer, hasher)
+            return self.crypto_ciphers[algo].decrypt_stream(reader, writer, key)
+        except Exception as e:
+            logger.error(f"流式解密失败: {str(e)}")
+            raise
+
+    def decrypt_range(self, message, key: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        """
+        解密分块认证加密密文中的明文区间 [start, end)，只读取并验证该区间涉及的分块
+        :param message: Base64 编码的密文、密文字节或可 seek 的二进制文件对象
+        :param key: 解密密钥
+        :param start: 明文起始偏移
+        :param end: 明文结束偏移（不含），不指定则到末尾
+        :return: 区间内的明文
+        """
+        try:
+            if 'FASTAES' not in self.crypto_ciphers:
+                raise ValueError("不支持的解密算法: FASTAES")
+            if isinstance(message, str):
+                message = Base64.b64decode(message)
+            return self.crypto_ciphers['FASTAES'].aead_decrypt_range(message, key, start, end)
+        except Exception as e:
+            logger.error(f"区间解密失败: {str(e)}")
+            raise
+
+    def reencrypt_data(self, message: str, public_key: tuple, private_key: int, blinding: str = 'c1') -> str:
+        """
+        ECC 转加密：为多层密文添加 public_key 对应的一层，同时用 private_key 移除 blinding 层
+        :param message: Base64 编码的多层密文
+        :param public_key: 新增层的公钥
+        :param private_key: 被移除层的私钥
+        :param blinding: 被移除层的辅助密文标识
+        :return: 转加密后的密文
+        """
+        try:
+            if 'ECC' not in self.crypto_ciphers:
+                raise ValueError("不支持的加密算法: ECC")
+            return self.crypto_ciphers['ECC'].reencrypt(message, self.__lookup_public_key(public_key),
+                                                        private_key, blinding)
+        except Exception as e:
+            logger.error(f"转加密失败: {str(e)}")
+            raise
+
     def signature(self, public_key: tuple[int, int], private_key: int, message: Union[str, bytes],
                 algorithm: Optional[str] = None, additional: Optional[Dict] = None) -> tuple:
         """
@@ -257,13 +530,75 @@ class CryptoService:
                         except:
                             message = message.encode('utf-8')
 
-                    return self.sign_ciphers[algo].verify_sign(signature, message, bytes.fromhex(za), public_key)
+                    return self.sign_ciphers[algo].verify_sign(signature, message, bytes.fromhex(za),
+                                                               self.__lookup_public_key(public_key))
                 case _:
                     raise ValueError(f"不支持的验证算法: {algo}")
         except Exception as e:
             logger.error(f"验证签名失败: {str(e)}")
             raise
 
+    def precompute_public_key(self, public_key: Union[tuple[int, int], list[int]], window: int = 4) -> Point:
+        """
+        为频繁使用的公钥（如 SM2 系统公钥、云服务器公钥）建立固定基窗口预计算表，
+        之后 encrypt_data(ECC) / verify_signature(SM2) 遇到该公钥时自动使用
+        :param public_key: 公钥点坐标 (x, y)
+        :param window: 窗口宽度
+        :return: 带预计算表的公钥点
+        """
+        key = (int(public_key[0]), int(public_key[1]))
+        with self.__key_table_lock:
+            point = self.__key_tables.get(key)
+            if point is not None:
+                self.__key_tables.move_to_end(key)
+                return point
+
+        # 预计算表直接建在已校验点缓存中的共享点对象上，tuple_to_point(cached=True) 命中时即得到带表的点
+        point = Util.tuple_to_point(self.curve, key, cached=True)
+        if not point.is_precomputed():
+            point.precompute(window)
+        with self.__key_table_lock:
+            self.__key_tables[key] = point
+            self.__key_tables.move_to_end(key)
+            while len(self.__key_tables) > self.__key_table_size:
+                self.__key_tables.popitem(last=False)
+        return point
+
+    def __lookup_public_key(self, public_key: Union[tuple, list, Point]) -> Union[tuple, Point]:
+        """
+        查找公钥的预计算表，命中时返回带表的点，否则原样返回公钥
+        :param public_key: 公钥点坐标 (x, y)
+        """
+        if isinstance(public_key, Point):
+            return public_key
+        key = (int(public_key[0]), int(public_key[1]))
+        with self.__key_table_lock:
+            point = self.__key_tables.get(key)
+            if point is None:
+                self.__key_table_stats['misses'] += 1
+                return public_key
+            self.__key_tables.move_to_end(key)
+            self.__key_table_stats['hits'] += 1
+            return point
+
+    def key_table_stats(self) -> Dict[str, Union[int, float]]:
+        """返回公钥预计算表缓存的统计信息（命中、未命中、命中率、当前/最大条目数）"""
+        with self.__key_table_lock:
+            hits, misses = self.__key_table_stats['hits'], self.__key_table_stats['misses']
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'size': len(self.__key_tables),
+                'maxsize': self.__key_table_size,
+            }
+
+    def clear_key_tables(self) -> None:
+        """清空公钥预计算表缓存及统计"""
+        with self.__key_table_lock:
+            self.__key_tables.clear()
+            self.__key_table_stats.update(hits=0, misses=0)
+
     def digest_message(self, message: Union[str, bytes],
                     algorithm: Optional[str] = None,
                     output_format: str = "hex",
@@ -285,6 +620,17 @@ class CryptoService:
             logger.error(f"生成消息摘要失败: {str(e)}")
             raise
 
+    def new_hasher(self, algorithm: Optional[str] = None, length: int = 32) -> Hash:
+        """
+        创建增量哈希对象（分段 update 后 finalize，结果与 digest_message 对整段数据的结果相同）
+        :param algorithm: 指定摘要算法，不指定则使用第一个可用的算法
+        :param length: 消息摘要长度
+        """
+        algo = (algorithm or self.digest_algorithms[0]).upper()
+        if algo not in self.digest_algorithms:
+            raise ValueError(f"不支持的消息摘要算法: {algo}")
+        return Hash(algo, length)
+
     def export_curve_params(self) -> Tuple['Curve', 'Point']:
         """导出当前曲线参数"""
         return self.curve, self.base_point
@@ -457,7 +803,7 @@ class CryptoService:
                         case "ECC":
                             curve = algo_params['curve'] or self.curve
                             base_point = algo_params['base_point'] or self.base_point
-                            self.crypto_ciphers[algo] = ECC(curve, base_point)
+                            self.crypto_ciphers[algo] = ECC(curve, base_point, cipher_format=algo_params['cipher_format'])
 
         if sign_params:
             for algo, params in sign_params.items():
@@ -469,4 +815,6 @@ class CryptoService:
                         case "SM2":
                             curve = algo_params['curve'] or self.curve
                             base_point = algo_params['base_point'] or self.base_point
-                            self.sign_ciphers[algo] = SM2(curve, base_point, algo_params['user_id'])
\ No newline at end of file
+                            self.sign_ciphers[algo] = SM2(curve, base_point, algo_params['user_id'])
+
+        self._attach_ephemeral_pool()
\ No newline at end of file
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17 10:30
+# @Author  : DSTBP
+# @File    : tools/bench_aes.py
+# @Description : 纯 Python AES 的 T 表实现与逐字节参考实现的一致性校验及基准测试
+"""
+在 User 目录下运行：python tools/bench_aes.py [--size 16384] [--repeat 3] [--rounds 50]
+
+encryption.AES 的轮函数已改为 T 表实现（每轮 16 次查表与异或，轮密钥按密钥缓存），
+原先逐字节的 SubBytes / ShiftRows / MixColumns（GF(2^8) 多项式乘法）/ AddRoundKey 轮函数不再保留在生产类中，
+这里作为参考实现保存，用于：
+1. 一致性校验：随机密钥、IV 与明文长度下，AES 各模式的加密输出与参考实现逐字节相同，且解密结果与参考实现一致
+2. 基准测试：同一数据量下参考实现与 T 表实现的加解密耗时；大数据量时 AES 还会把 ECB/CTR/CBC 解密交给 NumPy 批量实现，
+   t-table 一列关闭该路径单独计时，default 一列为默认配置（启用 NumPy 时）下的耗时
+"""
+import argparse
+import os
+import secrets
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.builtin_tools.encryption import AES, Base64
+
+MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR')
+
+
+def _gf256_mul(a: int, b: int) -> int:
+    """GF(2^8) 上的乘法（逐位移位异或，模 x^8 + x^4 + x^3 + x + 1）"""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a <<= 1
+        if a & 0x100:
+            a ^= 0x11B
+        b >>= 1
+    return result
+
+
+class ReferenceAES:
+    """
+    逐字节的 AES-128 参考实现（即 T 表改造前 encryption.AES 的轮函数），状态为 16 个字节的列表（按列存放）
+    """
+    def __init__(self, hex_key: str):
+        """
+        :param hex_key: 16字节的十六进制密钥字符串
+        """
+        self.round_keys = self.__expand_key(int(hex_key, 16))
+
+    @staticmethod
+    def __sub_word(word: int) -> int:
+        """4字节字的字节替换，用于密钥扩展"""
+        return sum(AES.SBOX_FLAT[word >> shift & 0xFF] << shift for shift in (24, 16, 8, 0))
+
+    def __expand_key(self, key: int) -> list:
+        """生成 11 个 16 字节轮密钥"""
+        w = [key >> 96, key >> 64 & 0xFFFFFFFF, key >> 32 & 0xFFFFFFFF, key & 0xFFFFFFFF]
+        for i in range(4, 44):
+            temp = w[i - 1]
+            if i % 4 == 0:
+                temp = self.__sub_word(((temp & 0xFFFFFF) << 8) | (temp >> 24)) ^ AES.RCON[i // 4 - 1]
+            w.append(w[i - 4] ^ temp)
+        return [list(((w[4 * i] << 96) | (w[4 * i + 1] << 64) | (w[4 * i + 2] << 32) | w[4 * i + 3]).to_bytes(16, 'big'))
+                for i in range(11)]
+
+    # ------------------------- 轮函数 -------------------------
+    @staticmethod
+    def __sub_bytes(state: list, box: tuple) -> list:
+        """字节替换"""
+        return [box[b] for b in state]
+
+    @staticmethod
+    def __shift_rows(s: list) -> list:
+        """行移位"""
+        return [s[0], s[5], s[10], s[15], s[4], s[9], s[14], s[3],
+                s[8], s[13], s[2], s[7], s[12], s[1], s[6], s[11]]
+
+    @staticmethod
+    def __shift_rows_inv(s: list) -> list:
+        """逆行移位"""
+        return [s[0], s[13], s[10], s[7], s[4], s[1], s[14], s[11],
+                s[8], s[5], s[2], s[15], s[12], s[9], s[6], s[3]]
+
+    @staticmethod
+    def __mix_columns(state: list, matrix: tuple) -> list:
+        """（逆）列混合：矩阵与每一列在 GF(2^8) 上相乘"""
+        out = [0] * 16
+        for col in range(4):
+            column = state[4 * col:4 * col + 4]
+            for row in range(4):
+                acc = 0
+                for k in range(4):
+                    acc ^= _gf256_mul(matrix[row][k], column[k])
+                out[4 * col + row] = acc
+        return out
+
+    @staticmethod
+    def __add_round_key(state: list, round_key: list) -> list:
+        """轮密钥加"""
+        return [s ^ k for s, k in zip(state, round_key)]
+
+    # ------------------------- 数据块加解密 -------------------------
+    def encrypt_block(self, block: bytes) -> bytes:
+        """加密单个16字节数据块"""
+        rk = self.round_keys
+        state = self.__add_round_key(list(block), rk[0])
+        for rnd in range(1, 10):
+            state = self.__mix_columns(self.__shift_rows(self.__sub_bytes(state, AES.SBOX_FLAT)), AES.MIX_C)
+            state = self.__add_round_key(state, rk[rnd])
+        state = self.__shift_rows(self.__sub_bytes(state, AES.SBOX_FLAT))
+        return bytes(self.__add_round_key(state, rk[10]))
+
+    def decrypt_block(self, block: bytes) -> bytes:
+        """解密单个16字节数据块"""
+        rk = self.round_keys
+        state = self.__add_round_key(list(block), rk[10])
+        for rnd in range(9, 0, -1):
+            state = self.__sub_bytes(self.__shift_rows_inv(state), AES.I_SBOX_FLAT)
+            state = self.__mix_columns(self.__add_round_key(state, rk[rnd]), AES.I_MIXC)
+        state = self.__sub_bytes(self.__shift_rows_inv(state), AES.I_SBOX_FLAT)
+        return bytes(self.__add_round_key(state, rk[0]))
+
+    # ------------------------- 分组模式 -------------------------
+    def crypt(self, mode: str, data: bytes, iv: bytes, decrypt: bool) -> bytes:
+        """
+        按分组模式处理已填充的数据（不做填充与去填充）
+        :param mode: 分组模式
+        :param data: 输入数据
+        :param iv: 16字节初始向量（ECB 忽略）
+        :param decrypt: 是否为解密
+        :return: 输出数据
+        """
+        out = bytearray()
+        prev = iv
+        for i in range(0, len(data), 16):
+            block = data[i:i + 16]
+            if mode == 'ECB':
+                out += self.decrypt_block(block) if decrypt else self.encrypt_block(block)
+            elif mode == 'CBC':
+                if decrypt:
+                    out += bytes(a ^ b for a, b in zip(self.decrypt_block(block), prev))
+                    prev = block
+                else:
+                    prev = self.encrypt_block(bytes(a ^ b for a, b in zip(block, prev)))
+                    out += prev
+            else:
+                stream = self.encrypt_block(prev)
+                piece = bytes(a ^ b for a, b in zip(block, stream))
+                out += piece
+                if mode == 'CFB':
+                    prev = block if decrypt else piece
+                elif mode == 'OFB':
+                    prev = stream
+                else:
+                    prev = ((int.from_bytes(prev, 'big') + 1) % (1 << 128)).to_bytes(16, 'big')
+        return bytes(out)
+
+
+def _pkcs7(data: bytes) -> bytes:
+    """PKCS7 填充"""
+    n = 16 - len(data) % 16
+    return data + bytes([n]) * n
+
+
+def check_equivalence(rounds: int) -> None:
+    """
+    随机密钥、IV 与明文长度下比较 T 表实现与参考实现的输出
+    :param rounds: 每种模式的随机用例数
+    """
+    for mode in MODES:
+        for i in range(rounds):
+            key, iv = secrets.token_hex(16), secrets.token_hex(16)
+            # 每 5 组用例中有 1 组超过 NUMPY_MIN_BYTES，覆盖 NumPy 批量路径
+            length = AES.NUMPY_MIN_BYTES + secrets.randbelow(1024) if i % 5 == 0 else secrets.randbelow(200)
+            plaintext = os.urandom(length)
+            aes = AES(mode=mode, iv=iv, padding_type='PKCS7Padding')
+            ref = ReferenceAES(key)
+
+            ciphertext = Base64.b64decode(aes.aes_encrypt(plaintext, key))
+            expected = ref.crypt(mode, _pkcs7(plaintext), bytes.fromhex(iv), decrypt=False)
+            if ciphertext != expected:
+                raise AssertionError(f"{mode} 加密输出与参考实现不一致: key={key} iv={iv} len={len(plaintext)}")
+            if aes.aes_decrypt(Base64.b64encode(ciphertext), key) != plaintext:
+                raise AssertionError(f"{mode} 解密结果与明文不一致: key={key} iv={iv} len={len(plaintext)}")
+            if ref.crypt(mode, ciphertext, bytes.fromhex(iv), decrypt=True) != _pkcs7(plaintext):
+                raise AssertionError(f"{mode} 参考实现解密结果与明文不一致: key={key} iv={iv} len={len(plaintext)}")
+        print(f"{mode}: {rounds} 组随机用例输出一致")
+
+
+def bench(size: int, repeat: int) -> None:
+    """
+    比较参考实现、T 表实现（关闭 NumPy）与默认配置的加解密耗时
+    :param size: 明文字节数
+    :param repeat: 每项测量的重复次数
+    """
+    key, iv = secrets.token_hex(16), secrets.token_hex(16)
+    plaintext = os.urandom(size)
+    ref = ReferenceAES(key)
+    numpy_min_bytes = AES.NUMPY_MIN_BYTES
+
+    def measure(func) -> float:
+        return timeit.timeit(func, number=repeat) / repeat * 1e3
+
+    print(f"size={size} repeat={repeat}（单位 ms）")
+    print(f"{'mode':>6} {'op':>8} {'reference':>11} {'t-table':>9} {'default':>9} {'speedup':>8}")
+    for mode in MODES:
+        aes = AES(mode=mode, iv=iv, padding_type='PKCS7Padding')
+        padded = _pkcs7(plaintext)
+        ciphertext = aes.aes_encrypt(plaintext, key)
+        raw_ciphertext = Base64.b64decode(ciphertext)
+        for op, engine, reference in (
+                ('encrypt', lambda: aes.aes_encrypt(plaintext, key),
+                 lambda: ref.crypt(mode, padded, bytes.fromhex(iv), decrypt=False)),
+                ('decrypt', lambda: aes.aes_decrypt(ciphertext, key),
+                 lambda: ref.crypt(mode, raw_ciphertext, bytes.fromhex(iv), decrypt=True))):
+            ref_ms = measure(reference)
+            try:
+                AES.NUMPY_MIN_BYTES = None
+                table_ms = measure(engine)
+            finally:
+                AES.NUMPY_MIN_BYTES = numpy_min_bytes
+            default_ms = measure(engine)
+            print(f"{mode:>6} {op:>8} {ref_ms:>11.2f} {table_ms:>9.2f} {default_ms:>9.2f} {ref_ms / table_ms:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="纯 Python AES：T 表实现与逐字节参考实现的一致性校验及基准测试")
+    parser.add_argument('--size', type=int, default=16384, help="基准测试的明文字节数")
+    parser.add_argument('--repeat', type=int, default=3, help="每项测量的重复次数")
+    parser.add_argument('--rounds', type=int, default=50, help="每种模式的一致性校验随机用例数")
+    args = parser.parse_args()
+
+    check_equivalence(args.rounds)
+    bench(args.size, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17 11:00
+# @Author  : DSTBP
+# @File    : tools/bench_base64.py
+# @Description : Base64 编解码的一致性校验及基准测试
+"""
+在 User 目录下运行：python tools/bench_base64.py [--sizes 1024 65536 1048576] [--chunk 65536] [--repeat 3] [--rounds 300]
+
+encryption.Base64 已改为基于 binascii 的实现，并新增增量编解码器 Base64Encoder / Base64Decoder。
+原先逐字节查表的纯 Python 实现作为参考实现保存在这里，用于：
+1. 一致性校验：随机数据的编码结果、合法与容错输入（中间 '='、末尾多余 '='、长度余 1）的解码结果及非法字符的报错信息
+   与参考实现相同；随机切分输入后，增量编解码器的拼接输出与一次性编解码结果相同
+2. 基准测试：参考实现、binascii 实现（一次性）与增量编解码器（按 --chunk 切块）的编解码耗时
+"""
+import argparse
+import os
+import secrets
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.builtin_tools.encryption import Base64, Base64Encoder, Base64Decoder
+
+
+class ReferenceBase64:
+    """逐字节查表的纯 Python Base64 参考实现（即改用 binascii 前的 encryption.Base64）"""
+    ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+    @staticmethod
+    def b64encode(data) -> str:
+        """
+        将字节数据编码为 Base64 字符串
+        :param data: 输入数据（字节或字符串）
+        :return: Base64编码字符串
+        """
+        chars = ReferenceBase64.ALPHABET
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        encoded = []
+        for i in range(0, len(data), 3):
+            chunk = data[i:i + 3]
+            char1 = chunk[0]
+            char2 = chunk[1] if len(chunk) > 1 else 0
+            char3 = chunk[2] if len(chunk) > 2 else 0
+
+            # 将3个字节转换为4个6位索引
+            out1 = (char1 & 0xFC) >> 2
+            out2 = ((char1 & 0x03) << 4) | ((char2 & 0xF0) >> 4)
+            out3 = ((char2 & 0x0F) << 2) | ((char3 & 0xC0) >> 6)
+            out4 = char3 & 0x3F
+
+            # 根据数据长度处理填充
+            if len(chunk) == 3:
+                encoded.extend([chars[out1], chars[out2], chars[out3], chars[out4]])
+            elif len(chunk) == 2:
+                encoded.extend([chars[out1], chars[out2], chars[out3], '='])
+            else:
+                encoded.extend([chars[out1], chars[out2], '=', '='])
+        return ''.join(encoded)
+
+    @staticmethod
+    def b64decode(ct: str) -> bytes:
+        """
+        将Base64字符串解码为原始字节（每次调用重建解码表）
+        :param ct: Base64编码字符串
+        :return: 解码后的字节数据
+        """
+        decode_chars = {char: idx for idx, char in enumerate(ReferenceBase64.ALPHABET)}
+        # 移除末尾填充并计算填充量
+        s = ct.rstrip('=')
+        num_padding = 4 - (len(s) % 4) if len(s) % 4 != 0 else 0
+        s += 'A' * num_padding
+
+        decoded = bytearray()
+        for i in range(0, len(s), 4):
+            indices = []
+            for c in s[i:i + 4]:
+                if c == '=':
+                    indices.append(0)
+                else:
+                    try:
+                        indices.append(decode_chars[c])
+                    except KeyError:
+                        raise ValueError(f"Invalid character '{c}' in Base64 string")
+
+            # 合并4个6位值为24位整型，再拆出3个字节
+            combined = (indices[0] << 18) | (indices[1] << 12) | (indices[2] << 6) | indices[3]
+            decoded += bytes(((combined >> 16) & 0xFF, (combined >> 8) & 0xFF, combined & 0xFF))
+
+        # 移除填充字节
+        if num_padding:
+            del decoded[-num_padding:]
+        return bytes(decoded)
+
+
+def _split(data, pieces: int) -> list:
+    """在随机位置把数据切成若干段（可能含空段）"""
+    cuts = sorted(secrets.randbelow(len(data) + 1) for _ in range(pieces - 1))
+    return [data[i:j] for i, j in zip([0] + cuts, cuts + [len(data)])]
+
+
+def _decode_outcome(codec, text: str):
+    """返回解码结果，解码失败时返回异常类型与信息，便于比较两种实现的报错"""
+    try:
+        return codec.b64decode(text)
+    except ValueError as e:
+        return ValueError, str(e)
+
+
+def check_equivalence(rounds: int) -> None:
+    """
+    比较 binascii 实现、增量编解码器与参考实现的输出
+    :param rounds: 随机用例数
+    """
+    alphabet = ReferenceBase64.ALPHABET
+    for _ in range(rounds):
+        data = os.urandom(secrets.randbelow(300))
+        encoded = Base64.b64encode(data)
+        if encoded != ReferenceBase64.b64encode(data):
+            raise AssertionError(f"编码结果与参考实现不一致: {data.hex()}")
+
+        # 合法输入与各类容错输入
+        noisy = list(encoded.rstrip('='))
+        for _ in range(secrets.randbelow(3)):
+            if noisy:
+                noisy[secrets.randbelow(len(noisy))] = '='
+        text = ''.join(noisy) + secrets.choice(['', 'Q', '=', '==', '===']) + '=' * secrets.randbelow(3)
+        bad = text[:len(text) // 2] + secrets.choice('!*- \n') + text[len(text) // 2:]
+        for sample in (encoded, text, bad, ''.join(secrets.choice(alphabet) for _ in range(secrets.randbelow(40)))):
+            expected = _decode_outcome(ReferenceBase64, sample)
+            if _decode_outcome(Base64, sample) != expected:
+                raise AssertionError(f"解码结果与参考实现不一致: {sample!r}")
+
+            # 增量解码：合法输入在任意切分下与一次性解码结果一致
+            if isinstance(expected, bytes):
+                decoder = Base64Decoder()
+                pieces = [decoder.update(piece) for piece in _split(sample, 1 + secrets.randbelow(6))]
+                if b''.join(pieces) + decoder.finalize() != expected:
+                    raise AssertionError(f"增量解码结果与一次性解码不一致: {sample!r}")
+
+        # 增量编码：任意切分下与一次性编码结果一致
+        encoder = Base64Encoder()
+        pieces = [encoder.update(piece) for piece in _split(data, 1 + secrets.randbelow(6))]
+        if ''.join(pieces) + encoder.finalize() != encoded:
+            raise AssertionError(f"增量编码结果与一次性编码不一致: {data.hex()}")
+    print(f"{rounds} 组随机用例输出一致")
+
+
+def bench(sizes: list, chunk: int, repeat: int) -> None:
+    """
+    比较参考实现、binascii 实现与增量编解码器的耗时
+    :param sizes: 数据字节数列表
+    :param chunk: 增量编解码器每次输入的字节数（解码时为对应的 Base64 字符数）
+    :param repeat: 每项测量的重复次数
+    """
+    def measure(func) -> float:
+        return timeit.timeit(func, number=repeat) / repeat * 1e3
+
+    def stream_encode(data: bytes) -> str:
+        encoder = Base64Encoder()
+        return ''.join(encoder.update(data[i:i + chunk]) for i in range(0, len(data), chunk)) + encoder.finalize()
+
+    def stream_decode(text: str) -> bytes:
+        decoder = Base64Decoder()
+        step = chunk * 4 // 3
+        return b''.join(decoder.update(text[i:i + step]) for i in range(0, len(text), step)) + decoder.finalize()
+
+    print(f"chunk={chunk} repeat={repeat}（单位 ms）")
+    print(f"{'size':>9} {'op':>7} {'reference':>11} {'binascii':>10} {'stream':>9} {'speedup':>8}")
+    for size in sizes:
+        data = os.urandom(size)
+        text = Base64.b64encode(data)
+        for op, reference, oneshot, stream in (
+                ('encode', lambda: ReferenceBase64.b64encode(data), lambda: Base64.b64encode(data),
+                 lambda: stream_encode(data)),
+                ('decode', lambda: ReferenceBase64.b64decode(text), lambda: Base64.b64decode(text),
+                 lambda: stream_decode(text))):
+            ref_ms, fast_ms, stream_ms = measure(reference), measure(oneshot), measure(stream)
+            print(f"{size:>9} {op:>7} {ref_ms:>11.3f} {fast_ms:>10.3f} {stream_ms:>9.3f} {ref_ms / fast_ms:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Base64 编解码的一致性校验及基准测试")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1024, 65536, 1048576], help="数据字节数")
+    parser.add_argument('--chunk', type=int, default=65536, help="增量编解码器每次输入的字节数")
+    parser.add_argument('--repeat', type=int, default=3, help="每项测量的重复次数")
+    parser.add_argument('--rounds', type=int, default=300, help="一致性校验随机用例数")
+    args = parser.parse_args()
+
+    check_equivalence(args.rounds)
+    bench(args.sizes, args.chunk, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
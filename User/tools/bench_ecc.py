@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17 10:00
+# @Author  : DSTBP
+# @File    : tools/bench_ecc.py
+# @Description : ECC 加解密基准测试（按消息计时）
+"""
+在 User 目录下运行：python tools/bench_ecc.py [--lengths 48 200 1000] [--repeat 30] [--backend auto]
+对不同长度的消息分别统计 ECC 加密与解密单条消息的平均耗时，并校验解密结果与原文一致
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+from services.crypto import CryptoService
+
+
+def bench(lengths: list, repeat: int, backend: str, pool_size: int) -> None:
+    """
+    逐个消息长度测量 ECC 加解密耗时
+    :param lengths: 消息长度（字符数）列表
+    :param repeat: 每项测量的重复次数
+    :param backend: 大整数运算后端
+    :param pool_size: 临时密钥对预计算池容量，0 表示不启用
+    """
+    with CryptoService(crypto_algorithms={'ECC': {}}, int_backend=backend, ephemeral_pool_size=pool_size) as cs:
+        private_key, public_key = cs.generate_keypair()
+        print(f"backend={cs.int_backend} pool={pool_size} repeat={repeat}")
+        print(f"{'length':>8} {'encrypt(ms)':>12} {'decrypt(ms)':>12}")
+        for length in lengths:
+            message = os.urandom(length // 2 + 1).hex()[:length]
+            ciphertext = cs.encrypt_data(message, public_key)
+            if cs.decrypt_data(ciphertext, private_key) != message:
+                raise AssertionError(f"长度 {length} 的消息解密结果与原文不一致")
+
+            enc = timeit.timeit(lambda: cs.encrypt_data(message, public_key), number=repeat) / repeat * 1e3
+            dec = timeit.timeit(lambda: cs.decrypt_data(ciphertext, private_key), number=repeat) / repeat * 1e3
+            print(f"{length:>8} {enc:>12.3f} {dec:>12.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ECC 加解密基准测试（按消息计时）")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[16, 48, 200, 1000], help="消息长度（字符数）")
+    parser.add_argument('--repeat', type=int, default=30, help="每项测量的重复次数")
+    parser.add_argument('--backend', default='auto', choices=['auto', 'gmpy2', 'python'], help="大整数运算后端")
+    parser.add_argument('--pool', type=int, default=0, help="临时密钥对预计算池容量")
+    args = parser.parse_args()
+
+    logger.remove()     # 关闭服务日志，避免干扰计时输出
+    bench(args.lengths, args.repeat, args.backend, args.pool)
+
+
+if __name__ == '__main__':
+    main()
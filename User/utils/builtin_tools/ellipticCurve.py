@@ -3,29 +3,125 @@
 # @Author  : DSTBP
 # @File    : ellipticCurve.py
 # @Description : 椭圆曲线工具类
+import math
+import functools
 from typing import Optional
 from loguru import logger
 from utils.builtin_tools import arithmetic
 
 
+class SqrtContext:
+    """
+    素数域 F_p 上的模平方根上下文：缓存 p-1 = Q·2^S 分解、固定的二次非剩余 z 及 c = z^Q 的各次 2 幂，
+    并用 Jacobi 符号预筛非剩余，同一曲线上的反复开方（Koblitz 编码、点解压）不再重复这些计算
+    """
+    __slots__ = ('p', 'Q', 'S', 'z', 'c_pows', 'backend')
+
+    def __init__(self, p: int, backend: str = None):
+        """
+        :param p: 奇素数模数
+        :param backend: 大整数后端，缺省为模块当前后端
+        """
+        self.p = p
+        self.backend = backend
+        # 分解 p-1 为 Q * 2^S
+        Q, S = p - 1, 0
+        while Q % 2 == 0:
+            Q //= 2
+            S += 1
+        self.Q, self.S = Q, S
+
+        # p ≡ 3 mod 4 时直接取 n^((p+1)/4)，无需非剩余
+        self.z, self.c_pows = None, []
+        if S > 1:
+            z = 2
+            while arithmetic.jacobi(z, p, backend) != -1:
+                z += 1
+            # c_pows[k] = c^(2^k)：Tonelli-Shanks 每轮的 b 与新 c 都是初始 c 的某个 2 次幂
+            c = arithmetic.qpow(z, Q, p, backend)
+            for _ in range(S):
+                self.c_pows.append(c)
+                c = c * c % p
+            self.z = z
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def for_prime(p: int, backend: str = None) -> 'SqrtContext':
+        """返回模数 p 与后端对应的（缓存的）平方根上下文"""
+        return SqrtContext(p, backend)
+
+    def sqrt(self, n: int) -> Optional[int]:
+        """
+        求 y 使 y^2 ≡ n (mod p)
+        :param n: 待开方的整数
+        :return: 平方根 y，n 为非剩余时返回 None
+        """
+        p, backend = self.p, self.backend
+        n %= p
+        if n == 0:
+            return 0
+        # Jacobi 符号预筛：比欧拉判别法的模幂便宜得多，非剩余直接返回
+        if arithmetic.jacobi(n, p, backend) != 1:
+            return None
+
+        if self.S == 1:
+            return arithmetic.qpow(n, (p + 1) // 4, p, backend)
+
+        # Tonelli-Shanks 主循环：始终有 c = c_pows[S - M]，故 b = c^(2^(M-i-1)) 可直接查表
+        M, S = self.S, self.S
+        t = arithmetic.qpow(n, self.Q, p, backend)
+        R = arithmetic.qpow(n, (self.Q + 1) // 2, p, backend)
+        while t != 1:
+            # 寻找最小的 i 使得 t^{2^i} ≡ 1 mod p
+            i, temp = 0, t
+            while temp != 1 and i < M:
+                temp = temp * temp % p
+                i += 1
+            if i == M:
+                logger.error("Cannot find square root")
+                return None
+            b = self.c_pows[S - i - 1]
+            M = i
+            t = t * self.c_pows[S - i] % p
+            R = R * b % p
+        return R
+
+
 class Curve:
     """
     椭圆曲线类
     """
-    def __init__(self, p: int, a: int, b: int):
+    __slots__ = ('__p', '__a', '__b', '__glv', '__sqrt', '__backend', '__field')
+
+    def __init__(self, p: int, a: int, b: int, backend: str = None):
         """
         初始化椭圆曲线
         :param p: 曲线的模数
         :param a: 曲线方程中的系数 a
         :param b: 曲线方程中的系数 b
+        :param backend: 点运算使用的大整数后端（'auto'、'gmpy2' 或 'python'），缺省为模块当前后端
         """
         self.__p = p
         self.__a = a
         self.__b = b
+        self.__glv = None   # GLV 自同态参数
+        self.__sqrt = None  # 模平方根上下文（按需创建）
+        # 后端类型的 (a, p) 在建曲线时转换一次，点运算直接复用
+        self.__backend = arithmetic.resolve_backend(backend) if backend else arithmetic.get_backend()
+        self.__field = (arithmetic.to_backend(a, self.__backend), arithmetic.to_backend(p, self.__backend))
 
     def contains_point(self, x: int, y: int) -> bool:
         """检查点 (x, y) 是否在曲线上"""
-        return (y ** 2 - x ** 3 - self.__a * x - self.__b) % self.__p == 0
+        return (y * y - (x * x + self.__a) * x - self.__b) % self.__p == 0
+
+    def __eq__(self, other) -> bool:
+        """曲线参数 (p, a, b) 相同即视为同一条曲线"""
+        if not isinstance(other, Curve):
+            return NotImplemented
+        return (self.__p, self.__a, self.__b) == (other.__p, other.__a, other.__b)
+
+    def __hash__(self) -> int:
+        return hash((self.__p, self.__a, self.__b))
 
     def p(self):
         """返回曲线的模数"""
@@ -39,11 +135,177 @@ class Curve:
         """返回曲线方程中的系数 b"""
         return self.__b
 
+    def sqrt_context(self) -> SqrtContext:
+        """返回该曲线基域上的模平方根上下文"""
+        if self.__sqrt is None:
+            self.__sqrt = SqrtContext.for_prime(self.__p, self.__backend)
+        return self.__sqrt
+
+    def backend(self) -> str:
+        """返回曲线点运算使用的大整数后端名称"""
+        return self.__backend
+
+    def _field(self) -> tuple:
+        """返回曲线后端整数类型的 (a, p)，供内部点运算使用"""
+        return self.__field
+
+    def set_endomorphism(self, beta: int, lam: int, n: int) -> None:
+        """
+        启用 GLV 自同态 φ(x, y) = (βx, y) = λ(x, y)，仅适用于 a = 0 且余因子为 1 的曲线
+        :param beta: 模 p 的非平凡三次单位根 β
+        :param lam: 模 n 的非平凡三次单位根 λ，需满足 φ(P) = λP
+        :param n: 曲线群的阶
+        """
+        # 对 (n, λ) 执行扩展欧几里得算法，求格 {(x, y) : x + yλ ≡ 0 mod n} 的两组短基
+        sqrt_n = math.isqrt(n)
+        r0, r1, t0, t1 = n, lam, 0, 1
+        while r1 >= sqrt_n:
+            q = r0 // r1
+            r0, r1 = r1, r0 - q * r1
+            t0, t1 = t1, t0 - q * t1
+        q = r0 // r1
+        r2, t2 = r0 - q * r1, t0 - q * t1
+
+        a1, b1 = r1, -t1
+        a2, b2 = (r0, -t0) if r0 ** 2 + t0 ** 2 <= r2 ** 2 + t2 ** 2 else (r2, -t2)
+        self.__glv = (beta, lam, n, (a1, b1, a2, b2))
+
+    def endomorphism(self) -> Optional[tuple]:
+        """返回 GLV 自同态参数 (β, λ, n, 格基)，未启用时返回 None"""
+        return self.__glv
+
+
+def _jacobian_double(P: tuple, a: int, p: int) -> tuple:
+    """
+    雅可比坐标下的倍点运算，(X, Y, Z) 对应仿射坐标 (X/Z^2, Y/Z^3)
+    :param P: 雅可比坐标 (X, Y, Z)，Z 为 0 表示无穷远点
+    :param a: 曲线方程中的系数 a
+    :param p: 曲线的模数
+    :return: 2P 的雅可比坐标
+    """
+    X1, Y1, Z1 = P
+    if not Z1 or not Y1:
+        return 1, 1, 0
+
+    XX = X1 * X1 % p
+    YY = Y1 * Y1 % p
+    S = 4 * X1 * YY % p
+    M = 3 * XX
+    if a:
+        ZZ = Z1 * Z1 % p
+        M += a * ZZ * ZZ
+    M %= p
+
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y1 * Z1 % p
+    return X3, Y3, Z3
+
+
+def _jacobian_add(P: tuple, Q: tuple, a: int, p: int) -> tuple:
+    """
+    雅可比坐标下的点加运算，Q 的 Z 坐标为 1 时自动使用混合坐标加法
+    :param P: 雅可比坐标 (X1, Y1, Z1)
+    :param Q: 雅可比坐标 (X2, Y2, Z2)
+    :param a: 曲线方程中的系数 a
+    :param p: 曲线的模数
+    :return: P + Q 的雅可比坐标
+    """
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if not Z1:
+        return Q
+    if not Z2:
+        return P
+
+    Z1Z1 = Z1 * Z1 % p
+    U2 = X2 * Z1Z1 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    if Z2 == 1:
+        # 混合坐标加法：Q 为仿射点
+        U1, S1 = X1, Y1
+    else:
+        Z2Z2 = Z2 * Z2 % p
+        U1 = X1 * Z2Z2 % p
+        S1 = Y1 * Z2 * Z2Z2 % p
+
+    H = (U2 - U1) % p
+    r = (S2 - S1) % p
+    if not H:
+        # x 坐标相同：相等则倍点，互为相反数则得到无穷远点
+        return _jacobian_double(P, a, p) if not r else (1, 1, 0)
+
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - S1 * HHH) % p
+    Z3 = Z1 * H % p if Z2 == 1 else Z1 * Z2 * H % p
+    return X3, Y3, Z3
+
+
+def _batch_to_affine(coords: list, p: int, backend: str = None) -> list:
+    """
+    批量将雅可比坐标转换为仿射坐标，所有 Z 坐标共用一次模逆
+    :param coords: 雅可比坐标列表 [(X, Y, Z), ...]
+    :param p: 曲线的模数
+    :param backend: 大整数后端（曲线的后端）
+    :return: 坐标列表，有限点为 (x, y, 1)，无穷远点保持 (1, 1, 0)
+    """
+    z_invs = arithmetic.batch_inverse([Z for _, _, Z in coords], p, backend)
+    result = []
+    for (X, Y, Z), z_inv in zip(coords, z_invs):
+        if not Z or Z == 1:
+            result.append((X, Y, Z) if Z else (1, 1, 0))
+        else:
+            z_inv2 = z_inv * z_inv % p
+            result.append((X * z_inv2 % p, Y * z_inv2 * z_inv % p, 1))
+    return result
+
+
+def _glv_split(k: int, glv: tuple) -> tuple:
+    """
+    GLV 标量分解：k ≡ k1 + k2·λ (mod n)，|k1|, |k2| 约为 √n
+    :param k: 标量 (0 <= k < n)
+    :param glv: 曲线的 GLV 自同态参数
+    :return: (k1, k2)，可能为负数
+    """
+    _, _, n, (a1, b1, a2, b2) = glv
+    c1 = (2 * b2 * k + n) // (2 * n)
+    c2 = (-2 * b1 * k + n) // (2 * n)
+    return k - c1 * a1 - c2 * a2, -c1 * b1 - c2 * b2
+
+
+def _wnaf(k: int, width: int) -> list:
+    """
+    计算非负整数 k 的宽度为 w 的非相邻形式 (wNAF)
+    :param k: 非负整数
+    :param width: 窗口宽度 w
+    :return: 由低位到高位排列的数字列表，非零数字均为奇数且 |d| < 2^(w-1)
+    """
+    digits = []
+    full = 1 << width
+    half = full >> 1
+    while k:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
 
 class Point:
     """
-    椭圆曲线上的点类
+    椭圆曲线上的点类，内部以雅可比坐标 (X, Y, Z) 保存，仅在读取坐标时转换为仿射坐标。
+    仅公开构造函数校验点是否在曲线上，运算结果通过内部的可信构造路径创建。
     """
+    __slots__ = ('__curve', '__coords', '__order', '__table')
+
     def __init__(self, curve: Optional['Curve'], x: Optional[int], y: Optional[int], order=None):
         """
         初始化点
@@ -53,14 +315,64 @@ class Point:
         :param order: 点的阶（可选）
         """
         self.__curve = curve
-        self.__x = x
-        self.__y = y
+        self.__coords = (x, y, 1)
         self.__order = order
+        self.__table = None     # 固定基预计算表
 
         # 确认点是否在曲线上
         if curve and (x is not None or y is not None):
             assert curve.contains_point(x, y)
 
+    @classmethod
+    def _trusted(cls, curve: 'Curve', x: int, y: int, order=None) -> 'Point':
+        """
+        由已知在曲线上的仿射坐标构造点（内部使用，跳过曲线校验）
+        :param curve: 所在椭圆曲线
+        :param x: 点的 x 坐标
+        :param y: 点的 y 坐标
+        :param order: 点的阶（可选）
+        :return: 点对象
+        """
+        return cls._from_jacobian(curve, (x, y, 1), order)
+
+    @classmethod
+    def _from_jacobian(cls, curve: 'Curve', coords: tuple, order=None) -> 'Point':
+        """
+        由雅可比坐标构造点（内部使用，运算结果必然在曲线上，跳过校验）
+        :param curve: 所在椭圆曲线
+        :param coords: 雅可比坐标 (X, Y, Z)，Z 为 0 表示无穷远点
+        :param order: 点的阶（可选）
+        :return: 点对象或无穷远点
+        """
+        if not coords[2]:
+            return INFINITY
+        point = cls.__new__(cls)
+        point.__curve = curve
+        point.__coords = coords
+        point.__order = order
+        point.__table = None
+        return point
+
+    def _jacobian(self) -> tuple:
+        """返回点的雅可比坐标 (X, Y, Z)，无穷远点返回 (1, 1, 0)"""
+        if self.__coords[0] is None:
+            return 1, 1, 0
+        return self.__coords
+
+    def __is_infinity(self) -> bool:
+        """判断是否为无穷远点"""
+        return self.__coords[0] is None
+
+    def __normalize(self) -> tuple:
+        """将雅可比坐标转换为仿射坐标（Z = 1），结果整体替换以保证线程安全"""
+        X, Y, Z = self.__coords
+        if Z != 1 and X is not None:
+            p = self.__curve._field()[1]
+            z_inv = arithmetic.mod_inverse(Z, p, self.__curve.backend())
+            z_inv2 = z_inv * z_inv % p
+            self.__coords = (X * z_inv2 % p, Y * z_inv2 * z_inv % p, 1)
+        return self.__coords
+
     def __eq__(self, other: 'Point') -> bool:
         """
         判断两个点是否相等
@@ -68,11 +380,21 @@ class Point:
         :return: 如果两个点相等则返回 True，否则返回 False
         """
         if isinstance(other, Point):
-            return (
-                    self.__curve == other.__curve
-                    and self.__x == other.__x
-                    and self.__y == other.__y
-            )
+            if self is other:
+                return True
+            if self.__curve != other.__curve:
+                return False
+            if self.__is_infinity() or other.__is_infinity():
+                return self.__is_infinity() and other.__is_infinity()
+
+            # 交叉相乘比较，避免求逆
+            X1, Y1, Z1 = self.__coords
+            X2, Y2, Z2 = other.__coords
+            p = self.__curve.p()
+            Z1Z1 = Z1 * Z1 % p
+            Z2Z2 = Z2 * Z2 % p
+            return ((X1 * Z2Z2 - X2 * Z1Z1) % p == 0
+                    and (Y1 * Z2Z2 * Z2 - Y2 * Z1Z1 * Z1) % p == 0)
         return NotImplemented
 
     def __neg__(self) -> 'Point':
@@ -80,46 +402,31 @@ class Point:
         计算点的负值，即点 P 的相反数
         :return: 返回点的负值 (-P)
         """
-        if self == INFINITY:
+        if self.__is_infinity():
             return INFINITY
-        return Point(self.__curve, self.__x, self.__curve.p() - self.__y)
+        X, Y, Z = self.__coords
+        return Point._from_jacobian(self.__curve, (X, (-Y) % self.__curve.p(), Z))
 
     def __add__(self, other: 'Point') -> 'Point':
         """
         实现椭圆曲线上的点加法
-        如果两个点相等，使用椭圆曲线的公式计算斜率并得到新的点。
-        如果两个点不同，则按照椭圆曲线点加法的规则计算斜率。
+        在雅可比坐标下完成加法与倍点运算，不进行模逆运算。
         :param other: 另一个点
         :return: 返回点加法的结果
         """
-        # 处理无穷远点
-        if other == INFINITY:
-            return self
-        if self == INFINITY:
-            return other
-
         # 错误处理
         if not isinstance(other, Point):
             return NotImplemented
-        assert self.__curve == other.__curve
-
-        p = self.__curve.p()
 
-        # 如果两个点的 x 坐标相等但 y 坐标互为相反数，则返回无穷远点
-        if self.__x == other.__x and (self.__y + other.__y) % p == 0:
-            return INFINITY
-
-        if self.__x == other.__x:
-            # 处理自加的情况
-            l = (3 * self.__x ** 2 + self.__curve.a()) * arithmetic.mod_inverse(2 * self.__y, p) % p
-        else:
-            # 普通点加法
-            l = (other.__y - self.__y) * arithmetic.mod_inverse(other.__x - self.__x, p) % p
-
-        x3 = (l ** 2 - self.__x - other.__x) % p
-        y3 = (l * (self.__x - x3) - self.__y) % p
+        # 处理无穷远点
+        if other.__is_infinity():
+            return self
+        if self.__is_infinity():
+            return other
+        assert self.__curve == other.__curve
 
-        return Point(self.__curve, x3, y3)
+        curve = self.__curve
+        return Point._from_jacobian(curve, _jacobian_add(self.__coords, other.__coords, *curve._field()))
 
     def __sub__(self, other: 'Point') -> 'Point':
         """
@@ -129,29 +436,154 @@ class Point:
         """
         return self + (-other)
 
+    def precompute(self, window: int = 4) -> 'Point':
+        """
+        为固定基点构建窗口预计算表：第 i 行保存 j * 2^(w*i) * P (1 <= j < 2^w) 的仿射坐标，
+        此后与该点的标量乘法只需约 bits/w 次混合加法，无需倍点。
+        :param window: 窗口宽度 w
+        :return: 点自身
+        """
+        if self.__is_infinity():
+            return self
+
+        curve = self.__curve
+        a, p = curve._field()
+        bits = (self.__order or p).bit_length()
+        rows = []
+        base = self.__normalize()
+        for _ in range((bits + window - 1) // window):
+            row, acc = [], base
+            for _ in range((1 << window) - 1):
+                row.append(acc)
+                acc = _jacobian_add(acc, base, a, p)
+            # 下一行的基点为 2^w * base，恰好等于本行累加后的结果；整行与其一并批量转换为仿射坐标
+            *row, base = _batch_to_affine(row + [acc], p, curve.backend())
+            rows.append(row)
+
+        self.__table = (window, bits, rows)
+        return self
+
+    def is_precomputed(self) -> bool:
+        """是否已构建固定基预计算表"""
+        return self.__table is not None
+
+    def __fixed_base_mul(self, multiple: int) -> 'Point':
+        """
+        使用预计算表计算标量乘法
+        :param multiple: 非负标量，位长不超过预计算表覆盖的范围
+        :return: 返回标量乘法的结果
+        """
+        window, _, rows = self.__table
+        curve = self.__curve
+        a, p = curve._field()
+        mask = (1 << window) - 1
+        result = (1, 1, 0)
+
+        for row in rows:
+            if not multiple:
+                break
+            digit = multiple & mask
+            if digit:
+                result = _jacobian_add(result, row[digit - 1], a, p)
+            multiple >>= window
+
+        return Point._from_jacobian(curve, result)
+
+    def __wnaf_mul(self, multiple: int, width: int = 5) -> 'Point':
+        """
+        使用 wNAF 计算可变基点的标量乘法：每次调用预计算奇数倍点表 P, 3P, ..., (2^(w-1)-1)P，
+        再由高位到低位倍点并按非零数字加减表中的点。
+        :param multiple: 正整数标量
+        :param width: 窗口宽度 w
+        :return: 返回标量乘法的结果
+        """
+        curve = self.__curve
+        a, p = curve._field()
+        base = self.__normalize()
+
+        # 奇数倍点表
+        double = _jacobian_double(base, a, p)
+        odd_multiples = [base]
+        for _ in range((1 << (width - 2)) - 1):
+            odd_multiples.append(_jacobian_add(odd_multiples[-1], double, a, p))
+        odd_multiples = _batch_to_affine(odd_multiples, p, curve.backend())     # 转为仿射坐标，后续使用混合加法
+
+        result = (1, 1, 0)
+        for digit in reversed(_wnaf(multiple, width)):
+            result = _jacobian_double(result, a, p)
+            if digit > 0:
+                result = _jacobian_add(result, odd_multiples[digit >> 1], a, p)
+            elif digit < 0:
+                X, Y, Z = odd_multiples[-digit >> 1]
+                result = _jacobian_add(result, (X, p - Y, Z), a, p)
+
+        return Point._from_jacobian(curve, result)
+
+    def __glv_mul(self, multiple: int, glv: tuple, width: int = 5) -> 'Point':
+        """
+        使用 GLV 自同态计算标量乘法：k·P = k1·P + k2·φ(P)，两个半长标量的 wNAF 交替处理，倍点次数减半。
+        φ 作用于雅可比坐标只需 X 乘以 β，因此 φ(P) 的奇数倍点表可由 P 的表直接得到。
+        :param multiple: 标量 (0 < k < n)
+        :param glv: 曲线的 GLV 自同态参数
+        :param width: 窗口宽度 w
+        :return: 返回标量乘法的结果
+        """
+        curve = self.__curve
+        a, p = curve._field()
+        beta = glv[0]
+        base = self.__normalize()
+
+        # P 的奇数倍点表
+        double = _jacobian_double(base, a, p)
+        odd_multiples = [base]
+        for _ in range((1 << (width - 2)) - 1):
+            odd_multiples.append(_jacobian_add(odd_multiples[-1], double, a, p))
+        odd_multiples = _batch_to_affine(odd_multiples, p, curve.backend())     # 转为仿射坐标，后续使用混合加法
+
+        k1, k2 = _glv_split(multiple, glv)
+        tables = []
+        for k, endo in ((k1, False), (k2, True)):
+            table = [(X * beta % p if endo else X, Y if k >= 0 else p - Y, Z) for X, Y, Z in odd_multiples]
+            tables.append((table, _wnaf(abs(k), width)))
+
+        length = max(len(digits) for _, digits in tables)
+        result = (1, 1, 0)
+        for i in range(length - 1, -1, -1):
+            result = _jacobian_double(result, a, p)
+            for table, digits in tables:
+                digit = digits[i] if i < len(digits) else 0
+                if digit > 0:
+                    result = _jacobian_add(result, table[digit >> 1], a, p)
+                elif digit < 0:
+                    X, Y, Z = table[-digit >> 1]
+                    result = _jacobian_add(result, (X, p - Y, Z), a, p)
+
+        return Point._from_jacobian(curve, result)
+
     def __mul__(self, multiple: int) -> 'Point':
         """
-        实现标量乘法 (点乘)，使用二进制加法方法进行优化，逐位处理点乘。
+        实现标量乘法 (点乘)。已知阶时先将标量约减到 [0, order)；若该点已构建固定基预计算表则直接查表累加，
+        曲线启用 GLV 自同态时使用 GLV 分解，否则在雅可比坐标下使用 wNAF 方法计算，仅在读取坐标时进行一次坐标转换。
         :param multiple: 标量，整数类型
         :return: 返回标量乘法的结果。如果标量为零或涉及无穷远点，则返回无穷远点
         """
-        if multiple == 0 or self == INFINITY:
-            return INFINITY
-        if self.__order and multiple % self.__order == 0:
+        if multiple == 0 or self.__is_infinity():
             return INFINITY
-        if multiple < 0:
+        glv = self.__curve.endomorphism()
+        order = self.__order or (glv[2] if glv else None)
+        if order:
+            # 已知阶时约减标量，同时消除负标量
+            multiple %= order
+            if multiple == 0:
+                return INFINITY
+        elif multiple < 0:
             return -self * -multiple
 
-        result = INFINITY   # 无穷远点
-        temp = self         # 临时点
-
-        while multiple:
-            if multiple & 1:           # 如果当前二进制位为1，累加结果
-                result += temp
-            temp += temp            # 点加自己（相当于倍点）
-            multiple >>= 1          # 移动到下一个二进制位
-
-        return result
+        if self.__table is not None and multiple.bit_length() <= self.__table[1]:
+            return self.__fixed_base_mul(multiple)
+        if glv:
+            return self.__glv_mul(multiple, glv)
+        return self.__wnaf_mul(multiple)
 
     def __rmul__(self, multiple: int) -> 'Point':
         """
@@ -163,11 +595,13 @@ class Point:
 
     def x(self):
         """返回点的 x 坐标"""
-        return self.__x
+        x = self.__normalize()[0]
+        return None if x is None else int(x)
 
     def y(self):
         """返回点的 y 坐标"""
-        return self.__y
+        y = self.__normalize()[1]
+        return None if y is None else int(y)
 
     def curve(self):
         """返回点所在的曲线"""
@@ -195,23 +629,204 @@ class Util:
             return point.x(), point.y()
 
     @staticmethod
-    def tuple_to_point(curve: 'Curve', tup: tuple) -> 'Point':
+    def points_to_tuples(points: list) -> list:
+        """
+        批量将点对象转换为元组 (x, y)，所有点的坐标转换共用一次模逆
+        :param points: 同一曲线上的点列表
+        :return: 坐标元组列表，无穷远点对应 (None, None)
+        """
+        curve = next((point.curve() for point in points if point.curve()), None)
+        if curve is None:
+            return [(None, None)] * len(points)
+
+        coords = _batch_to_affine([point._jacobian() for point in points], curve._field()[1], curve.backend())
+        return [(int(x), int(y)) if Z else (None, None) for x, y, Z in coords]
+
+    @staticmethod
+    def tuple_to_point(curve: 'Curve', tup: tuple, cached: bool = False) -> 'Point':
         """
         将元组 (x, y) 转换为点对象，如果是 (None, None)，则返回无穷远点
-        :param tup: (x, y) 坐标元组
+        :param tup: (x, y) 坐标元组；若已是点对象（如带预计算表的公钥）则原样返回
         :param curve: 椭圆曲线对象
+        :param cached: 是否走已校验点的 LRU 缓存（适用于反复出现的公钥，密文分量等一次性的点不要缓存）
         :return: EllipticPoint 对象，或无穷远点
         """
-        # 确认点是否在曲线上
+        if isinstance(tup, Point):
+            return tup
         x, y = tup
-        if curve and (x is not None or y is not None):
-            assert curve.contains_point(x, y)
-
         # 如果是 (None, None)，表示无穷远点
-        if tup == (None, None):
+        if x is None and y is None:
             return INFINITY
 
-        return Point(curve, x, y)
+        if cached and curve:
+            return Util._validated_point(curve, id(curve), int(x), int(y))
+
+        # 确认点是否在曲线上（反序列化边界，仅校验一次）
+        if curve:
+            assert curve.contains_point(x, y)
+        return Point._trusted(curve, x, y)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _validated_point(curve: 'Curve', curve_id: int, x: int, y: int) -> 'Point':
+        """
+        已校验点的 LRU 缓存，以 (曲线, 曲线对象 id, x, y) 为键
+        Curve 的相等性只比较 (p, a, b)，加入对象 id 后，参数相同但后端或 GLV 自同态不同的曲线实例各自缓存，
+        命中时返回的点总是属于调用方传入的曲线；缓存键持有曲线的强引用，条目存活期间 id 不会被复用。
+        返回的点对象被同一曲线的所有调用方共享，其上的预计算表（precompute）也随之复用
+        :param curve_id: id(curve)
+        """
+        assert curve.contains_point(x, y)
+        return Point._trusted(curve, x, y)
+
+    @staticmethod
+    def point_cache_info():
+        """返回已校验点缓存的命中统计 (hits, misses, maxsize, currsize)"""
+        return Util._validated_point.cache_info()
+
+    @staticmethod
+    def clear_point_cache() -> None:
+        """清空已校验点缓存"""
+        Util._validated_point.cache_clear()
+
+    @staticmethod
+    def joint_sparse_form(k1: int, k2: int) -> list:
+        """
+        计算两个非负整数的联合稀疏形式 (JSF)，平均每两位中只有一位非零列
+        :param k1: 非负整数 k1
+        :param k2: 非负整数 k2
+        :return: 由低位到高位排列的数字对列表 [(u1, u2), ...]，u1, u2 ∈ {-1, 0, 1}
+        """
+        digits = []
+        d1 = d2 = 0
+        while k1 + d1 > 0 or k2 + d2 > 0:
+            l1, l2 = k1 + d1, k2 + d2
+
+            u1 = 0
+            if l1 & 1:
+                u1 = 1 if l1 % 4 == 1 else -1
+                if l1 % 8 in (3, 5) and l2 % 4 == 2:
+                    u1 = -u1
+
+            u2 = 0
+            if l2 & 1:
+                u2 = 1 if l2 % 4 == 1 else -1
+                if l2 % 8 in (3, 5) and l1 % 4 == 2:
+                    u2 = -u2
+
+            if 2 * d1 == 1 + u1:
+                d1 = 1 - d1
+            if 2 * d2 == 1 + u2:
+                d2 = 1 - d2
+            k1 >>= 1
+            k2 >>= 1
+            digits.append((u1, u2))
+        return digits
+
+    @staticmethod
+    def double_scalar_mul(k1: int, P1: 'Point', k2: int, P2: 'Point') -> 'Point':
+        """
+        同时计算 k1 * P1 + k2 * P2（Shamir/Straus 技巧）：基于联合稀疏形式交替处理两个标量，
+        两次标量乘法共用同一串倍点。若 P1 已构建固定基预计算表，则 k1 * P1 直接查表，仅 k2 * P2 需要倍点。
+        :param k1: 标量 k1
+        :param P1: 点 P1（通常为基点 G）
+        :param k2: 标量 k2
+        :param P2: 点 P2（通常为公钥点）
+        :return: k1 * P1 + k2 * P2
+        """
+        # 已知阶时约减标量，负标量转化为对点取反
+        if P1.order():
+            k1 %= P1.order()
+        if P2.order():
+            k2 %= P2.order()
+        if k1 < 0:
+            k1, P1 = -k1, -P1
+        if k2 < 0:
+            k2, P2 = -k2, -P2
+        if k1 == 0 or P1 == INFINITY:
+            return k2 * P2
+        if k2 == 0 or P2 == INFINITY:
+            return k1 * P1
+        if P1.is_precomputed():
+            return k1 * P1 + k2 * P2
+
+        curve = P1.curve()
+        a, p = curve._field()
+
+        # 预计算 ±P1, ±P2, ±(P1 + P2), ±(P1 - P2)，以 (u1, u2) 为键
+        p1, p2 = P1._jacobian(), P2._jacobian()
+        table = dict(zip([(1, 0), (0, 1), (1, 1), (1, -1)], _batch_to_affine([
+            p1, p2, _jacobian_add(p1, p2, a, p), _jacobian_add(p1, (p2[0], p - p2[1], p2[2]), a, p)
+        ], p, curve.backend())))
+        for (u1, u2), (X, Y, Z) in list(table.items()):
+            table[(-u1, -u2)] = (X, (p - Y) % p, Z)
+
+        result = (1, 1, 0)
+        for digit in reversed(Util.joint_sparse_form(k1, k2)):
+            result = _jacobian_double(result, a, p)
+            if digit != (0, 0):
+                result = _jacobian_add(result, table[digit], a, p)
+
+        return Point._from_jacobian(curve, result)
+
+    @staticmethod
+    def multi_scalar_mul(scalars: list, points: list) -> 'Point':
+        """
+        多标量乘法 Σ k_i * P_i（Pippenger 桶算法）：将标量按 c 位窗口切分，每个窗口内把点累加到对应数字的桶中，
+        再用一次后缀和求出 Σ j * bucket_j，所有窗口共用同一串倍点。
+        :param scalars: 标量列表
+        :param points: 点列表，与标量一一对应且位于同一曲线上
+        :return: Σ k_i * P_i
+        """
+        if len(scalars) != len(points):
+            raise ValueError("标量与点的数量不一致")
+
+        # 已知阶时约减标量，负标量转化为对点取反，并剔除零项
+        terms = []
+        for k, P in zip(scalars, points):
+            if P == INFINITY:
+                continue
+            if P.order():
+                k %= P.order()
+            if k < 0:
+                k, P = -k, -P
+            if k:
+                terms.append((k, P))
+
+        if not terms:
+            return INFINITY
+        if len(terms) < 4:
+            # 点数较少时桶算法没有优势，逐个计算
+            return sum((k * P for k, P in terms), INFINITY)
+
+        curve = terms[0][1].curve()
+        a, p = curve._field()
+        coords = [(k, P._jacobian()) for k, P in terms]
+
+        # 窗口宽度随点数增长，约为 log2(n)
+        c = max(2, len(terms).bit_length() - 1)
+        mask = (1 << c) - 1
+        bits = max(k.bit_length() for k, _ in coords)
+
+        result = (1, 1, 0)
+        for shift in range((bits - 1) // c * c, -1, -c):
+            for _ in range(c):
+                result = _jacobian_double(result, a, p)
+
+            buckets = [(1, 1, 0)] * (mask + 1)
+            for k, P in coords:
+                digit = (k >> shift) & mask
+                if digit:
+                    buckets[digit] = _jacobian_add(buckets[digit], P, a, p)
+
+            # Σ j * bucket_j = Σ_j (bucket_j + ... + bucket_max)
+            running = window_sum = (1, 1, 0)
+            for digit in range(mask, 0, -1):
+                running = _jacobian_add(running, buckets[digit], a, p)
+                window_sum = _jacobian_add(window_sum, running, a, p)
+            result = _jacobian_add(result, window_sum, a, p)
+
+        return Point._from_jacobian(curve, result)
 
     @classmethod
     def jacobi(cls, a: int, n: int) -> int:
@@ -223,20 +838,7 @@ class Util:
         """
         # 确保 n 是正奇数
         assert n > 0 and n % 2 == 1, 'The second input integer should be POSITIVE and ODD'
-
-        a %= n  # 将 a 归约到 n 的范围内
-        t = 1  # 初始化结果符号
-        while a:
-            # 处理 a 为偶数的情况
-            while a % 2 == 0:
-                a //= 2
-                if n % 8 in [3, 5]:  # 根据 n mod 8 决定符号翻转
-                    t = -t
-            # 互反律：交换 a 和 n，同时根据条件调整符号
-            if a % 4 == 3 and n % 4 == 3:
-                t = -t
-            a, n = n % a, a  # 交换并取模
-        return t if n == 1 else 0  # 如果 n 归约到 1，则返回符号 t，否则返回 0
+        return arithmetic.jacobi(a, n)
 
     @classmethod
     def Legendre(cls, n: int, p: int) -> int:
@@ -249,7 +851,7 @@ class Util:
                 -1 表示 n 是模 p 的二次非剩余
                 0  表示 n 能被 p 整除
         """
-        return pow(n, (p - 1) // 2, p)
+        return arithmetic.qpow(n, (p - 1) // 2, p)
 
     @staticmethod
     def Tonelli_Shanks(n: int, p: int) -> int:
@@ -265,54 +867,8 @@ class Util:
         if p == 2:
             return n  # 只有 p=2 时，0和1的平方根分别是0和1
 
-        # 欧拉准则判断是否为二次剩余
-        if Util.Legendre(n, p) != 1:
-            # logger.error(f"{n} Quadratic residue that is not modulo {p}")
-            return -1
-
-        # p ≡ 3 mod4 时使用快速算法
-        if p % 4 == 3:
-            y = pow(n, (p + 1) // 4, p)
-            return y
-
-        # 分解 p-1 为 Q * 2^S
-        Q = p - 1
-        S = 0
-        while Q % 2 == 0:
-            Q //= 2
-            S += 1
-
-        # 寻找二次非剩余 z
-        z = 2
-        while Util.Legendre(z, p) != p - 1:
-            z += 1
-
-        # 初始化变量
-        c = pow(z, Q, p)
-        t = pow(n, Q, p)
-        R = pow(n, (Q + 1) // 2, p)
-        M = S
-
-        # 主循环
-        while t != 1:
-            # 寻找最小的 i 使得 t^{2^i} ≡1 mod p
-            i, temp = 0, t
-            while temp != 1 and i < M:
-                temp = pow(temp, 2, p)
-                i += 1
-
-            if i == M:
-                logger.error("Cannot find square root")
-                return -1
-
-            # 更新参数
-            b = pow(c, 1 << (M - i - 1), p)
-            M = i
-            c = pow(b, 2, p)
-            t = (t * c) % p
-            R = (R * b) % p
-
-        return R
+        y = SqrtContext.for_prime(p).sqrt(n)
+        return -1 if y is None else y
 
     @staticmethod
     def calc_y_coord(curve: 'Curve', x: int):
@@ -327,10 +883,10 @@ class Util:
         a = curve.a()
         b = curve.b()
         # 计算 y^2 的值
-        y_squared = (x ** 3 + a * x + b) % p
+        y_squared = ((x * x + a) * x + b) % p
 
-        y = Util.Tonelli_Shanks(y_squared, p)
-        if y > 0:
+        y = curve.sqrt_context().sqrt(y_squared)
+        if y:
             # 另一个 y 坐标是当前 y 坐标的相反数
             return y, p - y
         else:
@@ -3,11 +3,17 @@
 # @Author  : DSTBP
 # @File    : arithmetic.py
 # @Description : 加密工具类
+import io
 import json
+import binascii
+import contextlib
+import functools
 import math
+import struct
 import hashlib
 import secrets
-from typing import Union, Optional
+from typing import Union, Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from gmssl import sm3
 from loguru import logger
 from utils.builtin_tools import arithmetic
@@ -16,25 +22,102 @@ from Crypto.Cipher import AES as fastaes
 from Crypto.Util import Padding
 import base64
 
+try:
+    import numpy as np
+except ImportError:     # NumPy 为可选依赖，缺失时 AES 仅使用逐块的 T 表实现
+    np = None
+
+
+class _SM3:
+    """基于 gmssl.sm3 压缩函数的增量 SM3（hashlib 不提供 SM3 时使用，结果与 sm3.sm3_hash 一致）"""
+
+    def __init__(self):
+        self.__v = list(sm3.IV)
+        self.__buffer = b''
+        self.__length = 0
+
+    def update(self, data: bytes) -> None:
+        self.__length += len(data)
+        data = self.__buffer + bytes(data)
+        cut = len(data) - len(data) % 64
+        for i in range(0, cut, 64):
+            self.__v = sm3.sm3_cf(self.__v, data[i:i + 64])
+        self.__buffer = data[cut:]
+
+    def digest(self) -> bytes:
+        # 填充：0x80、补零至 56 (mod 64) 字节、64 位消息比特长度
+        tail = self.__buffer + b'\x80' + bytes((55 - len(self.__buffer)) % 64) + (self.__length * 8).to_bytes(8, 'big')
+        v = self.__v
+        for i in range(0, len(tail), 64):
+            v = sm3.sm3_cf(v, tail[i:i + 64])
+        return b''.join(x.to_bytes(4, 'big') for x in v)
+
+
+def _sm3_new():
+    """创建 SM3 哈希上下文：优先使用 hashlib（OpenSSL）实现"""
+    if 'sm3' in hashlib.algorithms_available:
+        return hashlib.new('sm3')
+    return _SM3()
+
+
 class Hash:
-    """哈希算法类"""
+    """
+    哈希算法类
+    - Hash.digest(data) 一次性计算摘要
+    - Hash(algorithm) 创建增量哈希对象，分段 update 后 finalize，结果与对整段数据调用 digest 相同
+    """
     
-    # 哈希算法映射字典
+    # 哈希算法映射字典（值为创建哈希上下文的函数）
     _ALGORITHMS = {
         'SHA256': hashlib.sha256,  # SHA256 算法
         'MD5': hashlib.md5,        # MD5 算法
-        "SM3": sm3.sm3_hash        # 国密 SM3 算法
+        "SM3": _sm3_new            # 国密 SM3 算法
     }
 
+    def __init__(self, algorithm: str = 'SHA256', length: int = 32):
+        """
+        创建增量哈希对象
+        :param algorithm: 哈希算法（SHA256/MD5/SM3）
+        :param length: 消息摘要长度
+        """
+        algo = self._ALGORITHMS.get(algorithm.upper())
+        if not algo:
+            raise ValueError(f"不支持的哈希算法: {algorithm}")
+        self.algorithm = algorithm.upper()
+        self.length = length
+        self.__ctx = algo()
+
+    def update(self, data: Union[str, bytes, int]) -> 'Hash':
+        """
+        输入一段数据
+        :param data: 数据片段（支持字符串/字节/整数）
+        :return: 自身，便于链式调用
+        """
+        self.__ctx.update(self.__convert_to_bytes(data))
+        return self
+
+    def finalize(self, output_format: str = 'hex') -> Union[str, bytes, int]:
+        """
+        输出已输入全部数据的摘要
+        :param output_format: 输出格式（hex/bytes/int）
+        :return: 指定格式的哈希值
+        """
+        hash_bytes = self.__ctx.digest()
+
+        # 处理哈希值长度（用于 MD5-64）
+        if self.length == 16:
+            hash_bytes = hash_bytes[4:12]
+        return self._format_output(hash_bytes, output_format)
+
     @classmethod
     def __convert_to_bytes(cls, data: Union[str, bytes, int]) -> bytes:
-        """将输入数据转换为字节数组"""
+        """将输入数据转换为字节（字节类数据直接使用，不再复制）"""
         if isinstance(data, int):
-            return bytearray(data.to_bytes((data.bit_length() + 7) // 8, 'big'))
+            return data.to_bytes((data.bit_length() + 7) // 8, 'big')
         if isinstance(data, str):
-            return bytearray(data.encode())
-        elif isinstance(data, (bytes, bytearray)):
-            return bytearray(data)
+            return data.encode()
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            return data
         raise ValueError("Unsupported data type")
 
     @classmethod
@@ -51,26 +134,7 @@ class Hash:
         :param output_format: 输出格式（hex/bytes/int）
         :return: 指定格式的哈希值
         """
-        # 统一转换为字节数组
-        data_bytes = cls.__convert_to_bytes(data)
-        
-        # 根据算法类型计算哈希值
-        algo = cls._ALGORITHMS.get(algorithm.upper())
-        if not algo:
-            raise ValueError(f"不支持的哈希算法: {algorithm}")
-
-        # 计算哈希
-        if algorithm.upper() == 'SM3':
-            hash_bytes = bytes.fromhex(algo(data_bytes))
-        else:
-            hash_bytes = algo(data_bytes).digest()
-
-        # 处理哈希值长度（用于 MD5-64）
-        if length == 16:
-            hash_bytes = hash_bytes[4:12]
-
-        # 格式转换
-        return cls._format_output(hash_bytes, output_format)
+        return cls(algorithm, length).update(data).finalize(output_format)
 
     @staticmethod
     def _format_output(hash_bytes: bytes, type_format: str) -> Union[str, bytes, int]:
@@ -81,47 +145,167 @@ class Hash:
             return int.from_bytes(hash_bytes, 'big')
         return hash_bytes
 
+
+class HashingReader:
+    """读取时同步哈希的文件包装器：每块数据只读取一次，同时送入哈希与后续处理（如加密）"""
+
+    def __init__(self, reader, hasher: Hash):
+        """
+        :param reader: 二进制可读文件对象
+        :param hasher: 增量哈希对象
+        """
+        self.__reader = reader
+        self.hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.__reader.read(size)
+        self.hasher.update(data)
+        return data
+
+
+class HashingWriter:
+    """写入时同步哈希的文件包装器：处理结果（如解密出的明文）在写出的同时计算摘要"""
+
+    def __init__(self, writer, hasher: Hash):
+        """
+        :param writer: 具有 write 方法的输出对象
+        :param hasher: 增量哈希对象
+        """
+        self.__writer = writer
+        self.hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        return self.__writer.write(data)
+
+
 class ECC:
     """椭圆曲线加密类，实现基于 Koblitz 编码的 ECC 加密"""
-    def __init__(self, curve: 'Curve', G: 'Point', K: int = 100000):
+    # 二进制密文容器：魔数 + 版本号 + 编码方式 + 坐标字节长度 + 层数 + 密文点数，之后依次为层表与密文点
+    CIPHER_MAGIC = b'EC'
+    CIPHER_VERSION = 1
+    CIPHER_HEADER = struct.Struct('>2sBBBBH')
+    CIPHER_ENCODINGS = ('text', 'int')
+
+    def __init__(self, curve: 'Curve', G: 'Point', K: int = 100000, cipher_format: str = 'binary'):
         """
         初始化 ECC 加密类
         :param curve: 椭圆曲线对象
         :param G: 基点
         :param K: Koblitz 编码参数，用于调整编码成功率，默认值 100000
+        :param cipher_format: 密文格式，'binary'（压缩点二进制容器）或 'json'（旧格式）；两种格式均可读取
         """
+        if cipher_format not in ('binary', 'json'):
+            raise ValueError(f"不支持的密文格式: {cipher_format}")
         self.curve = curve  # 椭圆曲线
         self.G = G         # 基点
         self.K = K         # Koblitz 编码参数
+        self.cipher_format = cipher_format  # 密文序列化格式
+        self.ephemeral_source = None        # 可选的临时密钥对 (r, r*G) 来源（如预计算池），为空时现场生成
         self.p = curve.p() # 曲线模数
         # 计算编码相关参数
         self.coord_len = math.ceil(self.p.bit_length() / 8)  # 坐标字节长度
         self.max_block = (self.p // K) - 1                   # 最大块大小
         self.block_size = (self.max_block.bit_length() + 7) // 8  # 字节块大小
+        # 整数编码参数：将小于基点阶的整数按 int_limb_bits 位分段，每段 x = limb * 2^int_k + j 映射为一个点
+        # int_k 至少为 7（每段最多 128 次尝试，失败概率约 2^-128），阶明显小于 p 时整数只需一个点
+        p_bits, n_bits = self.p.bit_length() - 1, G.order().bit_length()
+        self.int_limbs = math.ceil(n_bits / (p_bits - 7))
+        self.int_limb_bits = math.ceil(n_bits / self.int_limbs)
+        self.int_k = p_bits - self.int_limb_bits
 
     def __serialize_cipher(self, cipher_data: dict) -> str:
         """将密文数据序列化为 Base64 字符串"""
-        return Base64.b64encode(json.dumps(cipher_data))
+        if self.cipher_format == 'json':
+            return Base64.b64encode(json.dumps(cipher_data))
+
+        layers = sorted((int(k[1:]), v) for k, v in cipher_data.items() if k[0] == 'c' and k[1:].isdigit())
+        cts = cipher_data['cts']
+        buf = bytearray(self.CIPHER_HEADER.pack(
+            self.CIPHER_MAGIC, self.CIPHER_VERSION, self.CIPHER_ENCODINGS.index(cipher_data.get('enc', 'text')),
+            self.coord_len, len(layers), len(cts)))
+        for num, point in layers:
+            buf += num.to_bytes(2, 'big')
+            buf += self.__compress_point(point)
+        for point in cts:
+            buf += self.__compress_point(point)
+        return Base64.b64encode(bytes(buf))
 
     def __deserialize_cipher(self, cipher_str: str) -> dict:
-        """将 Base64 字符串反序列化为密文数据"""
-        return json.loads(Base64.b64decode(cipher_str))
-
-    def __encode_block(self, m: int) -> 'Point':
+        """将 Base64 字符串反序列化为密文数据，兼容旧的 JSON 格式"""
+        raw = Base64.b64decode(cipher_str)
+        if not raw.startswith(self.CIPHER_MAGIC):
+            return json.loads(raw)
+
+        # 二进制容器：在 memoryview 上按偏移解析，不复制中间切片
+        view = memoryview(raw)
+        _, version, encoding, coord_len, n_layers, n_cts = self.CIPHER_HEADER.unpack_from(view)
+        if version != self.CIPHER_VERSION:
+            raise ValueError(f"不支持的密文版本: {version}")
+        if coord_len != self.coord_len:
+            raise ValueError("密文与当前曲线的坐标长度不一致")
+        point_len = coord_len + 1
+        if len(view) != self.CIPHER_HEADER.size + n_layers * (point_len + 2) + n_cts * point_len:
+            raise ValueError("密文长度错误")
+
+        cipher_data, offset = {}, self.CIPHER_HEADER.size
+        for _ in range(n_layers):
+            num = int.from_bytes(view[offset:offset + 2], 'big')
+            cipher_data[f'c{num}'] = self.__decompress_point(view[offset + 2:offset + 2 + point_len])
+            offset += 2 + point_len
+        cipher_data['cts'] = [self.__decompress_point(view[offset + i * point_len:offset + (i + 1) * point_len])
+                              for i in range(n_cts)]
+        if encoding:
+            cipher_data['enc'] = self.CIPHER_ENCODINGS[encoding]
+        return cipher_data
+
+    def __compress_point(self, point: tuple) -> bytes:
+        """将点坐标 (x, y) 按 SEC1 压缩格式编码为定长字节串（无穷远点为全零）"""
+        x, y = point
+        if x is None:
+            return bytes(self.coord_len + 1)
+        return bytes((2 | (y & 1),)) + x.to_bytes(self.coord_len, 'big')
+
+    def __decompress_point(self, data: memoryview) -> tuple:
+        """将 SEC1 压缩格式的定长字节串解码为点坐标 (x, y)"""
+        prefix = data[0]
+        if prefix == 0:
+            return None, None
+        if prefix not in (2, 3):
+            raise ValueError("无效的压缩点前缀")
+
+        x = int.from_bytes(data[1:], 'big')
+        y = self.curve.sqrt_context().sqrt((x * x + self.curve.a()) * x + self.curve.b())
+        if y is None or x >= self.p:
+            raise ValueError("压缩点不在曲线上")
+        if y & 1 != prefix & 1:
+            y = self.p - y
+        return x, y
+
+    def __encode_block(self, m: int, K: Optional[int] = None) -> 'Point':
         """
         将单个数据块编码为椭圆曲线上的点
         :param m: 待编码的整数
+        :param K: Koblitz 编码参数，默认使用 self.K
         :return: 编码后的椭圆曲线点
         """
-        x_base = m * self.K
-        for j in range(self.K):
+        K = K or self.K
+        x_base = m * K
+        for j in range(K):
             x = x_base + j
             if x >= self.p:
                 break
-            # 尝试找到合适的 y 坐标
+            # 尝试找到合适的 y 坐标（由曲线方程求得，无需再次校验）
             if y_coords := Util.calc_y_coord(self.curve, x):
-                return Point(self.curve, x, y_coords[0])
-        raise ValueError(f"编码失败：无法在 {self.K} 次尝试内找到有效点")
+                return Point._trusted(self.curve, x, y_coords[0])
+        raise ValueError(f"编码失败：无法在 {K} 次尝试内找到有效点")
+
+    def __ephemeral_pair(self) -> tuple:
+        """取一对临时密钥 (r, r*G)：优先从 ephemeral_source 获取，否则现场生成"""
+        if self.ephemeral_source:
+            return self.ephemeral_source()
+        r = secrets.randbelow(self.G.order() - 1) + 1
+        return r, r * self.G
 
     def koblitz_encode(self, message: str) -> list:
         """
@@ -144,10 +328,10 @@ class ECC:
         :param points: 椭圆曲线点列表
         :return: 解码后的消息字符串
         """
-        # 将所有点的 x 坐标转换回字节流
+        # 将所有点的 x 坐标转换回字节流（批量转换为仿射坐标）
         bytes_stream = b''.join(
-            (point.x() // self.K).to_bytes(self.block_size, 'big')
-            for point in points
+            (x // self.K).to_bytes(self.block_size, 'big')
+            for x, _ in Util.points_to_tuples(points)
         )
         
         # 处理 PKCS7 填充
@@ -157,37 +341,96 @@ class ECC:
             raise ValueError("填充无效")
         return bytes_stream[:-pad_len].decode('utf-8')
 
-    def ecc_encrypt(self, plaintext: str, public_key: tuple) -> str:
+    def integer_encode(self, value: Union[int, str]) -> list:
+        """
+        将小于基点阶的整数（如秘密份额）直接编码为椭圆曲线点列表，无需 UTF-8 编码与填充
+        :param value: 整数，或其十六进制字符串（允许空格分隔）
+        :return: 编码后的点列表（共 int_limbs 个点）
+        """
+        if isinstance(value, str):
+            value = int(value.replace(' ', ''), 16)
+        if not 0 <= value < self.G.order():
+            raise ValueError("整数编码失败：数值超出基点阶范围")
+
+        mask = (1 << self.int_limb_bits) - 1
+        return [self.__encode_block((value >> (i * self.int_limb_bits)) & mask, 1 << self.int_k)
+                for i in reversed(range(self.int_limbs))]
+
+    def integer_decode(self, points: list) -> int:
+        """
+        将 integer_encode 生成的点列表解码为整数
+        :param points: 椭圆曲线点列表
+        :return: 解码后的整数
+        """
+        value = 0
+        for x, _ in Util.points_to_tuples(points):
+            value = (value << self.int_limb_bits) | (x >> self.int_k)
+        return value
+
+    def ecc_encrypt(self, plaintext: Union[str, int], public_key: tuple, encoding: str = 'text') -> str:
         """
         加密消息
-        :param plaintext: 明文字符串
+        :param plaintext: 明文字符串；encoding 为 'int' 时为整数或其十六进制字符串
         :param public_key: 公钥元组 (x, y)
+        :param encoding: 明文编码方式，'text'（Koblitz 文本编码）或 'int'（整数编码，适用于秘密份额）
         :return: Base64 编码的密文
         """
-        pubkey_point = Util.tuple_to_point(self.curve, public_key)
-        points = self.koblitz_encode(plaintext)
-        r = secrets.randbelow(self.G.order() - 1) + 1  # 随机数
+        return self.ecc_encrypt_batch([plaintext], [public_key], encoding)[0]
 
-        return self.__serialize_cipher({
-            'c1': Util.point_to_tuple(r * self.G),
-            'cts': [Util.point_to_tuple(p + r * pubkey_point) for p in points]
-        })
+    def ecc_encrypt_batch(self, plaintexts: list, public_keys: list, encoding: str = 'text') -> list:
+        """
+        多接收者加密：用同一个随机数 r 将各条消息分别加密给对应的公钥，r*G 只计算一次。
+        每条密文与 ecc_encrypt 的输出格式完全相同，可独立进行多层加解密
+        :param plaintexts: 明文列表
+        :param public_keys: 公钥列表，与明文一一对应且互不相同（相同公钥复用 r 会泄露明文之差）
+        :param encoding: 明文编码方式，'text' 或 'int'
+        :return: Base64 编码的密文列表
+        """
+        if len(plaintexts) != len(public_keys):
+            raise ValueError("明文与公钥数量不一致")
+        pubkey_points = [Util.tuple_to_point(self.curve, key, cached=True) for key in public_keys]
+        if len(set(Util.points_to_tuples(pubkey_points))) != len(pubkey_points):
+            raise ValueError("多接收者加密的公钥不能重复")
+        match encoding:
+            case 'text':
+                encode = self.koblitz_encode
+            case 'int':
+                encode = self.integer_encode
+            case _:
+                raise ValueError(f"不支持的明文编码方式: {encoding}")
+
+        r, rG = self.__ephemeral_pair()  # 随机数及 r*G
+        c1 = Util.point_to_tuple(rG)
+        ciphertexts = []
+        for plaintext, pubkey_point in zip(plaintexts, pubkey_points):
+            shared = r * pubkey_point   # 共享点 rP 对所有分块相同，每条消息只计算一次
+            cipher_data = {
+                'c1': c1,
+                'cts': Util.points_to_tuples([p + shared for p in encode(plaintext)])
+            }
+            if encoding != 'text':
+                cipher_data['enc'] = encoding   # 标记编码方式，多层加解密时原样保留
+            ciphertexts.append(self.__serialize_cipher(cipher_data))
+        return ciphertexts
 
     def ecc_decrypt(self, base64_cipher: str, private_key: int) -> str:
         """
         解密消息
         :param base64_cipher: Base64 编码的密文
         :param private_key: 私钥整数
-        :return: 解密后的明文
+        :return: 解密后的明文；整数编码的密文返回整数的十六进制字符串
         """
         cipher_data = self.__deserialize_cipher(base64_cipher)
+        encoding = cipher_data.pop('enc', 'text')
         if len(cipher_data.keys()) > 2:
             raise ValueError("密文层数错误")
 
         # 获取辅助点并解密
         key = next(k for k in cipher_data.keys() if k != 'cts')
-        cipher1 = Util.tuple_to_point(self.curve, cipher_data[key])
-        points = [Util.tuple_to_point(self.curve, ct) - (private_key * cipher1) for ct in cipher_data['cts']]
+        shared = private_key * Util.tuple_to_point(self.curve, cipher_data[key])
+        points = [Util.tuple_to_point(self.curve, ct) - shared for ct in cipher_data['cts']]
+        if encoding == 'int':
+            return format(self.integer_decode(points), 'X')
         return self.koblitz_decode(points)
 
     def ecc_multi_encrypt(self, base64_cipher: str, public_key: tuple) -> str:
@@ -198,19 +441,20 @@ class ECC:
         :return: 多层加密后的密文
         """
         cipher_data = self.__deserialize_cipher(base64_cipher)
-        r = secrets.randbelow(self.G.order() - 1) + 1
-        pubkey_point = Util.tuple_to_point(self.curve, public_key)
+        r, rG = self.__ephemeral_pair()
+        pubkey_point = Util.tuple_to_point(self.curve, public_key, cached=True)
 
         # 确定新的层数
         c_keys = [k for k in cipher_data if k.startswith('c') and k[1:].isdigit()]
         layer_num = max(int(k[1:]) for k in c_keys) + 1 if c_keys else 1
 
         # 添加新层加密
-        cipher_data[f'c{layer_num}'] = Util.point_to_tuple(r * self.G)
-        cipher_data['cts'] = [
-            Util.point_to_tuple(Util.tuple_to_point(self.curve, ct) + r * pubkey_point)
+        cipher_data[f'c{layer_num}'] = Util.point_to_tuple(rG)
+        shared = r * pubkey_point
+        cipher_data['cts'] = Util.points_to_tuples([
+            Util.tuple_to_point(self.curve, ct) + shared
             for ct in cipher_data['cts']
-        ]
+        ])
         return self.__serialize_cipher(cipher_data)
 
     def ecc_multi_decrypt(self, base64_cipher: str, private_key: int, blinding: str) -> str:
@@ -226,12 +470,43 @@ class ECC:
             raise KeyError(f"找不到辅助密文 {blinding}")
 
         # 解密当前层
-        cipher_point = Util.tuple_to_point(self.curve, cipher_data[blinding])
-        cipher_data['cts'] = [
-            Util.point_to_tuple(Util.tuple_to_point(self.curve, ct) - (private_key * cipher_point))
+        shared = private_key * Util.tuple_to_point(self.curve, cipher_data[blinding])
+        cipher_data['cts'] = Util.points_to_tuples([
+            Util.tuple_to_point(self.curve, ct) - shared
+            for ct in cipher_data['cts']
+        ])
+        del cipher_data[blinding]
+        return self.__serialize_cipher(cipher_data)
+
+    def reencrypt(self, base64_cipher: str, public_key: tuple, private_key: int, blinding: str) -> str:
+        """
+        一次完成转加密：为密文添加一层新公钥加密，同时移除当前私钥对应的一层，
+        等价于先 ecc_multi_encrypt 再 ecc_multi_decrypt，但只解析/序列化一次，每个密文点只做一次点加
+        :param base64_cipher: Base64 编码的多层密文
+        :param public_key: 新增层的公钥
+        :param private_key: 被移除层的私钥
+        :param blinding: 被移除层的辅助密文标识
+        :return: 转加密后的密文
+        """
+        cipher_data = self.__deserialize_cipher(base64_cipher)
+        if blinding not in cipher_data:
+            raise KeyError(f"找不到辅助密文 {blinding}")
+        r, rG = self.__ephemeral_pair()
+        pubkey_point = Util.tuple_to_point(self.curve, public_key, cached=True)
+
+        # 新层编号与先加密后解密时一致（在移除旧层之前确定）
+        c_keys = [k for k in cipher_data if k.startswith('c') and k[1:].isdigit()]
+        layer_num = max(int(k[1:]) for k in c_keys) + 1
+
+        # 合并两层的变换：delta = r * P_new - k * C_old，用一次双标量乘法求得
+        delta = Util.double_scalar_mul(r, pubkey_point, -private_key,
+                                       Util.tuple_to_point(self.curve, cipher_data[blinding]))
+        cipher_data['cts'] = Util.points_to_tuples([
+            Util.tuple_to_point(self.curve, ct) + delta
             for ct in cipher_data['cts']
-        ]
+        ])
         del cipher_data[blinding]
+        cipher_data[f'c{layer_num}'] = Util.point_to_tuple(rG)
         return self.__serialize_cipher(cipher_data)
 
 
@@ -247,6 +522,7 @@ class SM2:
         self.G = G          # 基点
         self.p = curve.p()  # 曲线模数
         self.user_id = user_id
+        self.ephemeral_source = None    # 可选的临时密钥对 (k, k*G) 来源（如预计算池），为空时现场生成
 
     def compute_sm2_za(self, public_key: tuple[int, int], user_id: Optional[str] = None) -> str:
         """计算 SM2 ZA 值"""
@@ -283,8 +559,12 @@ class SM2:
 
             # 生成签名
             while True:
-                k = secrets.randbelow(n-1) + 1  # 生成随机数 k
-                x = (k * self.G).x()            # 计算 k*G 的 x 坐标
+                if self.ephemeral_source:       # 从预计算池获取 (k, k*G)
+                    k, kG = self.ephemeral_source()
+                else:
+                    k = secrets.randbelow(n-1) + 1  # 生成随机数 k
+                    kG = k * self.G
+                x = kG.x()                      # 计算 k*G 的 x 坐标
                 r = (x + e) % n                 # 计算 r 值
                 
                 # 检查 r 值是否有效
@@ -292,7 +572,7 @@ class SM2:
                     continue
                 
                 # 计算 s 值
-                s = (arithmetic.mod_inverse((1+private_key), n) * (k-r*private_key)) % n
+                s = (arithmetic.mod_inverse((1+private_key), n, self.curve.backend()) * (k-r*private_key)) % n
                 if s != 0:  # s 值有效，结束循环
                     break
                     
@@ -315,7 +595,7 @@ class SM2:
             # 准备验证参数
             r, s = tuple(signature)
 
-            pubkey_point = Util.tuple_to_point(self.curve, tuple(public_key))
+            pubkey_point = Util.tuple_to_point(self.curve, public_key, cached=True)
             message = b''.join([ZA, message])
             n = self.G.order()
             e = Hash.digest(message, "md5", "int")
@@ -326,7 +606,7 @@ class SM2:
 
             # 计算验证值
             t = (r + s) % n
-            result_point = s * self.G + t * pubkey_point
+            result_point = Util.double_scalar_mul(s, self.G, t, pubkey_point)
             if result_point.x() is None:
                 return False
                 
@@ -340,6 +620,11 @@ class SM2:
 
 
 class Base64:
+    """Base64 编解码（基于 binascii）：保持原纯 Python 实现的容错语义"""
+    ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    # 删除合法字符（含 '='）后剩下的即为非法字符
+    _STRIP_VALID = str.maketrans('', '', ALPHABET + '=')
+
     @staticmethod
     def b64encode(data) -> str:
         """
@@ -347,90 +632,117 @@ class Base64:
         :param data: 输入数据（字节或字符串）
         :return: Base64编码字符串（字符串）
         """
-        base64EncodeChars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
         if isinstance(data, str):
             data = data.encode('utf-8')
-        encoded = []
-        for i in range(0, len(data), 3):
-            # 每次处理3个字节
-            chunk = data[i:i + 3]
-            char1 = chunk[0]
-            char2 = chunk[1] if len(chunk) > 1 else 0
-            char3 = chunk[2] if len(chunk) > 2 else 0
-
-            # 将3个字节转换为4个6位索引
-            out1 = (char1 & 0xFC) >> 2
-            out2 = ((char1 & 0x03) << 4) | ((char2 & 0xF0) >> 4)
-            out3 = ((char2 & 0x0F) << 2) | ((char3 & 0xC0) >> 6)
-            out4 = char3 & 0x3F
-
-            # 根据数据长度处理填充
-            if len(chunk) == 3:
-                encoded.extend([
-                    base64EncodeChars[out1],
-                    base64EncodeChars[out2],
-                    base64EncodeChars[out3],
-                    base64EncodeChars[out4]
-                ])
-            elif len(chunk) == 2:
-                encoded.extend([
-                    base64EncodeChars[out1],
-                    base64EncodeChars[out2],
-                    base64EncodeChars[out3],
-                    '='
-                ])
-            else:  # 1个字节
-                encoded.extend([
-                    base64EncodeChars[out1],
-                    base64EncodeChars[out2],
-                    '=',
-                    '='
-                ])
-        return ''.join(encoded)
+        return binascii.b2a_base64(data, newline=False).decode('ascii')
 
     @staticmethod
     def b64decode(ct: str) -> bytes:
         """
         将Base64字符串解码为原始字节
+        语义与原实现一致：忽略末尾填充，中间的 '=' 视为 'A'，长度余 1 时舍弃最后一个字符，非法字符抛出 ValueError
         :param ct: Base64编码字符串
         :return: 解码后的字节数据
         """
-        base64EncodeChars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
-        base64DecodeChars = {char: idx for idx, char in enumerate(base64EncodeChars)}
-        # 移除末尾填充并计算填充量
         s = ct.rstrip('=')
-        num_padding = 4 - (len(s) % 4) if len(s) % 4 != 0 else 0
-        s += 'A' * num_padding  # 填充无效字符以便统一处理
-
-        decoded = bytearray()
-        for i in range(0, len(s), 4):
-            chunk = s[i:i + 4]
-            if len(chunk) != 4:
-                raise ValueError("Invalid Base64 string length")
-
-            # 将字符转换为索引值（无效字符会抛出异常）
-            indices = []
-            for c in chunk:
-                if c == '=':
-                    indices.append(0)
-                else:
-                    try:
-                        indices.append(base64DecodeChars[c])
-                    except KeyError:
-                        raise ValueError(f"Invalid character '{c}' in Base64 string")
+        Base64._check(s)
+        return Base64._decode(s.replace('=', 'A'), final=True)
 
-            # 合并4个6位值为24位整型
-            combined = (indices[0] << 18) | (indices[1] << 12) | (indices[2] << 6) | indices[3]
+    @staticmethod
+    def _check(s: str) -> None:
+        """校验字符合法性，报告第一个非法字符"""
+        if invalid := s.translate(Base64._STRIP_VALID):
+            raise ValueError(f"Invalid character '{invalid[0]}' in Base64 string")
+
+    @staticmethod
+    def _decode(s: str, final: bool) -> bytes:
+        """解码已校验且不含 '=' 的字符串；final 为 True 时按原语义补齐末尾不完整的分组"""
+        if final:
+            match len(s) % 4:
+                case 1:
+                    s = s[:-1]  # 单个剩余字符不足一个字节，直接舍弃
+                case 2:
+                    s += '=='
+                case 3:
+                    s += '='
+        return binascii.a2b_base64(s)
+
+
+class Base64Encoder:
+    """增量 Base64 编码器：分块输入，输出与一次性 Base64.b64encode 拼接结果一致"""
+    def __init__(self):
+        self.__pending = b''
+
+    def update(self, data: Union[str, bytes]) -> str:
+        """
+        输入一块数据，返回目前可以确定的编码结果（3 字节的整数倍）
+        :param data: 数据块（字节或字符串）
+        :return: Base64 字符串片段
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        data = self.__pending + bytes(data)
+        cut = len(data) - len(data) % 3
+        self.__pending = data[cut:]
+        return Base64.b64encode(data[:cut])
+
+    def finalize(self) -> str:
+        """输出剩余数据（含填充）并重置编码器"""
+        out, self.__pending = Base64.b64encode(self.__pending), b''
+        return out
 
-            # 提取3个字节（根据实际填充量调整）
-            decoded.append((combined >> 16) & 0xFF)
-            decoded.append((combined >> 8) & 0xFF)
-            decoded.append(combined & 0xFF)
 
-        # 移除填充字节
-        if num_padding:
-            del decoded[-num_padding:]
-        return bytes(decoded)
+class Base64Decoder:
+    """增量 Base64 解码器：分块输入，输出与一次性 Base64.b64decode 整串解码结果一致"""
+    def __init__(self):
+        self.__pending = ''
+
+    def update(self, text: str) -> bytes:
+        """
+        输入一段 Base64 文本，返回目前可以确定的字节（末尾的 '=' 在后续输入到来前暂不处理）
+        :param text: Base64 文本片段
+        :return: 解码出的字节
+        """
+        Base64._check(text)
+        text = self.__pending + text
+        body = text.rstrip('=')
+        tail = text[len(body):]
+        body = body.replace('=', 'A')   # 后面还有数据的 '=' 属于中间位置
+        cut = len(body) - len(body) % 4
+        self.__pending = body[cut:] + tail
+        return Base64._decode(body[:cut], final=False)
+
+    def finalize(self) -> bytes:
+        """解码剩余文本并重置解码器"""
+        s, self.__pending = self.__pending.rstrip('='), ''
+        return Base64._decode(s, final=True)
+
+
+def _gf_mul(a: int, b: int) -> int:
+    """GF(2^8) 上的乘法（模 x^8 + x^4 + x^3 + x + 1）"""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = (a << 1) ^ (0x11B if a & 0x80 else 0)
+        b >>= 1
+    return result
+
+
+def _aes_t_tables(box: tuple, matrix: tuple) -> tuple:
+    """
+    生成 AES 的 4 张 32 位 T 表：T0[x] 为 S 盒输出与列混合矩阵第 0 列相乘得到的一列，T1~T3 依次循环右移 8 位
+    :param box: S 盒（加密）或逆 S 盒（解密）
+    :param matrix: 列混合矩阵或逆列混合矩阵
+    :return: (T0, T1, T2, T3)
+    """
+    flat = [v for row in box for v in row]
+    t0 = tuple((_gf_mul(flat[x], matrix[0][0]) << 24) | (_gf_mul(flat[x], matrix[1][0]) << 16) |
+               (_gf_mul(flat[x], matrix[2][0]) << 8) | _gf_mul(flat[x], matrix[3][0]) for x in range(256))
+    t1 = tuple(((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in t0)
+    t2 = tuple(((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in t1)
+    t3 = tuple(((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in t2)
+    return t0, t1, t2, t3
 
 
 class AES:
@@ -509,6 +821,15 @@ class AES:
         [0x17, 0x2B, 0x04, 0x7E, 0xBA, 0x77, 0xD6, 0x26, 0xE1, 0x69, 0x14, 0x63, 0x55, 0x21, 0x0C, 0x7D]
     ])
 
+    # 一维 S 盒 / 逆 S 盒，以及合并了字节替换、行移位、列混合的 T 表（每轮每列 4 次查表 + 异或）
+    SBOX_FLAT = tuple(v for row in S_BOX for v in row)
+    I_SBOX_FLAT = tuple(v for row in I_SBOX for v in row)
+    TE = _aes_t_tables(S_BOX, MIX_C)
+    TD = _aes_t_tables(I_SBOX, I_MIXC)
+
+    # 输入达到该字节数且各块可独立处理（ECB、CTR、CBC 解密）时使用 NumPy 向量化实现，设为 None 则始终逐块处理
+    NUMPY_MIN_BYTES = 1024
+
     def __init__(self, mode='ECB', iv=None, padding_type='PKCS7Padding'):
         """
         初始化 AES 加密器
@@ -521,16 +842,18 @@ class AES:
         self.padding_type = padding_type    # 填充方式
 
     # ------------------------- 辅助方法 -------------------------
-    def __16bytes_xor(self, a, b):
-        """对两个16字节数据进行按位异或操作"""
-        return [a[i] ^ b[i] for i in range(16)]
-
     def __iv_hex_to_bytes(self, hex_str):
         """将IV（初始化向量）的十六进制字符串转换为字节列表"""
         if len(hex_str) != 32:
             raise ValueError("IV必须为16字节（32个十六进制字符）。")
         return [int(hex_str[i:i + 2], AES.BLOCK_SIZE) for i in range(0, len(hex_str), 2)]
 
+    @staticmethod
+    def __xor_block(block: bytes, output: int) -> bytes:
+        """CFB、OFB、CTR模式需要将AES的输出与明文进行异或（末块不足16字节时只取输出的前若干字节）"""
+        n = len(block)
+        return (int.from_bytes(block, 'big') ^ (output >> (AES.BLOCK_SIZE - n) * 8)).to_bytes(n, 'big')
+
     # ------------------------- 填充方法 -------------------------
     def __pad(self, byte_list):
         """对数据进行填充，支持多种填充方式"""
@@ -554,138 +877,207 @@ class AES:
             return byte_list[:-padding_size]
         return byte_list
 
-    # ------------------------- 分组方法 -------------------------
-    def __xor_block(self, block, output):
-        """CFB、OFB、CTR模式需要将AES的输出与明文进行异或"""
-        return [b ^ o for b, o in zip(block, output)]
-
-    def __increment_counter(self, counter):
-        """增加计数器（用于CTR模式）"""
-        counter_int = int.from_bytes(counter, 'big') + 1
-        return counter_int.to_bytes(AES.BLOCK_SIZE, 'big')
-
-    # ------------------------- AES核心操作 -------------------------
-    def __mul(self, poly1, poly2):
-        """多项式相乘"""
-        result = 0
-        for index in range(poly2.bit_length()):
-            if poly2 & 1 << index:
-                result ^= poly1 << index
-        return result
-
-    def __mod(self, poly, mod=0b100011011):
-        """poly模多项式mod"""
-        while poly.bit_length() > 8:
-            poly ^= mod << poly.bit_length() - 9
-        return poly
-
-    def __sub_bytes(self, State):
-        """字节替换操作（__sub_bytes）"""
-        return [self.S_BOX[i >> 4][i & 0xF] for i in State]
-
-    def __sub_bytes_inv(self, State):
-        """逆字节替换操作（__sub_bytes）"""
-        return [self.I_SBOX[i >> 4][i & 0xF] for i in State]
-
-    def __shift_rows(self, S):
-        """行位移操作（__shift_rows）"""
-        return [S[0], S[5], S[10], S[15], S[4], S[9], S[14], S[3],
-                S[8], S[13], S[2], S[7], S[12], S[1], S[6], S[11]]
-
-    def __shift_rows_inv(self, S):
-        """逆行位移操作（__shift_rows）"""
-        return [S[0], S[13], S[10], S[7], S[4], S[1], S[14], S[11],
-                S[8], S[5], S[2], S[15], S[12], S[9], S[6], S[3]]
-
-    def __mix_columns(self, State):
-        """列混合操作（__mix_columns）"""
-        return self.__matrix_mul(self.MIX_C, State)
-
-    def __mix_columns_inv(self, State):
-        """逆列混合操作（__mix_columns）"""
-        return self.__matrix_mul(self.I_MIXC, State)
-
-    def __matrix_mul(self, M1, M2):
-        """矩阵乘法（用于列混合）"""
-        M = [0] * AES.BLOCK_SIZE
-        for row in range(4):
-            for col in range(4):
-                for Round in range(4):
-                    M[row + col * 4] ^= self.__mul(M1[row][Round], M2[Round + col * 4])
-                M[row + col * 4] = self.__mod(M[row + col * 4])
-        return M
-
-    def __add_round_key(self, State, RoundKeys, index):
-        """轮密钥加法操作"""
-        return self.__16bytes_xor(State, RoundKeys[index])
-
-    def __sub_word(self, _4byte_block):
-        """4字节块的字节替换，用于密钥扩展"""
-        result = 0
-        for position in range(4):
-            i = _4byte_block >> position * 8 + 4 & 0xf
-            j = _4byte_block >> position * 8 & 0xf
-            result ^= self.S_BOX[i][j] << position * 8
-        return result
-
-    def __rot_word(self, _4byte_block):
-        """轮密钥扩展中的字移位操作"""
-        return ((_4byte_block & 0xffffff) << 8) + (_4byte_block >> 24)
-
-    def __round_key_generator(self, key):
-        """生成AES的轮密钥"""
-        w = [key >> 96, key >> 64 & 0xFFFFFFFF, key >> 32 & 0xFFFFFFFF, key & 0xFFFFFFFF] + [0] * 40
+    # ------------------------- 密钥扩展 -------------------------
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _key_schedule(key: int) -> tuple:
+        """
+        生成 AES-128 的加密/解密轮密钥（各 44 个 32 位字），按密钥缓存，重复使用同一密钥时不再重新扩展。
+        解密轮密钥按轮逆序排列，且第 1~9 轮已做逆列混合，供等价逆密码的 T 表解密使用
+        :param key: 128 位密钥整数
+        :return: (加密轮密钥字, 解密轮密钥字)
+        """
+        if key >> 128:
+            raise OverflowError("int too big to convert")
+        sbox, (td0, td1, td2, td3) = AES.SBOX_FLAT, AES.TD
+
+        # 密钥扩展
+        w = [key >> 96, key >> 64 & 0xFFFFFFFF, key >> 32 & 0xFFFFFFFF, key & 0xFFFFFFFF]
         for i in range(4, 44):
             temp = w[i - 1]
             if i % 4 == 0:
-                temp = self.__sub_word(self.__rot_word(temp)) ^ self.RCON[i // 4 - 1]
-            w[i] = w[i - 4] ^ temp
-        return [sum([w[4 * i] << 96, w[4 * i + 1] << 64, w[4 * i + 2] << 32, w[4 * i + 3]]).to_bytes(AES.BLOCK_SIZE, byteorder='big') for i in range(11)]
+                temp = ((temp & 0xFFFFFF) << 8) | (temp >> 24)      # 字移位
+                temp = ((sbox[temp >> 24] << 24) | (sbox[temp >> 16 & 0xFF] << 16) |
+                        (sbox[temp >> 8 & 0xFF] << 8) | sbox[temp & 0xFF]) ^ AES.RCON[i // 4 - 1]
+            w.append(w[i - 4] ^ temp)
+
+        # 等价逆密码的轮密钥：InvMixColumns(w) = TD[S[w]]（逆 S 盒与 S 盒相互抵消）
+        dw = []
+        for rnd in range(10, -1, -1):
+            for word in w[4 * rnd:4 * rnd + 4]:
+                if 0 < rnd < 10:
+                    word = (td0[sbox[word >> 24]] ^ td1[sbox[word >> 16 & 0xFF]] ^
+                            td2[sbox[word >> 8 & 0xFF]] ^ td3[sbox[word & 0xFF]])
+                dw.append(word)
+        return tuple(w), tuple(dw)
 
     # ------------------------- 数据块加解密 -------------------------
-    def __aes_encrypt_block(self, block, RoundKeys):
+    @staticmethod
+    def __aes_encrypt_block(block: int, rk: tuple) -> int:
         """
-        AES 单个数据块加密
-        :param block: 16字节明文块
-        :param RoundKeys: 轮密钥列表
-        :return: 16字节密文块
+        AES 单个数据块加密（T 表实现）
+        :param block: 128 位明文块整数
+        :param rk: 加密轮密钥字
+        :return: 128 位密文块整数
         """
+        te0, te1, te2, te3 = AES.TE
+        sbox = AES.SBOX_FLAT
         # 初始轮密钥加
-        State = self.__add_round_key(block, RoundKeys, 0)
-        
-        # 9轮标准变换
-        for Round in range(1, 10):
-            State = self.__sub_bytes(State)      # 字节替换：通过S盒替换每个字节
-            State = self.__shift_rows(State)     # 行移位：循环移动状态矩阵的行
-            State = self.__mix_columns(State)    # 列混合：通过矩阵乘法混淆每列
-            State = self.__add_round_key(State, RoundKeys, Round)  # 轮密钥加
-        
+        s0 = (block >> 96) ^ rk[0]
+        s1 = (block >> 64 & 0xFFFFFFFF) ^ rk[1]
+        s2 = (block >> 32 & 0xFFFFFFFF) ^ rk[2]
+        s3 = (block & 0xFFFFFFFF) ^ rk[3]
+
+        # 9轮标准变换：字节替换、行移位、列混合合并为查表
+        for k in range(4, 40, 4):
+            s0, s1, s2, s3 = (
+                te0[s0 >> 24] ^ te1[s1 >> 16 & 0xFF] ^ te2[s2 >> 8 & 0xFF] ^ te3[s3 & 0xFF] ^ rk[k],
+                te0[s1 >> 24] ^ te1[s2 >> 16 & 0xFF] ^ te2[s3 >> 8 & 0xFF] ^ te3[s0 & 0xFF] ^ rk[k + 1],
+                te0[s2 >> 24] ^ te1[s3 >> 16 & 0xFF] ^ te2[s0 >> 8 & 0xFF] ^ te3[s1 & 0xFF] ^ rk[k + 2],
+                te0[s3 >> 24] ^ te1[s0 >> 16 & 0xFF] ^ te2[s1 >> 8 & 0xFF] ^ te3[s2 & 0xFF] ^ rk[k + 3],
+            )
+
         # 最后一轮变换（无列混合）
-        State = self.__sub_bytes(State)          # 字节替换
-        State = self.__shift_rows(State)         # 行移位
-        return self.__add_round_key(State, RoundKeys, 10)  # 最后轮密钥加
+        return ((((sbox[s0 >> 24] << 24) | (sbox[s1 >> 16 & 0xFF] << 16) | (sbox[s2 >> 8 & 0xFF] << 8) | sbox[s3 & 0xFF]) ^ rk[40]) << 96 |
+                (((sbox[s1 >> 24] << 24) | (sbox[s2 >> 16 & 0xFF] << 16) | (sbox[s3 >> 8 & 0xFF] << 8) | sbox[s0 & 0xFF]) ^ rk[41]) << 64 |
+                (((sbox[s2 >> 24] << 24) | (sbox[s3 >> 16 & 0xFF] << 16) | (sbox[s0 >> 8 & 0xFF] << 8) | sbox[s1 & 0xFF]) ^ rk[42]) << 32 |
+                (((sbox[s3 >> 24] << 24) | (sbox[s0 >> 16 & 0xFF] << 16) | (sbox[s1 >> 8 & 0xFF] << 8) | sbox[s2 & 0xFF]) ^ rk[43]))
 
-    def __aes_decrypt_block(self, block, RoundKeys):
+    @staticmethod
+    def __aes_decrypt_block(block: int, rk: tuple) -> int:
         """
-        AES 单个数据块解密
-        :param block: 16字节密文块
-        :param RoundKeys: 轮密钥列表
-        :return: 16字节明文块
+        AES 单个数据块解密（等价逆密码的 T 表实现）
+        :param block: 128 位密文块整数
+        :param rk: 解密轮密钥字
+        :return: 128 位明文块整数
         """
+        td0, td1, td2, td3 = AES.TD
+        ibox = AES.I_SBOX_FLAT
         # 初始轮密钥加（使用最后一轮密钥）
-        State = self.__add_round_key(block, RoundKeys, 10)
-        
-        # 9轮逆向变换
-        for Round in range(1, 10):
-            State = self.__shift_rows_inv(State)     # 逆行移位
-            State = self.__sub_bytes_inv(State)      # 逆字节替换
-            State = self.__add_round_key(State, RoundKeys, 10 - Round)  # 轮密钥加
-            State = self.__mix_columns_inv(State)    # 逆列混合
-        
+        s0 = (block >> 96) ^ rk[0]
+        s1 = (block >> 64 & 0xFFFFFFFF) ^ rk[1]
+        s2 = (block >> 32 & 0xFFFFFFFF) ^ rk[2]
+        s3 = (block & 0xFFFFFFFF) ^ rk[3]
+
+        # 9轮逆向变换：逆行移位、逆字节替换、逆列混合合并为查表
+        for k in range(4, 40, 4):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[s3 >> 16 & 0xFF] ^ td2[s2 >> 8 & 0xFF] ^ td3[s1 & 0xFF] ^ rk[k],
+                td0[s1 >> 24] ^ td1[s0 >> 16 & 0xFF] ^ td2[s3 >> 8 & 0xFF] ^ td3[s2 & 0xFF] ^ rk[k + 1],
+                td0[s2 >> 24] ^ td1[s1 >> 16 & 0xFF] ^ td2[s0 >> 8 & 0xFF] ^ td3[s3 & 0xFF] ^ rk[k + 2],
+                td0[s3 >> 24] ^ td1[s2 >> 16 & 0xFF] ^ td2[s1 >> 8 & 0xFF] ^ td3[s0 & 0xFF] ^ rk[k + 3],
+            )
+
         # 最后一轮逆向变换（无列混合）
-        State = self.__shift_rows_inv(State)         # 逆行移位
-        State = self.__sub_bytes_inv(State)          # 逆字节替换
-        return self.__add_round_key(State, RoundKeys, 0)  # 最后轮密钥加
+        return ((((ibox[s0 >> 24] << 24) | (ibox[s3 >> 16 & 0xFF] << 16) | (ibox[s2 >> 8 & 0xFF] << 8) | ibox[s1 & 0xFF]) ^ rk[40]) << 96 |
+                (((ibox[s1 >> 24] << 24) | (ibox[s0 >> 16 & 0xFF] << 16) | (ibox[s3 >> 8 & 0xFF] << 8) | ibox[s2 & 0xFF]) ^ rk[41]) << 64 |
+                (((ibox[s2 >> 24] << 24) | (ibox[s1 >> 16 & 0xFF] << 16) | (ibox[s0 >> 8 & 0xFF] << 8) | ibox[s3 & 0xFF]) ^ rk[42]) << 32 |
+                (((ibox[s3 >> 24] << 24) | (ibox[s2 >> 16 & 0xFF] << 16) | (ibox[s1 >> 8 & 0xFF] << 8) | ibox[s0 & 0xFF]) ^ rk[43]))
+
+    # ------------------------- NumPy 向量化实现 -------------------------
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _np_tables() -> dict:
+        """构建向量化实现所需的 uint8 查找表与行移位下标（状态第 i 字节位于第 i % 4 行、第 i // 4 列）"""
+        def table(factor):
+            return np.array([_gf_mul(x, factor) for x in range(256)], dtype=np.uint8)
+        return {
+            'sbox': np.array(AES.SBOX_FLAT, dtype=np.uint8),
+            'ibox': np.array(AES.I_SBOX_FLAT, dtype=np.uint8),
+            'mul2': table(2),
+            'mul4': table(4),
+            'shift': np.array([r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)]),
+            'ishift': np.array([r + 4 * ((c - r) % 4) for c in range(4) for r in range(4)]),
+        }
+
+    @staticmethod
+    def _np_mix_columns(state, mul2):
+        """
+        对所有块同时进行列混合：b[r] = a[r] ^ t ^ 2·(a[r] ^ a[r+1])，t 为整列的异或
+        :param state: (n, 16) 的 uint8 状态矩阵
+        :param mul2: GF(2^8) 乘 2 查找表
+        :return: 列混合后的状态矩阵
+        """
+        col = state.reshape(-1, 4, 4)
+        t = np.bitwise_xor.reduce(col, axis=2, keepdims=True)
+        return (col ^ t ^ mul2[col ^ np.roll(col, -1, axis=2)]).reshape(-1, 16)
+
+    @staticmethod
+    def _np_encrypt_blocks(state, RoundKeys: tuple):
+        """
+        向量化加密多个数据块
+        :param state: (n, 16) 的 uint8 明文块矩阵
+        :param RoundKeys: 加密轮密钥字
+        :return: (n, 16) 的 uint8 密文块矩阵
+        """
+        t = AES._np_tables()
+        sbox, shift, mul2 = t['sbox'], t['shift'], t['mul2']
+        keys = np.frombuffer(b''.join(w.to_bytes(4, 'big') for w in RoundKeys), dtype=np.uint8).reshape(11, 16)
+
+        state = state ^ keys[0]
+        for rnd in range(1, 10):
+            state = sbox[state[:, shift]]                   # 行移位 + 字节替换
+            state = AES._np_mix_columns(state, mul2)        # 列混合
+            state ^= keys[rnd]                              # 轮密钥加
+        return sbox[state[:, shift]] ^ keys[10]
+
+    @staticmethod
+    def _np_decrypt_blocks(state, RoundKeys: tuple):
+        """
+        向量化解密多个数据块（标准逆密码，直接使用加密轮密钥）
+        :param state: (n, 16) 的 uint8 密文块矩阵
+        :param RoundKeys: 加密轮密钥字
+        :return: (n, 16) 的 uint8 明文块矩阵
+        """
+        t = AES._np_tables()
+        ibox, ishift, mul2, mul4 = t['ibox'], t['ishift'], t['mul2'], t['mul4']
+        keys = np.frombuffer(b''.join(w.to_bytes(4, 'big') for w in RoundKeys), dtype=np.uint8).reshape(11, 16)
+
+        state = state ^ keys[10]
+        for rnd in range(9, 0, -1):
+            state = ibox[state[:, ishift]] ^ keys[rnd]      # 逆行移位 + 逆字节替换 + 轮密钥加
+            # 逆列混合 = 先令 a[r] ^= 4·(a[r] ^ a[r+2])，再做一次列混合
+            col = state.reshape(-1, 4, 4)
+            col = col ^ mul4[col ^ np.roll(col, -2, axis=2)]
+            state = AES._np_mix_columns(col.reshape(-1, 16), mul2)
+        return ibox[state[:, ishift]] ^ keys[0]
+
+    def __use_numpy(self, size: int, decrypt: bool) -> bool:
+        """判断本次加解密是否走向量化实现：NumPy 可用、输入足够大，且各数据块可以相互独立地处理"""
+        if np is None or AES.NUMPY_MIN_BYTES is None or not size or size < AES.NUMPY_MIN_BYTES:
+            return False
+        if self.mode == 'CTR':
+            return True
+        return size % AES.BLOCK_SIZE == 0 and (self.mode == 'ECB' or (decrypt and self.mode == 'CBC'))
+
+    def __np_crypt(self, data: bytes, RoundKeys: tuple, decrypt: bool) -> bytes:
+        """
+        向量化处理 ECB、CTR 以及 CBC 解密
+        :param data: 已填充的明文或密文
+        :param RoundKeys: 加密轮密钥字
+        :param decrypt: 是否为解密
+        :return: 处理结果
+        """
+        if self.mode == 'CTR':
+            # 一次生成全部计数器块（128 位计数器拆为高低两个 64 位整数进位相加），加密得到密钥流后与数据异或
+            n = -(-len(data) // AES.BLOCK_SIZE)
+            iv = int.from_bytes(bytes(self.__iv_hex_to_bytes(self.iv)), 'big')
+            low = np.uint64(iv & 0xFFFFFFFFFFFFFFFF) + np.arange(n, dtype=np.uint64)
+            high = np.uint64(iv >> 64) + (low < np.uint64(iv & 0xFFFFFFFFFFFFFFFF)).astype(np.uint64)
+            counters = np.stack([high, low], axis=1).astype('>u8').view(np.uint8)
+            stream = self._np_encrypt_blocks(counters, RoundKeys).reshape(-1)[:len(data)]
+            return (np.frombuffer(data, dtype=np.uint8) ^ stream).tobytes()
+
+        blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, AES.BLOCK_SIZE)
+        if not decrypt:
+            return self._np_encrypt_blocks(blocks, RoundKeys).tobytes()
+
+        result = self._np_decrypt_blocks(blocks, RoundKeys)
+        if self.mode == 'CBC':
+            # CBC 解密：每块明文 = 解密结果 ^ 前一密文块（首块为 IV）
+            result[0] ^= np.array(self.__iv_hex_to_bytes(self.iv), dtype=np.uint8)
+            result[1:] ^= blocks[:-1]
+        return result.tobytes()
 
     # ------------------------- 加解密主函数 -------------------------
     def aes_encrypt(self, plaintext, hex_key: str) -> str:
@@ -696,8 +1088,9 @@ class AES:
         :return: Base64编码的密文
         """
         # 初始化
-        ciphertext = []
-        RoundKeys = self.__round_key_generator(int(hex_key, 16))
+        ciphertext = bytearray()
+        RoundKeys, _ = AES._key_schedule(int(hex_key, 16))
+        encrypt_block = self.__aes_encrypt_block
 
         # 处理输入数据
         try:
@@ -706,51 +1099,46 @@ class AES:
             raise TypeError('明文必须是str或bytes类型')
 
         # 填充处理
-        plaintext = self.__pad(pt_bytes)
+        plaintext = bytes(self.__pad(pt_bytes))
 
         # 检查IV
         if self.mode in ['CFB', 'OFB', 'CTR'] and not self.iv:
             raise ValueError(f"{self.mode}模式需要IV")
 
-        # 获取初始向量
-        prev_block = (self.__iv_hex_to_bytes(self.iv) if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
+        # 大输入整体向量化加密
+        if self.__use_numpy(len(plaintext), decrypt=False):
+            return Base64.b64encode(self.__np_crypt(plaintext, RoundKeys, decrypt=False))
+
+        # 获取初始向量（以 128 位整数表示）
+        prev_block = (int.from_bytes(bytes(self.__iv_hex_to_bytes(self.iv)), 'big')
+                      if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
 
         # 分块加密
-        cipher_block = ''
         for i in range(0, len(plaintext), AES.BLOCK_SIZE):
             block = plaintext[i:i + AES.BLOCK_SIZE]
 
             if self.mode == 'ECB':
                 # ECB模式：直接加密
-                ciphertext.extend(self.__aes_encrypt_block(block, RoundKeys))
+                ciphertext += encrypt_block(int.from_bytes(block, 'big'), RoundKeys).to_bytes(16, 'big')
 
             elif self.mode == 'CBC':
                 # CBC模式：先异或后加密
-                block_xored = self.__16bytes_xor(block, prev_block)
-                block_encrypted = self.__aes_encrypt_block(block_xored, RoundKeys)
-                ciphertext.extend(block_encrypted)
-                prev_block = block_encrypted
+                prev_block = encrypt_block(int.from_bytes(block, 'big') ^ prev_block, RoundKeys)
+                ciphertext += prev_block.to_bytes(16, 'big')
 
             else:  # CFB/OFB/CTR 模式
+                output = encrypt_block(prev_block, RoundKeys)
+                cipher_block = self.__xor_block(block, output)
                 if self.mode == 'CFB':
                     # CFB模式：加密前一密文块后与明文异或
-                    output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                    cipher_block = self.__xor_block(block, output)
-                    prev_block = cipher_block
-
+                    prev_block = int.from_bytes(cipher_block, 'big')
                 elif self.mode == 'OFB':
                     # OFB模式：加密前一输出后与明文异或
-                    output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                    cipher_block = self.__xor_block(block, output)
                     prev_block = output
-
                 elif self.mode == 'CTR':
                     # CTR模式：加密计数器后与明文异或
-                    output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                    cipher_block = self.__xor_block(block, output)
-                    prev_block = self.__increment_counter(prev_block)
-
-                ciphertext.extend(cipher_block)
+                    prev_block = (prev_block + 1) & ((1 << 128) - 1)
+                ciphertext += cipher_block
 
         return Base64.b64encode(bytes(ciphertext))
 
@@ -762,16 +1150,24 @@ class AES:
         :return: Base64编码的明文
         """
         # 初始化
-        plaintext = []
-        ciphertext = list(Base64.b64decode(ciphertext))
-        RoundKeys = self.__round_key_generator(int(hex_key, 16))
+        plaintext = bytearray()
+        ciphertext = Base64.b64decode(ciphertext)
+        RoundKeys, InvRoundKeys = AES._key_schedule(int(hex_key, 16))
+        encrypt_block, decrypt_block = self.__aes_encrypt_block, self.__aes_decrypt_block
 
         # 检查IV
         if self.mode in ['CFB', 'OFB', 'CTR'] and not self.iv:
             raise ValueError(f"{self.mode}模式需要IV")
+        if self.mode in ['ECB', 'CBC'] and len(ciphertext) % AES.BLOCK_SIZE:
+            raise ValueError(f"{self.mode}模式的密文长度必须是{AES.BLOCK_SIZE}字节的整数倍")
+
+        # 大输入整体向量化解密
+        if self.__use_numpy(len(ciphertext), decrypt=True):
+            return bytes(self.__unpad(self.__np_crypt(ciphertext, RoundKeys, decrypt=True)))
 
-        # 获取初始向量
-        prev_block = (self.__iv_hex_to_bytes(self.iv) if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
+        # 获取初始向量（以 128 位整数表示）
+        prev_block = (int.from_bytes(bytes(self.__iv_hex_to_bytes(self.iv)), 'big')
+                      if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] else None)
 
         # 分块解密
         for i in range(0, len(ciphertext), AES.BLOCK_SIZE):
@@ -779,47 +1175,69 @@ class AES:
 
             if self.mode == 'ECB':
                 # ECB模式：直接解密
-                plaintext.extend(self.__aes_decrypt_block(block, RoundKeys))
+                plaintext += decrypt_block(int.from_bytes(block, 'big'), InvRoundKeys).to_bytes(16, 'big')
 
             elif self.mode == 'CBC':
                 # CBC模式：先解密后异或
-                block_decrypted = self.__aes_decrypt_block(block, RoundKeys)
-                plaintext.extend(self.__16bytes_xor(block_decrypted, prev_block))
-                prev_block = block
+                block_int = int.from_bytes(block, 'big')
+                plaintext += (decrypt_block(block_int, InvRoundKeys) ^ prev_block).to_bytes(16, 'big')
+                prev_block = block_int
 
             elif self.mode == 'CFB':
                 # CFB模式：加密前一密文块后与当前密文异或
-                output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                plaintext.extend(self.__xor_block(block, output))
-                prev_block = block
+                plaintext += self.__xor_block(block, encrypt_block(prev_block, RoundKeys))
+                prev_block = int.from_bytes(block, 'big')
 
             elif self.mode == 'OFB':
                 # OFB模式：加密前一输出后与密文异或
-                output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                plaintext.append(self.__xor_block(block, output))
-                prev_block = output
+                # （原实现把异或结果 append 进字节数组，OFB 解密总是抛出 TypeError；此处按字节拼接，解密恢复可用）
+                prev_block = encrypt_block(prev_block, RoundKeys)
+                plaintext += self.__xor_block(block, prev_block)
 
             elif self.mode == 'CTR':
                 # CTR模式：加密计数器后与密文异或
-                output = self.__aes_encrypt_block(prev_block, RoundKeys)
-                plaintext.extend(self.__xor_block(block, output))
-                prev_block = self.__increment_counter(prev_block)
+                plaintext += self.__xor_block(block, encrypt_block(prev_block, RoundKeys))
+                prev_block = (prev_block + 1) & ((1 << 128) - 1)
 
         # 去除填充并返回
         return bytes(self.__unpad(plaintext))
 
 
 class FASTAES:
-    def __init__(self, mode='ECB', iv=None, padding_type='PKCS7'):
+    # 分块流式密文格式：文件头 + 若干分块记录（记录头 + IV + 分块密文）。每块使用独立的随机 IV，
+    # 只有末块做填充并带结束标记，因此截断的密文会被发现
+    STREAM_MAGIC = b'FAES'
+    STREAM_VERSION = 1
+    STREAM_HEADER = struct.Struct('>4sBBI')     # 魔数、版本号、工作模式编号、明文分块大小
+    CHUNK_HEADER = struct.Struct('>BI')         # 标志位（bit0 表示末块）、分块密文长度
+    CHUNK_FINAL = 0x01
+    STREAM_MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR')
+    DEFAULT_CHUNK_SIZE = 1 << 20
+
+    # 可随机访问的分块认证加密格式（AES-GCM）：文件头 + 各分块认证标签组成的索引表 + 与明文等长的密文区。
+    # 明文第 j 字节即密文区第 j 字节，解密任意区间时只需读取并验证其涉及的分块；
+    # 分块 i 的 nonce 为 nonce 前缀 || i，文件头作为附加认证数据，分块被替换、调换或截断都会验证失败
+    AEAD_MAGIC = b'FAGC'
+    AEAD_VERSION = 1
+    AEAD_HEADER = struct.Struct('>4sBI8sQ')     # 魔数、版本号、明文分块大小、nonce 前缀、明文总长度
+    AEAD_TAG_SIZE = 16
+    DEFAULT_AEAD_CHUNK_SIZE = 64 * 1024
+
+    # 多线程并行时 CTR 每段的最小长度（pycryptodome 加解密时释放 GIL，各段可在线程池中同时处理）
+    PARALLEL_MIN_SEGMENT = 1 << 20
+
+    def __init__(self, mode='ECB', iv=None, padding_type='PKCS7', workers: int = 1):
         """
         初始化 AES 加密器
         :param mode: 加密模式，支持 ECB/CBC/CFB/OFB/CTR
-        :param iv: 初始化向量，CBC/CFB/OFB/CTR 模式需要
+        :param iv: 初始化向量，CBC/CFB/OFB/CTR 模式需要（CTR 模式作为 128 位计数器初值）
         :param padding_type: 填充方式，支持 Zero/PKCS7/ISO10126
+        :param workers: 并行线程数，用于 CTR 分段、分块流式加密与分块认证加密
         """
         self.mode_str = mode.upper()
         self.iv = iv[:16] if isinstance(iv, bytes) else iv[:16].encode('utf-8')
         self.padding_type = padding_type.upper()
+        self.workers = max(1, int(workers))
 
         self.mode_map = {
             'ECB': fastaes.MODE_ECB,
@@ -852,12 +1270,65 @@ class FASTAES:
         else:
             raise ValueError(f"不支持的填充类型: {self.padding_type}")
 
-    def aes_encrypt(self, plaintext: bytes, hex_key: str) -> str:
+    @staticmethod
+    def _key_bytes(hex_key: str) -> bytes:
+        """将十六进制密钥字符串（可带 0x 前缀）转换为密钥字节"""
+        return bytes.fromhex(hex_key[2:] if hex_key.startswith('0x') else hex_key)
+
+    @staticmethod
+    def _executor(workers: int):
+        """
+        为一次分块流式处理创建线程池，在所有批次间复用（线程数为 1 时不创建）
+        :param workers: 并行线程数
+        :return: 线程池上下文；线程数为 1 时上下文的值为 None
+        """
+        return ThreadPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext()
+
+    def _parallel_map(self, func, items: list, workers: Optional[int] = None,
+                      pool: Optional[ThreadPoolExecutor] = None) -> list:
+        """
+        在线程池中并行执行 func（线程数为 1 或只有一项时直接顺序执行）
+        :param pool: 调用方持有的线程池，指定时直接复用，否则按 workers 临时创建
+        """
+        if pool is not None and len(items) > 1:
+            return list(pool.map(func, items))
+        workers = min(workers or self.workers, len(items))
+        if pool is not None or workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+
+    def _ctr_crypt(self, key: bytes, data: bytes, workers: Optional[int] = None) -> bytes:
         """
-        加密并返回 base64 编码的密文字符串
+        CTR 模式加解密：数据按块边界切分为若干段，第 k 段的计数器初值为 IV + 段起始块号，各段并行处理
+        :param key: 密钥
+        :param data: 明文或密文
+        :param workers: 并行线程数，不指定则使用实例配置
+        :return: 处理结果
         """
-        key = hex_key[2:] if hex_key.startswith('0x') else hex_key
-        key = bytes.fromhex(key)
+        if len(self.iv) != 16:
+            raise ValueError("CTR 模式需要 16 字节的 iv")
+        counter = int.from_bytes(self.iv, 'big')
+        workers = workers or self.workers
+        segment = max(-(-len(data) // workers), self.PARALLEL_MIN_SEGMENT)
+        segment += -segment % 16
+
+        src, out = memoryview(data), bytearray(len(data))
+        dst = memoryview(out)
+
+        def work(offset: int) -> None:
+            cipher = fastaes.new(key, fastaes.MODE_CTR, nonce=b'',
+                                 initial_value=(counter + offset // 16) & ((1 << 128) - 1))
+            cipher.encrypt(src[offset:offset + segment], output=dst[offset:offset + segment])
+
+        self._parallel_map(work, list(range(0, len(data), segment)), workers)
+        return bytes(out)
+
+    def aes_encrypt(self, plaintext: bytes, hex_key: str, workers: Optional[int] = None) -> str:
+        """
+        加密并返回 base64 编码的密文字符串（CTR 模式可多线程并行）
+        """
+        key = self._key_bytes(hex_key)
         mode = self.mode_map[self.mode_str]
 
         if mode == fastaes.MODE_ECB:
@@ -867,7 +1338,7 @@ class FASTAES:
                 raise ValueError(f"{self.mode_str} 模式需要 iv")
             cipher = fastaes.new(key, mode, iv=self.iv)
         elif mode == fastaes.MODE_CTR:
-            cipher = fastaes.new(key, mode)
+            return base64.b64encode(self._ctr_crypt(key, self._pad(plaintext), workers)).decode('utf-8')
         else:
             raise ValueError("不支持的模式")
 
@@ -875,15 +1346,24 @@ class FASTAES:
         encrypted_bytes = cipher.encrypt(padded_data)
         return base64.b64encode(encrypted_bytes).decode('utf-8')  # 返回 base64 字符串
 
-    def aes_decrypt(self, b64_ciphertext: str, hex_key: str) -> bytes:
+    def aes_decrypt(self, b64_ciphertext: str, hex_key: str, workers: Optional[int] = None) -> bytes:
         """
-        解密 base64 密文并返回原始明文
+        解密 base64 密文并返回原始明文（CTR 模式可多线程并行）
         """
-        key = hex_key[2:] if hex_key.startswith('0x') else hex_key
-        key = bytes.fromhex(key)
+        return self.decrypt_bytes(base64.b64decode(b64_ciphertext), hex_key, workers)
+
+    def decrypt_bytes(self, ciphertext: bytes, hex_key: str, workers: Optional[int] = None) -> bytes:
+        """
+        解密已解码的原始密文字节并返回明文，调用方已持有 base64 解码结果时避免重复解码
+        """
+        key = self._key_bytes(hex_key)
         mode = self.mode_map[self.mode_str]
 
-        ciphertext = base64.b64decode(b64_ciphertext)
+        # 分块流式密文、分块认证加密密文按各自的格式解密
+        if self.is_stream(ciphertext):
+            return b''.join(self.iter_decrypt(io.BytesIO(ciphertext), hex_key, workers))
+        if self.is_aead(ciphertext):
+            return self.aead_decrypt_range(ciphertext, hex_key, workers=workers)
 
         if mode == fastaes.MODE_ECB:
             cipher = fastaes.new(key, mode)
@@ -892,9 +1372,318 @@ class FASTAES:
                 raise ValueError(f"{self.mode_str} 模式需要 iv")
             cipher = fastaes.new(key, mode, iv=self.iv)
         elif mode == fastaes.MODE_CTR:
-            cipher = fastaes.new(key, mode)
+            return self._unpad(self._ctr_crypt(key, ciphertext, workers))
         else:
             raise ValueError("不支持的模式")
 
         decrypted = cipher.decrypt(ciphertext)
         return self._unpad(decrypted)
+
+    # ------------------------- 分块流式加解密 -------------------------
+    @classmethod
+    def is_stream(cls, data: bytes) -> bool:
+        """判断密文是否为分块流式格式（以文件头魔数和版本号开头）"""
+        return len(data) >= cls.STREAM_HEADER.size and data[:5] == cls.STREAM_MAGIC + bytes([cls.STREAM_VERSION])
+
+    @staticmethod
+    def _read_full(reader, size: int) -> bytes:
+        """从文件对象读取 size 字节，直到读满或遇到文件末尾"""
+        data = reader.read(size)
+        if len(data) == size or not data:
+            return data
+        parts = [data]
+        size -= len(data)
+        while size:
+            data = reader.read(size)
+            if not data:
+                break
+            parts.append(data)
+            size -= len(data)
+        return b''.join(parts)
+
+    def _chunk_cipher(self, key: bytes, iv: bytes):
+        """为单个分块创建密码器（CTR 模式以 IV 作为 128 位计数器初值）"""
+        mode = self.mode_map[self.mode_str]
+        if mode == fastaes.MODE_ECB:
+            return fastaes.new(key, mode)
+        if mode == fastaes.MODE_CTR:
+            return fastaes.new(key, mode, nonce=b'', initial_value=iv)
+        return fastaes.new(key, mode, iv=iv)
+
+    def _seal_chunk(self, key: bytes, chunk: bytes, final: bool) -> bytes:
+        """加密单个分块并生成分块记录（记录头 + 随机 IV + 密文），末块做填充"""
+        iv = secrets.token_bytes(0 if self.mode_str == 'ECB' else 16)
+        body = self._chunk_cipher(key, iv).encrypt(self._pad(chunk) if final else chunk)
+        return self.CHUNK_HEADER.pack(self.CHUNK_FINAL if final else 0, len(body)) + iv + body
+
+    def iter_encrypt(self, reader, hex_key: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     workers: Optional[int] = None) -> Iterator[bytes]:
+        """
+        分块流式加密：按块读取明文并逐段产出密文（文件头、各分块记录），内存占用只与分块大小和线程数有关
+        :param reader: 以二进制方式打开的可读文件对象
+        :param hex_key: 16字节的十六进制密钥字符串
+        :param chunk_size: 明文分块大小，须为16字节的整数倍
+        :param workers: 并行线程数（每次读取 workers 个分块并行加密），不指定则使用实例配置
+        :return: 密文片段生成器
+        """
+        if chunk_size <= 0 or chunk_size % 16 or chunk_size > 0xFFFFFFFF - 16:
+            raise ValueError("分块大小必须是16字节的正整数倍")
+        key = self._key_bytes(hex_key)
+        workers = workers or self.workers
+
+        yield self.STREAM_HEADER.pack(self.STREAM_MAGIC, self.STREAM_VERSION,
+                                      self.STREAM_MODES.index(self.mode_str), chunk_size)
+
+        # 每批读取至多 workers 个分块，并预读下一块以确定末块（末块不足一块或其后已无数据）；整个流共用一个线程池
+        with self._executor(workers) as pool:
+            chunk, final = self._read_full(reader, chunk_size), False
+            while not final:
+                batch = [chunk]
+                while True:
+                    chunk = self._read_full(reader, chunk_size) if len(batch[-1]) == chunk_size else b''
+                    if not chunk:
+                        final = True
+                        break
+                    if len(batch) == workers:
+                        break
+                    batch.append(chunk)
+                last = len(batch) - 1
+                yield from self._parallel_map(lambda item: self._seal_chunk(key, item[1], final and item[0] == last),
+                                              list(enumerate(batch)), workers, pool)
+
+    def iter_decrypt(self, reader, hex_key: str, workers: Optional[int] = None) -> Iterator[bytes]:
+        """
+        分块流式解密：逐块读取分块密文并产出明文
+        :param reader: 以二进制方式打开的可读文件对象
+        :param hex_key: 16字节的十六进制密钥字符串
+        :param workers: 并行线程数（每次读取 workers 个分块并行解密），不指定则使用实例配置
+        :return: 明文片段生成器
+        """
+        header = self._read_full(reader, self.STREAM_HEADER.size)
+        if len(header) < self.STREAM_HEADER.size:
+            raise ValueError("分块密文不完整")
+        magic, version, mode_id, chunk_size = self.STREAM_HEADER.unpack(header)
+        if magic != self.STREAM_MAGIC:
+            raise ValueError("不是分块流式密文")
+        if version != self.STREAM_VERSION:
+            raise ValueError(f"不支持的分块密文版本: {version}")
+        if mode_id >= len(self.STREAM_MODES) or self.STREAM_MODES[mode_id] != self.mode_str:
+            raise ValueError(f"分块密文的工作模式与当前配置（{self.mode_str}）不一致")
+
+        key = self._key_bytes(hex_key)
+        workers = workers or self.workers
+        iv_len = 0 if self.mode_str == 'ECB' else 16
+        record_size = self.CHUNK_HEADER.size + iv_len
+        final = False
+        with self._executor(workers) as pool:
+            while not final:
+                # 读取一批分块记录（至多 workers 个，遇到末块为止）
+                batch = []
+                while not final and len(batch) < workers:
+                    record = self._read_full(reader, record_size)
+                    if len(record) < record_size:
+                        raise ValueError("分块密文被截断")
+                    flags, length = self.CHUNK_HEADER.unpack_from(record)
+                    if length % 16 or length > chunk_size + 16:
+                        raise ValueError("分块记录长度非法")
+                    body = self._read_full(reader, length)
+                    if len(body) < length:
+                        raise ValueError("分块密文被截断")
+                    final = bool(flags & self.CHUNK_FINAL)
+                    batch.append((record[self.CHUNK_HEADER.size:], body))
+
+                plaintexts = self._parallel_map(lambda item: self._chunk_cipher(key, item[0]).decrypt(item[1]),
+                                                batch, workers, pool)
+                if final:
+                    plaintexts[-1] = self._unpad(plaintexts[-1])
+                    if reader.read(1):
+                        raise ValueError("分块密文末尾存在多余数据")
+                yield from plaintexts
+
+    def encrypt_stream(self, reader, writer, hex_key: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       workers: Optional[int] = None) -> int:
+        """
+        分块流式加密，从 reader 读取明文并将密文写入 writer
+        :return: 写出的密文字节数
+        """
+        written = 0
+        for piece in self.iter_encrypt(reader, hex_key, chunk_size, workers):
+            writer.write(piece)
+            written += len(piece)
+        return written
+
+    def decrypt_stream(self, reader, writer, hex_key: str, workers: Optional[int] = None) -> int:
+        """
+        分块流式解密，从 reader 读取分块密文并将明文写入 writer
+        :return: 写出的明文字节数
+        """
+        written = 0
+        for piece in self.iter_decrypt(reader, hex_key, workers):
+            writer.write(piece)
+            written += len(piece)
+        return written
+
+    # ------------------------- 分块认证加密（随机访问） -------------------------
+    @classmethod
+    def is_aead(cls, data: bytes) -> bool:
+        """判断密文是否为分块认证加密格式（以文件头魔数和版本号开头）"""
+        return len(data) >= cls.AEAD_HEADER.size and data[:5] == cls.AEAD_MAGIC + bytes([cls.AEAD_VERSION])
+
+    @classmethod
+    def aead_locate(cls, header: bytes, start: int = 0, end: Optional[int] = None) -> dict:
+        """
+        根据文件头计算明文区间 [start, end) 涉及的分块以及需要读取的密文位置（可用于按范围下载、断点续传）
+        :param header: 密文开头的 AEAD_HEADER.size 个字节
+        :param start: 明文起始偏移
+        :param end: 明文结束偏移（不含），不指定则到末尾
+        :return: {'size': 明文总长度, 'chunk_size': 分块大小, 'chunks': (首块, 末块+1),
+                  'tags': (偏移, 长度), 'body': (偏移, 长度)}，偏移均相对于整个密文
+        """
+        magic, version, chunk_size, _, size = cls.AEAD_HEADER.unpack_from(header)
+        if magic != cls.AEAD_MAGIC:
+            raise ValueError("不是分块认证加密密文")
+        if version != cls.AEAD_VERSION:
+            raise ValueError(f"不支持的分块认证加密密文版本: {version}")
+        if not chunk_size:
+            raise ValueError("分块大小非法")
+
+        end = size if end is None else min(end, size)
+        if start < 0 or start > end:
+            raise ValueError(f"解密区间非法: [{start}, {end})")
+        n_chunks = -(-size // chunk_size)
+        first, last = start // chunk_size, (-(-end // chunk_size) if end > start else start // chunk_size)
+        body_start = cls.AEAD_HEADER.size + n_chunks * cls.AEAD_TAG_SIZE
+        chunk_end = min(last * chunk_size, size)
+        return {
+            'size': size,
+            'chunk_size': chunk_size,
+            'chunks': (first, last),
+            'tags': (cls.AEAD_HEADER.size + first * cls.AEAD_TAG_SIZE, (last - first) * cls.AEAD_TAG_SIZE),
+            'body': (body_start + first * chunk_size, max(chunk_end - first * chunk_size, 0)),
+        }
+
+    def aead_encrypt_stream(self, reader, writer, hex_key: str, size: int,
+                            chunk_size: int = DEFAULT_AEAD_CHUNK_SIZE, workers: Optional[int] = None) -> int:
+        """
+        分块认证加密：按块读取明文并写出随机访问格式的密文，内存占用只与分块大小有关
+        （标签索引表位于密文区之前，写完密文后回填，因此 writer 须支持 seek）
+        :param reader: 以二进制方式打开的可读文件对象
+        :param writer: 可 seek 的二进制输出对象
+        :param hex_key: 16字节的十六进制密钥字符串
+        :param size: 明文总长度
+        :param chunk_size: 明文分块大小
+        :param workers: 并行线程数（各分块独立加密），不指定则使用实例配置
+        :return: 写出的密文字节数
+        """
+        if chunk_size <= 0 or chunk_size > 0xFFFFFFFF:
+            raise ValueError("分块大小非法")
+        n_chunks = -(-size // chunk_size)
+        if n_chunks >> 32:
+            raise ValueError("分块数量过多，请增大分块大小")
+        key = self._key_bytes(hex_key)
+        prefix = secrets.token_bytes(8)
+        header = self.AEAD_HEADER.pack(self.AEAD_MAGIC, self.AEAD_VERSION, chunk_size, prefix, size)
+
+        base = writer.tell()
+        writer.write(header)
+        writer.write(bytes(n_chunks * self.AEAD_TAG_SIZE))      # 标签索引表占位
+
+        def seal(item: tuple) -> tuple:
+            i, chunk = item
+            cipher = fastaes.new(key, fastaes.MODE_GCM, nonce=prefix + i.to_bytes(4, 'big'))
+            cipher.update(header)
+            return cipher.encrypt_and_digest(chunk)
+
+        # 每批读取一组分块并行加密（每个线程约 1 MiB），按顺序写出密文并记录标签
+        workers = workers or self.workers
+        batch_size = workers * max(1, self.PARALLEL_MIN_SEGMENT // chunk_size) if workers > 1 else 1
+        tags = []
+        with self._executor(workers) as pool:
+            for first in range(0, n_chunks, batch_size):
+                batch = []
+                for i in range(first, min(first + batch_size, n_chunks)):
+                    chunk = self._read_full(reader, min(chunk_size, size - i * chunk_size))
+                    if len(chunk) < min(chunk_size, size - i * chunk_size):
+                        raise ValueError("明文长度小于声明的长度")
+                    batch.append((i, chunk))
+                for body, tag in self._parallel_map(seal, batch, workers, pool):
+                    writer.write(body)
+                    tags.append(tag)
+
+        end = writer.tell()
+        writer.seek(base + self.AEAD_HEADER.size)
+        writer.write(b''.join(tags))
+        writer.seek(end)
+        return end - base
+
+    def aead_encrypt(self, plaintext: bytes, hex_key: str, chunk_size: int = DEFAULT_AEAD_CHUNK_SIZE,
+                     workers: Optional[int] = None) -> bytes:
+        """
+        分块认证加密整段明文
+        :param plaintext: 明文
+        :param hex_key: 16字节的十六进制密钥字符串
+        :param chunk_size: 明文分块大小
+        :param workers: 并行线程数，不指定则使用实例配置
+        :return: 随机访问格式的密文
+        """
+        plaintext = plaintext.encode('utf-8') if isinstance(plaintext, str) else plaintext
+        out = io.BytesIO()
+        self.aead_encrypt_stream(io.BytesIO(plaintext), out, hex_key, len(plaintext), chunk_size, workers)
+        return out.getvalue()
+
+    def aead_decrypt_range(self, source, hex_key: str, start: int = 0, end: Optional[int] = None,
+                           workers: Optional[int] = None) -> bytes:
+        """
+        解密明文区间 [start, end)，只读取并验证该区间涉及的分块
+        :param source: 完整密文（bytes）或可 seek 的二进制文件对象
+        :param hex_key: 16字节的十六进制密钥字符串
+        :param start: 明文起始偏移
+        :param end: 明文结束偏移（不含），不指定则到末尾
+        :param workers: 并行线程数（各分块独立验证解密），不指定则使用实例配置
+        :return: 区间内的明文
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source)
+            def read_at(offset: int, length: int) -> bytes:
+                return bytes(view[offset:offset + length])
+        else:
+            base = source.tell()
+            def read_at(offset: int, length: int) -> bytes:
+                source.seek(base + offset)
+                return self._read_full(source, length)
+
+        header = read_at(0, self.AEAD_HEADER.size)
+        if len(header) < self.AEAD_HEADER.size:
+            raise ValueError("分块认证加密密文不完整")
+        layout = self.aead_locate(header, start, end)
+        prefix = self.AEAD_HEADER.unpack(header)[3]
+        chunk_size, (first, last) = layout['chunk_size'], layout['chunks']
+        tags = read_at(*layout['tags'])
+        body = read_at(*layout['body'])
+        if len(tags) < layout['tags'][1] or len(body) < layout['body'][1]:
+            raise ValueError("分块认证加密密文被截断")
+
+        key = self._key_bytes(hex_key)
+        plaintext = bytearray(layout['body'][1])
+        src, dst = memoryview(body), memoryview(plaintext)
+
+        def open_chunks(span: range) -> None:
+            for i in span:
+                offset = (i - first) * chunk_size
+                cipher = fastaes.new(key, fastaes.MODE_GCM, nonce=prefix + i.to_bytes(4, 'big'))
+                cipher.update(header)
+                tag = tags[(i - first) * self.AEAD_TAG_SIZE:(i - first + 1) * self.AEAD_TAG_SIZE]
+                try:
+                    cipher.decrypt_and_verify(src[offset:offset + chunk_size], tag,
+                                              output=dst[offset:offset + chunk_size])
+                except ValueError:
+                    raise ValueError(f"分块 {i} 认证失败，密文已损坏或密钥错误") from None
+
+        # 涉及的分块平均分给各线程
+        workers = min(workers or self.workers, max(last - first, 1))
+        step = -(-(last - first) // workers) if last > first else 1
+        self._parallel_map(open_chunks, [range(i, min(i + step, last)) for i in range(first, last, step)], workers)
+
+        skip = start - first * chunk_size
+        end = layout['size'] if end is None else min(end, layout['size'])
+        return bytes(plaintext[skip:skip + end - start])
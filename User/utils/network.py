@@ -8,7 +8,7 @@ import urllib3
 import requests
 from OpenSSL import crypto
 from utils.converter import TypeConverter as tc
-from typing import Optional, Dict, Any, List, Tuple, Union
+from typing import Optional, Dict, Any, List, Tuple, Union, Iterable, Callable
 
 
 # 错误码定义
@@ -132,16 +132,20 @@ class NetworkAPI:
         # 成功响应
         return self.create_standard_response(response_data['data'])
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict:
+    def _make_request(self, method: str, endpoint: str,
+                      body_factory: Optional[Callable[[], Iterable[bytes]]] = None, **kwargs) -> Dict:
         """
         发送请求的通用方法
         :param method: HTTP方法
         :param endpoint: API端点
+        :param body_factory: 流式请求体工厂，每次发送（包括 SSL 重试）都调用它生成新的请求体
         :param kwargs: 请求参数
         :return: 响应数据
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
+            if body_factory is not None:
+                kwargs['data'] = body_factory()
             response = self.session.request(
                 method=method,
                 url=url,
@@ -154,6 +158,8 @@ class NetworkAPI:
         except requests.exceptions.SSLError:
             self.session.verify = False
             try:
+                if body_factory is not None:
+                    kwargs['data'] = body_factory()
                 response = self.session.request(
                     method=method,
                     url=url,
@@ -184,6 +190,16 @@ class NetworkAPI:
         """
         return self._make_request('POST', endpoint, json=data)
 
+    def post_stream(self, endpoint: str, body_factory: Callable[[], Iterable[bytes]]) -> Dict:
+        """
+        以分块传输编码发送POST请求，请求体由调用方逐段生成，无需事先在内存中拼出完整请求体
+        :param endpoint: API端点
+        :param body_factory: 返回逐段产出 JSON 请求体字节的可迭代对象的无参函数；
+                             生成器只能消费一次，SSL 重试时会再次调用它生成新的请求体
+        :return: 响应数据
+        """
+        return self._make_request('POST', endpoint, body_factory=body_factory)
+
     def put(self, endpoint: str, data: Dict) -> Dict:
         """
         发送PUT请求